@@ -0,0 +1,66 @@
+"""Initial schema: saved_projects and report_jobs
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Databases created by the old create_all-on-startup already have these tables;
+they are left as they are and only stamped, so `alembic upgrade head` works on
+both new and existing databases.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "saved_projects" not in existing:
+        op.create_table(
+            "saved_projects",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("user_id", sa.String(), nullable=True),
+            sa.Column("project_type", sa.String(), nullable=True),
+            sa.Column("input_json", sa.JSON(), nullable=True),
+            sa.Column("total_cost", sa.Float(), nullable=True),
+            sa.Column("breakdown_json", sa.JSON(), nullable=True),
+            sa.Column("pdf_path", sa.String(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_saved_projects_id", "saved_projects", ["id"])
+        op.create_index("ix_saved_projects_user_id", "saved_projects", ["user_id"])
+        op.create_index("ix_saved_projects_project_type", "saved_projects", ["project_type"])
+
+    if "report_jobs" not in existing:
+        op.create_table(
+            "report_jobs",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("project_id", sa.Integer(), nullable=True),
+            sa.Column("status", sa.String(), nullable=True),
+            sa.Column("attempts", sa.Integer(), nullable=True),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.ForeignKeyConstraint(["project_id"], ["saved_projects.id"]),
+            sa.PrimaryKeyConstraint("id")
+        )
+        op.create_index("ix_report_jobs_id", "report_jobs", ["id"])
+        op.create_index("ix_report_jobs_project_id", "report_jobs", ["project_id"])
+        op.create_index("ix_report_jobs_status", "report_jobs", ["status"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("report_jobs")
+    op.drop_table("saved_projects")
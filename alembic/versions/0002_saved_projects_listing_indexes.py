@@ -0,0 +1,46 @@
+"""Listing indexes on saved_projects
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+Composite indexes for the keyset archive listing (one per sort, each ending in
+id) and for a user's projects by date. The single-column project_type and
+user_id indexes are leading prefixes of the new ones and are dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_saved_projects_created_at_id", ["created_at", "id"]),
+    ("ix_saved_projects_total_cost_id", ["total_cost", "id"]),
+    ("ix_saved_projects_type_created_at_id", ["project_type", "created_at", "id"]),
+    ("ix_saved_projects_type_total_cost_id", ["project_type", "total_cost", "id"]),
+    ("ix_saved_projects_user_created_at_id", ["user_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created by create_all after the archive listing landed have some already
+    for name, columns in INDEXES:
+        op.create_index(name, "saved_projects", columns, if_not_exists=True)
+    op.drop_index("ix_saved_projects_project_type", table_name="saved_projects", if_exists=True)
+    op.drop_index("ix_saved_projects_user_id", table_name="saved_projects", if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_saved_projects_user_id", "saved_projects", ["user_id"])
+    op.create_index("ix_saved_projects_project_type", "saved_projects", ["project_type"])
+    for name, _ in reversed(INDEXES):
+        op.drop_index(name, table_name="saved_projects")
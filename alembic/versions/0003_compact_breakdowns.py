@@ -0,0 +1,46 @@
+"""Compact breakdown storage
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+Adds the breakdown_components codebook and the saved_projects columns for
+compact breakdowns (BREAKDOWN_STORAGE="compact"). Existing rows keep their
+breakdown_json; `python -m app.cli.compact_breakdowns` converts them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "breakdown_components",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("component", sa.String(), nullable=False),
+        sa.Column("category", sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("component", "category", name="uq_breakdown_components_label")
+    )
+    with op.batch_alter_table("saved_projects") as batch_op:
+        batch_op.add_column(sa.Column("breakdown_blob", sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column("rate_card_version", sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Expand compact rows first (`python -m app.cli.compact_breakdowns --expand`)
+    # or their breakdowns are lost with the column
+    with op.batch_alter_table("saved_projects") as batch_op:
+        batch_op.drop_column("rate_card_version")
+        batch_op.drop_column("breakdown_blob")
+    op.drop_table("breakdown_components")
@@ -0,0 +1,82 @@
+"""Cost analytics rollups
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+Adds cost_rollups, the incrementally maintained aggregates behind /analytics,
+and fills it from the existing saved_projects with the same aggregation as
+`python -m app.cli.rebuild_cost_rollups`. Saves and deletes keep it current
+from then on; a delete of an older project must find that project counted.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.cost_rollup_service import CostRollups, DIMENSIONS
+from app.services.project_listing_service import ProjectListing
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+
+# saved_projects as of this revision; the model has since gained columns
+saved_projects = sa.table(
+    "saved_projects",
+    sa.column("project_type", sa.String()),
+    sa.column("created_at", sa.DateTime(timezone=True)),
+    sa.column("input_json", sa.JSON()),
+    sa.column("total_cost", sa.Float())
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    rollups = op.create_table(
+        "cost_rollups",
+        sa.Column("project_type", sa.String(), nullable=False),
+        sa.Column("month", sa.String(length=7), nullable=False),
+        sa.Column("grade", sa.String(), nullable=False),
+        sa.Column("bucket", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("sum_squares", sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint("project_type", "month", "grade", "bucket")
+    )
+    populate(rollups)
+
+
+def populate(rollups: sa.Table) -> None:
+    # CostRollups.rebuild, on the migration's connection and transaction
+    connection = op.get_bind()
+    stmt = sa.select(
+        saved_projects.c.project_type, saved_projects.c.created_at,
+        saved_projects.c.input_json, saved_projects.c.total_cost
+    ).execution_options(yield_per=BATCH_SIZE)
+    changes = {}
+    for partition in connection.execute(stmt).partitions():
+        entries = [
+            (project_type, created_at, ProjectListing.summary_value(input_json, "grade"), total_cost)
+            for project_type, created_at, input_json, total_cost in partition
+        ]
+        for key, change in CostRollups.deltas(entries).items():
+            total = changes.setdefault(key, [0, 0.0, 0.0])
+            for i, value in enumerate(change):
+                total[i] += value
+    rows = [
+        dict(zip(DIMENSIONS + ("bucket",), key), count=count, total=total, sum_squares=sum_squares)
+        for key, (count, total, sum_squares) in sorted(changes.items())
+    ]
+    for start in range(0, len(rows), BATCH_SIZE):
+        op.bulk_insert(rollups, rows[start:start + BATCH_SIZE])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("cost_rollups")
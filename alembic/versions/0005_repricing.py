@@ -0,0 +1,69 @@
+"""Re-pricing runs and estimation versions
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+Adds repricing_runs (the re-pricing job's checkpoints) and estimations, one row
+per saved project re-priced on a later rate card. The estimations model was a
+placeholder that no migration created, so the table is new.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "repricing_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("rate_card_version", sa.String(length=16), nullable=False),
+        sa.Column("project_type", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("last_project_id", sa.Integer(), nullable=False),
+        sa.Column("projects", sa.Integer(), nullable=False),
+        sa.Column("changed", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.Column("previous_total", sa.Float(), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_repricing_runs_id", "repricing_runs", ["id"])
+    op.create_index("ix_repricing_runs_rate_card_version", "repricing_runs", ["rate_card_version"])
+    op.create_table(
+        "estimations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("project_id", sa.Integer(), nullable=False),
+        sa.Column("run_id", sa.Integer(), nullable=True),
+        sa.Column("rate_card_version", sa.String(length=16), nullable=False),
+        sa.Column("total_cost", sa.Float(), nullable=True),
+        sa.Column("previous_total_cost", sa.Float(), nullable=True),
+        sa.Column("breakdown_json", sa.JSON(), nullable=True),
+        sa.Column("breakdown_blob", sa.LargeBinary(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["project_id"], ["saved_projects.id"]),
+        sa.ForeignKeyConstraint(["run_id"], ["repricing_runs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("project_id", "rate_card_version", name="uq_estimations_project_rate_card")
+    )
+    op.create_index("ix_estimations_id", "estimations", ["id"])
+    op.create_index("ix_estimations_project_id", "estimations", ["project_id"])
+    op.create_index("ix_estimations_run_id", "estimations", ["run_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("estimations")
+    op.drop_table("repricing_runs")
@@ -0,0 +1,32 @@
+"""Saved project row version
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+Adds saved_projects.version, the ORM version counter behind the ETag of
+GET /projects/{id}. Existing rows start at 1.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("saved_projects") as batch_op:
+        batch_op.add_column(sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("saved_projects") as batch_op:
+        batch_op.drop_column("version")
@@ -0,0 +1,130 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlencode
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import RedirectResponse
+from pydantic import BaseModel
+from starlette.datastructures import Headers
+from app.core.config import settings
+from app.services.estimate_cache import estimate_cache
+
+# Response headers a 304 repeats from the 200 it stands for
+NOT_MODIFIED_HEADERS = (b"etag", b"cache-control", b"vary", b"expires", b"content-location", b"date")
+
+
+def query_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class HttpCache:
+    """
+    Conditional GET support. Routes derive a strong ETag from what the response
+    is a pure function of (validated inputs and rate card version, or a row's
+    version) and call conditional() before doing the work, so a matching
+    If-None-Match costs neither the computation nor the body.
+    """
+
+    ESTIMATE = f"public, max-age={settings.HTTP_CACHE_ESTIMATE_MAX_AGE}"
+    CATALOG = f"public, max-age={settings.HTTP_CACHE_CATALOG_MAX_AGE}"
+    # Saved projects change; clients may keep a copy but must revalidate it
+    PRIVATE = "private, no-cache"
+
+    @staticmethod
+    def etag(*parts: Any) -> str:
+        # The app version covers changes to how the same inputs are rendered
+        canonical = json.dumps([settings.VERSION, *parts], sort_keys=True, separators=(",", ":"), default=str)
+        return '"' + hashlib.sha256(canonical.encode()).hexdigest()[:32] + '"'
+
+    @staticmethod
+    def matches(if_none_match: Optional[str], etag: str) -> bool:
+        # If-None-Match uses weak comparison (RFC 9110 13.1.2)
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+    @staticmethod
+    def conditional(request: Request, response: Response, etag: str, cache_control: str) -> Optional[Response]:
+        """
+        Sets the validators on the response; returns the 304 to send instead
+        when the client already has this representation.
+        """
+        headers = {"ETag": etag, "Cache-Control": cache_control}
+        if HttpCache.matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        return None
+
+    @staticmethod
+    def canonical_query(data: BaseModel) -> str:
+        # Every field, sorted, in one spelling, so equal inputs share one URL
+        return urlencode(sorted((name, query_value(value)) for name, value in data.model_dump().items()))
+
+    @staticmethod
+    async def estimate(
+        request: Request,
+        response: Response,
+        project_type: str,
+        data: BaseModel,
+        compute: Callable[[dict], dict]
+    ) -> Any:
+        """
+        GET variant of a POST /estimate route. Non-canonical query strings are
+        redirected to the canonical one, so a reverse proxy caches each estimate
+        under a single key.
+        """
+        canonical = HttpCache.canonical_query(data)
+        if request.url.query != canonical:
+            return RedirectResponse(f"{request.url.path}?{canonical}", status_code=301)
+        inputs = data.dict()
+        etag = HttpCache.etag("estimate", estimate_cache.key_for(project_type, inputs))
+        not_modified = HttpCache.conditional(request, response, etag, HttpCache.ESTIMATE)
+        if not_modified:
+            return not_modified
+        try:
+            return await estimate_cache.get_or_compute_async(project_type, inputs, compute)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+
+class ConditionalGetMiddleware:
+    """
+    Turns a 200 GET/HEAD response into a bodiless 304 when its ETag matches
+    If-None-Match. Routes that know the ETag up front answer 304 themselves;
+    this covers any route that only sets the header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            return await self.app(scope, receive, send)
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if not if_none_match:
+            return await self.app(scope, receive, send)
+
+        replaced = False
+
+        async def send_conditional(message: Dict[str, Any]) -> None:
+            nonlocal replaced
+            if message["type"] == "http.response.start":
+                etag = Headers(raw=message["headers"]).get("etag")
+                if message["status"] == 200 and etag and HttpCache.matches(if_none_match, etag):
+                    replaced = True
+                    headers = [(name, value) for name, value in message["headers"] if name.lower() in NOT_MODIFIED_HEADERS]
+                    await send({"type": "http.response.start", "status": 304, "headers": headers})
+                    return
+            elif message["type"] == "http.response.body" and replaced:
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_conditional)
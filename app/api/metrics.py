@@ -0,0 +1,73 @@
+import re
+import time
+from app.core.metrics import HTTP_REQUEST_SECONDS, registry
+from app.services.estimate_cache import estimate_cache
+from app.services.single_flight import estimate_flights, report_flights
+
+PATH_PARAM = re.compile(r"{(\w+)(?::\w+)?}")
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+# Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def route_template(scope) -> str:
+    """
+    Full template of the route that handled the request, e.g.
+    /api/v1/projects/{project_id}. The matched route only knows its path within
+    its router, so the router prefix is recovered from the request path.
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    params = scope.get("path_params", {})
+    rendered = PATH_PARAM.sub(lambda match: str(params.get(match.group(1), match.group(0))), route.path)
+    path = scope["path"]
+    if path.endswith(rendered):
+        return path[:len(path) - len(rendered)] + route.path
+    return route.path
+
+
+class MetricsMiddleware:
+    """
+    Records every HTTP request's latency (until the last body chunk is sent, so
+    streamed exports count in full) by method, route template and status. The
+    route template comes from the matched route, never the raw path, so ids in
+    URLs don't multiply series; unmatched paths share one "unmatched" label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            method = scope["method"] if scope["method"] in METHODS else "other"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method, route_template(scope), str(status))
+
+
+@registry.collector
+def cache_metrics():
+    cache = estimate_cache.stats()
+    yield "estimate_cache_lookups_total", "counter", "Estimate cache lookups by result.", [
+        ({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])
+    ]
+    yield "estimate_cache_entries", "gauge", "Entries in the estimate cache.", [({}, cache["size"])]
+    flights = {"estimates": estimate_flights.stats(), "reports": report_flights.stats()}
+    for counter in ("calls", "executions", "coalesced", "timeouts"):
+        yield f"single_flight_{counter}_total", "counter", f"Single-flight {counter} by layer.", [
+            ({"layer": layer}, stats[counter]) for layer, stats in flights.items()
+        ]
@@ -0,0 +1,94 @@
+import hmac
+import random
+import time
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from app.api.metrics import route_template
+from app.core.config import settings
+from app.core.profiling import StackSampler
+from app.services.profile_store import ProfileStore
+
+
+class ProfilingMiddleware:
+    """
+    Profiles requests that send PROFILING_HEADER, or a PROFILING_SAMPLE_RATE
+    share of them, with a StackSampler running from the first byte received to
+    the last one sent, and saves the result to the ProfileStore. The response
+    carries X-Profile-Id. One request is profiled at a time (others triggered
+    meanwhile run unprofiled); every thread is sampled, so requests overlapping
+    the profiled one can show up in it, and the profile says how many did.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.header = settings.PROFILING_HEADER.lower().encode()
+        self.in_flight = 0
+        self.started = 0 # requests seen, to count those overlapping a profile
+        self.profiling = False
+
+    def trigger(self, scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == self.header:
+                if not settings.PROFILING_TOKEN or hmac.compare_digest(value, settings.PROFILING_TOKEN.encode()):
+                    return "header"
+                break
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        self.started += 1
+        self.in_flight += 1
+        try:
+            trigger = None if self.profiling else self.trigger(scope)
+            if trigger is None:
+                return await self.app(scope, receive, send)
+            await self.profile(scope, receive, send, trigger)
+        finally:
+            self.in_flight -= 1
+
+    async def profile(self, scope, receive, send, trigger: str):
+        profile_id = ProfileStore.new_id()
+        status = 500
+
+        def finish():
+            nonlocal duration
+            if duration is None:
+                duration = time.perf_counter() - start
+                sampler.stop()
+                # Free for the next request (a client may send it as soon as it
+                # has this response) while this profile is written
+                self.profiling = False
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                finish()
+            await send(message)
+
+        overlapping, started = self.in_flight - 1, self.started
+        self.profiling = True
+        sampler = StackSampler(settings.PROFILING_INTERVAL_SECONDS).start()
+        start, duration = time.perf_counter(), None
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            finish()
+            await run_in_threadpool(sampler.join)
+            await run_in_threadpool(ProfileStore.save, profile_id, sampler.samples, {
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template(scope),
+                "status": status,
+                "trigger": trigger,
+                "duration_ms": round(duration * 1e3, 3),
+                "samples": sampler.sample_count,
+                "interval_ms": settings.PROFILING_INTERVAL_SECONDS * 1e3,
+                "overlapping_requests": overlapping + self.started - started
+            })
@@ -0,0 +1,47 @@
+import os
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from app.services.estimate_cache import estimate_cache
+from app.services.profile_store import PROFILE_FILES, ProfileStore
+from app.services.report_store import ReportStore
+from app.services.single_flight import estimate_flights, report_flights
+from app.database.session import get_db
+
+router = APIRouter()
+
+@router.get("/cache")
+def get_cache_stats():
+    return {"estimate_cache": estimate_cache.stats()}
+
+@router.delete("/cache")
+def clear_cache():
+    estimate_cache.clear()
+    return {"message": "Estimate cache cleared"}
+
+@router.get("/single-flight")
+def get_single_flight_stats():
+    # coalesced: calls that waited on an identical in-flight computation
+    return {"single_flight": {"estimates": estimate_flights.stats(), "reports": report_flights.stats()}}
+
+@router.get("/reports")
+def get_report_store_stats(db: Session = Depends(get_db)):
+    return {"report_store": ReportStore.stats(db)}
+
+@router.post("/reports/evict")
+def evict_reports(db: Session = Depends(get_db)):
+    return {"report_store": ReportStore.evict(db)}
+
+@router.get("/profiles")
+def list_profiles(limit: int = 50):
+    # Newest first; highlights are the inclusive time in PDF rendering and db commits
+    return {"profiles": ProfileStore.list(limit)}
+
+@router.get("/profiles/{profile_id}/{kind}")
+def download_profile(profile_id: str, kind: str):
+    if kind not in PROFILE_FILES:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(PROFILE_FILES)}")
+    path = ProfileStore.path_for(profile_id, kind)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=os.path.basename(path))
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app.services.cost_rollup_service import CostRollups
+from app.database.session import get_db
+
+router = APIRouter()
+
+MONTH = r"^\d{4}-\d{2}$"
+
+@router.get("/")
+def get_cost_analytics(
+    group_by: List[str] = Query(["project_type"]), # any of project_type, month, grade
+    project_type: Optional[str] = None,
+    grade: Optional[str] = None,
+    month_from: Optional[str] = Query(None, pattern=MONTH),
+    month_to: Optional[str] = Query(None, pattern=MONTH),
+    percentiles: List[float] = Query([50, 90, 95]),
+    db: Session = Depends(get_db)
+):
+    try:
+        return CostRollups.summary(
+            db, group_by=group_by, project_type=project_type, grade=grade,
+            month_from=month_from, month_to=month_to, percentiles=percentiles
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
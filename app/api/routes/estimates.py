@@ -0,0 +1,104 @@
+import asyncio
+import io
+import json
+import tempfile
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.engines.registry import PROJECT_ENGINES
+from app.services.bulk_estimation_service import BulkEstimator, FORMATS, detect_format
+from app.services.estimation_session import EstimationSession
+
+router = APIRouter()
+
+@router.post("/bulk")
+async def bulk_estimate(request: Request, project_type: Optional[str] = None, format: Optional[str] = None, breakdown: bool = True):
+    """
+    Body is a raw CSV (header row + one build per line) or NDJSON upload, e.g.
+    curl --data-binary @leads.csv -H "Content-Type: text/csv" .../estimates/bulk
+    Rows may carry their own project_type column; ?project_type= is the default.
+    """
+    fmt = format or detect_format(request.headers.get("content-type"))
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson")
+    if project_type and project_type not in PROJECT_ENGINES:
+        raise HTTPException(status_code=400, detail=f"Unknown project_type: {project_type}")
+
+    too_large = HTTPException(status_code=413, detail=f"Upload exceeds {settings.BULK_MAX_UPLOAD_BYTES} bytes")
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.BULK_MAX_UPLOAD_BYTES:
+        raise too_large
+
+    # Spool the upload (to disk past BULK_SPOOL_MAX_MEMORY) so the response can stream
+    # from it without holding the request body in memory
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.BULK_SPOOL_MAX_MEMORY)
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > settings.BULK_MAX_UPLOAD_BYTES:
+                raise too_large
+            if received > settings.BULK_SPOOL_MAX_MEMORY:
+                # On disk from here (this write rolls the buffer over): off the event loop
+                await run_in_threadpool(spool.write, chunk)
+            else:
+                spool.write(chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+
+    estimator = BulkEstimator(fmt, project_type, include_breakdown=breakdown)
+    lines = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+
+    def results():
+        try:
+            yield from estimator.process_batches(lines)
+            yield estimator.summary()
+        finally:
+            lines.close()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.websocket("/session/{project_type}")
+async def estimation_session(websocket: WebSocket, project_type: str):
+    """
+    Live estimate for the project wizard, e.g. ws://.../estimates/session/own_house
+    Send {"fields": {...}} with only the fields that changed ("full": true asks
+    for the whole estimate again, "id" is echoed back). The first valid form is
+    answered with {"type": "estimate", "estimate": ...}, later ones with
+    {"type": "diff", ...} against the previous estimate.
+    """
+    try:
+        session = EstimationSession(project_type.replace("-", "_"))
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    await websocket.accept()
+    try:
+        while True:
+            try:
+                text = await asyncio.wait_for(websocket.receive_text(), settings.ESTIMATE_SESSION_IDLE_SECONDS)
+            except asyncio.TimeoutError:
+                await websocket.close(code=1000, reason="idle")
+                return
+            try:
+                message = json.loads(text)
+                fields = message.get("fields", {})
+                if not isinstance(fields, dict):
+                    raise ValueError
+            except (ValueError, AttributeError):
+                message, reply = {}, {"type": "error", "detail": 'Send a JSON object: {"fields": {...}}'}
+            else:
+                try:
+                    # Stage recomputes take microseconds; no need to leave the event loop
+                    reply = session.update(fields, full=bool(message.get("full")))
+                except Exception as e:
+                    reply = {"type": "error", "detail": str(getattr(e, "detail", e))}
+            if "id" in message:
+                reply["id"] = message["id"]
+            await websocket.send_text(json.dumps(reply, separators=(",", ":")))
+    except WebSocketDisconnect:
+        pass
@@ -1,28 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from app.schemas.interior_schema import InteriorCreate, InteriorResponse
 from app.engines.interior_engine import InteriorEngine
-from app.services.project_service import ProjectService
-from app.database.session import get_db
+from app.engines.uncertainty_engine import UncertaintyEngine
+from app.schemas.uncertainty_schema import UncertaintyOptions, CostRangeResponse
+from app.services.async_project_service import AsyncProjectService
+from app.services.estimate_cache import estimate_cache
+from app.api.http_cache import HttpCache
+from app.database.async_session import AnySession, get_async_db
 
 router = APIRouter()
 
 @router.post("/estimate", response_model=InteriorResponse)
-def estimate_interior(data: InteriorCreate):
+async def estimate_interior(data: InteriorCreate):
     try:
-        result = InteriorEngine.estimate_cost(data.dict())
+        result = await estimate_cache.get_or_compute_async("interior", data.dict(), InteriorEngine.estimate_cost)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/estimate", response_model=InteriorResponse)
+async def estimate_interior_get(request: Request, response: Response, data: InteriorCreate = Depends()):
+    # Cacheable by a reverse proxy; see HttpCache.estimate
+    return await HttpCache.estimate(request, response, "interior", data, InteriorEngine.estimate_cost)
+
+@router.post("/estimate-range", response_model=CostRangeResponse)
+def estimate_interior_range(data: InteriorCreate, options: UncertaintyOptions = Depends()):
+    try:
+        return UncertaintyEngine.simulate("interior", data.dict(), **options.dict())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/save")
-def save_interior(data: InteriorCreate, db: Session = Depends(get_db)):
-    result = InteriorEngine.estimate_cost(data.dict())
-    project = ProjectService.save_project(
+async def save_interior(data: InteriorCreate, db: AnySession = Depends(get_async_db)):
+    result = await estimate_cache.get_or_compute_async("interior", data.dict(), InteriorEngine.estimate_cost)
+    project = await AsyncProjectService.save_project(
         db=db,
         project_type="interior",
         input_json=data.dict(),
         total_cost=result['total_cost'],
         breakdown_json=result['breakdown']
     )
-    return {"message": "Project saved", "project_id": project.id}
+    return {"message": "Project saved", "project_id": project.id, "report_status": await AsyncProjectService.report_status(db, project.id)}
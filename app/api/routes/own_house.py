@@ -1,33 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.schemas.own_house_schema import OwnHouseCreate, OwnHouseResponse, GradeFacilitiesResponse
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from app.schemas.own_house_schema import OwnHouseCreate, OwnHouseResponse, OwnHouseWhatIfResponse, GradeFacilitiesResponse
 from app.engines.own_house_engine import OwnHouseEngine
-from app.services.project_service import ProjectService
-from app.database.session import get_db
+from app.engines.uncertainty_engine import UncertaintyEngine
+from app.schemas.uncertainty_schema import UncertaintyOptions, CostRangeResponse
+from app.engines.budget_search_engine import BudgetSearchEngine
+from app.schemas.budget_search_schema import OwnHouseBudgetSearch, BudgetSearchResponse
+from app.services.async_project_service import AsyncProjectService
+from app.services.estimate_cache import estimate_cache
+from app.api.http_cache import HttpCache
+from app.database.async_session import AnySession, get_async_db
 from app.core.constants import OWN_HOUSE_GRADE_FACILITIES
+from app.core.rate_card import rate_card_version
+from app.core.config import settings
 
 router = APIRouter()
 
 @router.get("/grade-facilities", response_model=GradeFacilitiesResponse)
-def get_grade_facilities():
+def get_grade_facilities(request: Request, response: Response):
+    # Static for a given rate card
+    etag = HttpCache.etag("grade-facilities", rate_card_version())
+    not_modified = HttpCache.conditional(request, response, etag, HttpCache.CATALOG)
+    if not_modified:
+        return not_modified
     return {"grade_facilities": OWN_HOUSE_GRADE_FACILITIES}
 
 @router.post("/estimate", response_model=OwnHouseResponse)
-def estimate_own_house(data: OwnHouseCreate):
+async def estimate_own_house(data: OwnHouseCreate):
     try:
-        result = OwnHouseEngine.estimate_cost(data.dict())
+        result = await estimate_cache.get_or_compute_async("own_house", data.dict(), OwnHouseEngine.estimate_cost)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/estimate", response_model=OwnHouseResponse)
+async def estimate_own_house_get(request: Request, response: Response, data: OwnHouseCreate = Depends()):
+    # Cacheable by a reverse proxy; see HttpCache.estimate
+    return await HttpCache.estimate(request, response, "own_house", data, OwnHouseEngine.estimate_cost)
+
+@router.post("/estimate-range", response_model=CostRangeResponse)
+def estimate_own_house_range(data: OwnHouseCreate, options: UncertaintyOptions = Depends()):
+    try:
+        return UncertaintyEngine.simulate("own_house", data.dict(), **options.dict())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/estimate-batch", response_model=List[OwnHouseResponse])
+def estimate_own_house_batch(data: List[OwnHouseCreate]):
+    if len(data) > settings.OWN_HOUSE_BATCH_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {settings.OWN_HOUSE_BATCH_MAX_ROWS} rows")
+    try:
+        return OwnHouseEngine.estimate_batch([row.dict() for row in data])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/what-if", response_model=OwnHouseWhatIfResponse)
+def what_if_own_house(data: OwnHouseCreate):
+    try:
+        return OwnHouseEngine.what_if(data.dict())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/budget-search", response_model=BudgetSearchResponse)
+def budget_search_own_house(query: OwnHouseBudgetSearch):
+    try:
+        return BudgetSearchEngine.search_own_house(query.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/save")
-def save_own_house(data: OwnHouseCreate, db: Session = Depends(get_db)):
-    result = OwnHouseEngine.estimate_cost(data.dict())
-    project = ProjectService.save_project(
+async def save_own_house(data: OwnHouseCreate, db: AnySession = Depends(get_async_db)):
+    result = await estimate_cache.get_or_compute_async("own_house", data.dict(), OwnHouseEngine.estimate_cost)
+    project = await AsyncProjectService.save_project(
         db=db,
         project_type="own_house",
         input_json=data.dict(),
         total_cost=result['total_cost'],
         breakdown_json=result['breakdown']
     )
-    return {"message": "Project saved", "project_id": project.id}
+    return {"message": "Project saved", "project_id": project.id, "report_status": await AsyncProjectService.report_status(db, project.id)}
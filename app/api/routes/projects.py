@@ -1,42 +1,202 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse, Response
 from sqlalchemy.orm import Session
-from app.services.project_service import ProjectService
+from app.services.project_service import BulkSaveError, ProjectService
+from app.services.async_project_service import AsyncProjectService
+from app.services.report_queue import report_queue
+from app.services.archive_export_service import ArchiveExporter
+from app.services.project_export_service import ProjectDataExporter
+from app.services.report_store import ReportStore
+from app.services.blob_store import BlobStore
+from app.api.http_cache import HttpCache
+from app.core.config import settings
 from app.database.session import get_db
+from app.database.async_session import AnySession, get_async_db
+from datetime import date
+from typing import List, Literal, Optional
 import os
 
 from app.schemas.project_save_schema import ProjectSaveRequest
+from app.schemas.archive_schema import ArchiveQuery, ArchivePage
+from app.schemas.project_schema import EstimationResponse, SavedProjectResponse
 
 router = APIRouter()
 
 @router.post("/save")
-def save_generic_project(data: ProjectSaveRequest, db: Session = Depends(get_db)):
-    project = ProjectService.save_project(
+async def save_generic_project(data: ProjectSaveRequest, db: AnySession = Depends(get_async_db)):
+    project = await AsyncProjectService.save_project(
         db=db,
         project_type=data.project_type,
         input_json=data.input_json,
         total_cost=data.total_cost,
         breakdown_json=data.breakdown_json
     )
-    return {"message": "Project saved", "project_id": project.id}
+    return {"message": "Project saved", "project_id": project.id, "report_status": await AsyncProjectService.report_status(db, project.id)}
 
-@router.get("/")
-def list_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return ProjectService.get_all_projects(db, skip=skip, limit=limit)
+@router.post("/save-bulk")
+async def save_projects_bulk(data: List[ProjectSaveRequest], db: AnySession = Depends(get_async_db)):
+    if len(data) > settings.PROJECT_BULK_SAVE_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {settings.PROJECT_BULK_SAVE_MAX_ROWS} rows")
+    try:
+        project_ids = await AsyncProjectService.save_projects(db, data)
+        return {"message": "Projects saved", "count": len(project_ids), "project_ids": project_ids, "report_status": "not_rendered"}
+    except BulkSaveError as e:
+        # Rows before failed_at are saved; retry with data[failed_at:] only
+        raise HTTPException(status_code=500, detail={
+            "message": str(e), "project_ids": e.project_ids, "failed_at": e.failed_at
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{project_id}")
-def get_project(project_id: int, db: Session = Depends(get_db)):
-    project = ProjectService.get_project(db, project_id)
+@router.get("/", response_model=List[SavedProjectResponse])
+async def list_projects(skip: int = 0, limit: int = 100, db: AnySession = Depends(get_async_db)):
+    return await AsyncProjectService.get_all_projects(db, skip=skip, limit=limit)
+
+@router.get("/archive", response_model=ArchivePage)
+async def list_archive(query: ArchiveQuery = Depends(), db: AnySession = Depends(get_async_db)):
+    try:
+        return await AsyncProjectService.list_archive(db, query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/export")
+def export_reports(
+    project_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    workers: Optional[int] = Query(None, ge=1, le=32)
+):
+    exporter = ArchiveExporter(project_type=project_type, date_from=date_from, date_to=date_to, workers=workers)
+    suffix = f"_{project_type}" if project_type else ""
+    return StreamingResponse(
+        exporter.stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="project_reports{suffix}.zip"'}
+    )
+
+@router.get("/export/data")
+def export_project_data(
+    format: Literal["csv", "ndjson", "parquet"] = "csv",
+    flatten: bool = False, # one amount column per breakdown component
+    project_type: Optional[str] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None
+):
+    try:
+        exporter = ProjectDataExporter(format, flatten, project_type, date_from, date_to)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        exporter.stream(),
+        media_type=exporter.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{exporter.filename}"'}
+    )
+
+@router.get("/{project_id}", response_model=SavedProjectResponse)
+async def get_project(project_id: int, request: Request, response: Response, db: AnySession = Depends(get_async_db)):
+    if request.headers.get("if-none-match"):
+        # Revalidation reads only the row version, not the JSON columns
+        version = await AsyncProjectService.get_project_version(db, project_id)
+        if version is not None:
+            not_modified = HttpCache.conditional(request, response, HttpCache.etag("project", project_id, version), HttpCache.PRIVATE)
+            if not_modified:
+                return not_modified
+    project = await AsyncProjectService.get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
+    response.headers.update({"ETag": HttpCache.etag("project", project_id, project.version), "Cache-Control": HttpCache.PRIVATE})
     return project
 
+@router.get("/{project_id}/report-status")
+def get_report_status(project_id: int, db: Session = Depends(get_db)):
+    project = ProjectService.get_project(db, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    job = ProjectService.get_report_job(db, project_id)
+    return {
+        "project_id": project_id,
+        "status": job.status if job else ("done" if project.pdf_path else "not_rendered"),
+        "attempts": job.attempts if job else 0,
+        "last_error": job.last_error if job else None,
+        "pdf_ready": bool(project.pdf_path) and os.path.exists(project.pdf_path)
+    }
+
+@router.get("/{project_id}/estimations", response_model=List[EstimationResponse])
+def get_estimations(project_id: int, db: Session = Depends(get_db)):
+    if not ProjectService.get_project(db, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return ProjectService.get_estimations(db, project_id)
+
+@router.get("/{project_id}/signature")
+def get_signature(project_id: int, db: Session = Depends(get_db)):
+    project = ProjectService.get_project(db, project_id)
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    data = BlobStore.get((project.input_json or {}).get("signature"))
+    if data is None:
+        raise HTTPException(status_code=404, detail="Signature not found")
+    return Response(
+        content=data,
+        media_type=BlobStore.media_type(data),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"}
+    )
+
 @router.get("/{project_id}/download-pdf")
-def download_pdf(project_id: int, db: Session = Depends(get_db)):
+def download_pdf(
+    project_id: int,
+    wait: float = settings.REPORT_DOWNLOAD_WAIT_SECONDS,
+    inline: bool = settings.REPORT_INLINE_RENDER,
+    db: Session = Depends(get_db)
+):
     project = ProjectService.get_project(db, project_id)
-    if not project or not project.pdf_path:
-        raise HTTPException(status_code=404, detail="Project or PDF not found")
-    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    if inline and (not project.pdf_path or not os.path.exists(project.pdf_path)):
+        project_data = {
+            "project_type": project.project_type,
+            "input_json": project.input_json,
+            "total_cost": project.total_cost,
+            "breakdown_json": project.breakdown_json
+        }
+        # An identical project's report may already be on disk
+        existing = ReportStore.lookup(project_data)
+        if existing:
+            ReportStore.attach(db, project_id, existing)
+            db.commit()
+            return FileResponse(path=existing, filename=os.path.basename(existing), media_type="application/pdf")
+
+        # Render into memory and stream the bytes straight back
+        pdf = ReportStore.render(project_data)
+        filename = f"report_{ReportStore.content_key(project_data)}.pdf"
+        if settings.REPORT_WRITE_THROUGH:
+            path = ReportStore.store(project_data, pdf)
+            ReportStore.attach(db, project_id, path)
+            db.commit()
+            # Keep REPORTS_DIR within its bounds now that it may have grown
+            ReportStore.evict(db, keep=path)
+        return Response(
+            content=pdf,
+            media_type="application/pdf",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
+
+    if not project.pdf_path or not os.path.exists(project.pdf_path):
+        # Rendered lazily on first download (and again if the file was evicted)
+        job = ProjectService.request_report(db, project)
+        # Wait briefly for the queued render, then tell the client to poll
+        report_queue.wait(project_id, max(0.0, min(wait, settings.REPORT_DOWNLOAD_WAIT_SECONDS)))
+        db.refresh(project)
+        db.refresh(job)
+        if job.status != "done" or not project.pdf_path:
+            return JSONResponse(
+                status_code=202,
+                content={"project_id": project_id, "status": job.status, "attempts": job.attempts, "last_error": job.last_error},
+                headers={"Retry-After": "2"}
+            )
+
     if not os.path.exists(project.pdf_path):
         raise HTTPException(status_code=404, detail="PDF file missing on server")
         
@@ -47,13 +207,13 @@ def download_pdf(project_id: int, db: Session = Depends(get_db)):
     )
 
 @router.delete("/{project_id}")
-def delete_project(project_id: int, db: Session = Depends(get_db)):
-    project = ProjectService.get_project(db, project_id)
+async def delete_project(project_id: int, db: AnySession = Depends(get_async_db)):
+    project = await AsyncProjectService.get_project(db, project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     try:
-        ProjectService.delete_project(db, project_id)
+        await AsyncProjectService.delete_project(db, project_id)
         return {"message": "Project deleted successfully", "project_id": project_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,28 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from app.schemas.rental_schema import RentalCreate, RentalResponse
 from app.engines.rental_engine import RentalEngine
-from app.services.project_service import ProjectService
-from app.database.session import get_db
+from app.engines.uncertainty_engine import UncertaintyEngine
+from app.schemas.uncertainty_schema import UncertaintyOptions, CostRangeResponse
+from app.services.async_project_service import AsyncProjectService
+from app.services.estimate_cache import estimate_cache
+from app.api.http_cache import HttpCache
+from app.database.async_session import AnySession, get_async_db
 
 router = APIRouter()
 
 @router.post("/estimate", response_model=RentalResponse)
-def estimate_rental(data: RentalCreate):
+async def estimate_rental(data: RentalCreate):
     try:
-        result = RentalEngine.estimate_cost(data.dict())
+        result = await estimate_cache.get_or_compute_async("rental", data.dict(), RentalEngine.estimate_cost)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/estimate", response_model=RentalResponse)
+async def estimate_rental_get(request: Request, response: Response, data: RentalCreate = Depends()):
+    # Cacheable by a reverse proxy; see HttpCache.estimate
+    return await HttpCache.estimate(request, response, "rental", data, RentalEngine.estimate_cost)
+
+@router.post("/estimate-range", response_model=CostRangeResponse)
+def estimate_rental_range(data: RentalCreate, options: UncertaintyOptions = Depends()):
+    try:
+        return UncertaintyEngine.simulate("rental", data.dict(), **options.dict())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/save")
-def save_rental(data: RentalCreate, db: Session = Depends(get_db)):
-    result = RentalEngine.estimate_cost(data.dict())
-    project = ProjectService.save_project(
+async def save_rental(data: RentalCreate, db: AnySession = Depends(get_async_db)):
+    result = await estimate_cache.get_or_compute_async("rental", data.dict(), RentalEngine.estimate_cost)
+    project = await AsyncProjectService.save_project(
         db=db,
         project_type="rental",
         input_json=data.dict(),
         total_cost=result['total_cost'],
         breakdown_json=result['breakdown']
     )
-    return {"message": "Project saved", "project_id": project.id}
+    return {"message": "Project saved", "project_id": project.id, "report_status": await AsyncProjectService.report_status(db, project.id)}
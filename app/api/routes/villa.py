@@ -1,28 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from app.schemas.villa_schema import VillaCreate, VillaResponse
 from app.engines.villa_engine import VillaEngine
-from app.services.project_service import ProjectService
-from app.database.session import get_db
+from app.engines.uncertainty_engine import UncertaintyEngine
+from app.schemas.uncertainty_schema import UncertaintyOptions, CostRangeResponse
+from app.engines.budget_search_engine import BudgetSearchEngine
+from app.schemas.budget_search_schema import VillaBudgetSearch, BudgetSearchResponse
+from app.services.async_project_service import AsyncProjectService
+from app.services.estimate_cache import estimate_cache
+from app.api.http_cache import HttpCache
+from app.database.async_session import AnySession, get_async_db
 
 router = APIRouter()
 
 @router.post("/estimate", response_model=VillaResponse)
-def estimate_villa(data: VillaCreate):
+async def estimate_villa(data: VillaCreate):
     try:
-        result = VillaEngine.estimate_cost(data.dict())
+        result = await estimate_cache.get_or_compute_async("villa", data.dict(), VillaEngine.estimate_cost)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/estimate", response_model=VillaResponse)
+async def estimate_villa_get(request: Request, response: Response, data: VillaCreate = Depends()):
+    # Cacheable by a reverse proxy; see HttpCache.estimate
+    return await HttpCache.estimate(request, response, "villa", data, VillaEngine.estimate_cost)
+
+@router.post("/estimate-range", response_model=CostRangeResponse)
+def estimate_villa_range(data: VillaCreate, options: UncertaintyOptions = Depends()):
+    try:
+        return UncertaintyEngine.simulate("villa", data.dict(), **options.dict())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/budget-search", response_model=BudgetSearchResponse)
+def budget_search_villa(query: VillaBudgetSearch):
+    try:
+        return BudgetSearchEngine.search_villa(query.dict())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/save")
-def save_villa(data: VillaCreate, db: Session = Depends(get_db)):
-    result = VillaEngine.estimate_cost(data.dict())
-    project = ProjectService.save_project(
+async def save_villa(data: VillaCreate, db: AnySession = Depends(get_async_db)):
+    result = await estimate_cache.get_or_compute_async("villa", data.dict(), VillaEngine.estimate_cost)
+    project = await AsyncProjectService.save_project(
         db=db,
         project_type="villa",
         input_json=data.dict(),
         total_cost=result['total_cost'],
         breakdown_json=result['breakdown']
     )
-    return {"message": "Project saved", "project_id": project.id}
+    return {"message": "Project saved", "project_id": project.id, "report_status": await AsyncProjectService.report_status(db, project.id)}
@@ -0,0 +1,51 @@
+"""
+Build-time generation of the Own House pricing table.
+
+    python -m app.cli.build_pricing_table [--path PATH] [--verify]
+
+Writes the compressed table used by OWN_HOUSE_PRICING_TABLE="file". The app also
+rebuilds it on startup when the stored fingerprint no longer matches constants.py.
+"""
+import argparse
+import copy
+import itertools
+import os
+import sys
+
+from app.core.config import settings
+from app.engines.breakdown_engine import BreakdownEngine
+from app.engines.own_house_pricing_table import OwnHousePricingTable, AXES, FLAG_AXES, table_fingerprint
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--path", default=settings.OWN_HOUSE_PRICING_TABLE_PATH)
+    parser.add_argument("--verify", action="store_true", help="compare every row against the live engine")
+    args = parser.parse_args(argv)
+
+    existing = OwnHousePricingTable.load_file(args.path)
+    table = existing if existing is not None else OwnHousePricingTable.build()
+    if existing is None:
+        OwnHousePricingTable.save(table, args.path)
+        print(f"built {args.path} ({table_fingerprint()})")
+    else:
+        print(f"{args.path} is up to date ({table_fingerprint()})")
+
+    rows = len(table["total_cost"])
+    print(f"rows: {rows:,}  in-memory: {OwnHousePricingTable.nbytes(table) / 1e6:.2f} MB  "
+          f"file: {os.path.getsize(args.path) / 1e6:.2f} MB")
+
+    if args.verify:
+        mismatches = 0
+        for combo in itertools.product(*AXES):
+            inputs = dict(zip(["dimensions", "bedrooms", "floor", "structural_style", "interior_package"], combo[:5]))
+            inputs.update(zip(FLAG_AXES, combo[5:]))
+            if OwnHousePricingTable.lookup(inputs, table) != BreakdownEngine.calculate_smart_breakdown(copy.deepcopy(inputs)):
+                mismatches += 1
+        print(f"verify: {mismatches} of {rows:,} rows differ from calculate_smart_breakdown")
+        return 1 if mismatches else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
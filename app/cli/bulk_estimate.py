@@ -0,0 +1,56 @@
+"""
+Bulk estimation of a CSV or NDJSON file, one NDJSON result line per input row.
+
+    python -m app.cli.bulk_estimate leads.csv [-o results.ndjson] [--project-type own_house]
+                                              [--format csv|ndjson] [--no-breakdown]
+
+Reads from stdin when the input is "-". Rows may carry a project_type column;
+--project-type is the default for rows that do not. Throughput and peak RSS are
+reported on stderr.
+"""
+import argparse
+import resource
+import sys
+import time
+
+from app.services.bulk_estimation_service import BulkEstimator, FORMATS, detect_format
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help='CSV / NDJSON file, or "-" for stdin')
+    parser.add_argument("-o", "--output", default="-", help='result file (default: stdout)')
+    parser.add_argument("--format", choices=FORMATS, help="defaults to the input file extension")
+    parser.add_argument("--project-type", help="project type for rows without a project_type column")
+    parser.add_argument("--no-breakdown", action="store_true", help="emit totals only")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.input)
+    if fmt is None:
+        parser.error("cannot detect the input format, pass --format")
+
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8-sig", newline="")
+    target = sys.stdout if args.output == "-" else open(args.output, "w")
+    estimator = BulkEstimator(fmt, args.project_type, include_breakdown=not args.no_breakdown)
+
+    start = time.perf_counter()
+    try:
+        for batch in estimator.process_batches(source):
+            target.write(batch)
+        target.write(estimator.summary())
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    elapsed = time.perf_counter() - start
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{estimator.rows:,} rows ({estimator.errors:,} errors) in {elapsed:.1f}s  "
+          f"{estimator.rows / elapsed if elapsed else 0:,.0f} rows/s  peak RSS {peak_rss_mb:.0f} MB",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Checks that the archive listing queries are served by the saved_projects indexes.
+
+    python -m app.cli.check_query_plans [--verbose]
+
+EXPLAINs every listing shape (sorts, filters, next-page cursors, the legacy
+offset listing) against the configured database and exits non-zero if a query
+does not use its expected index. On PostgreSQL sequential scans, bitmap scans and
+sorts are disabled for the check, so even small tables show the index that
+serves both the filter and the order.
+"""
+import argparse
+import json
+import sys
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.database.session import SessionLocal
+from app.models.saved_project import SavedProject
+from app.schemas.archive_schema import ArchiveQuery
+from app.services.project_listing_service import ProjectListing
+
+
+def cursor(key: list, sort: str, order: str = "desc") -> str:
+    return ProjectListing.encode_cursor(key, sort, order)
+
+
+def cases(dialect: str) -> Iterator[Tuple[str, object, str]]:
+    """
+    (label, statement, index expected in its plan)
+    """
+    created = "2026-01-01 00:00:00"
+    archive = [
+        ("newest first", ArchiveQuery(), "ix_saved_projects_created_at_id"),
+        ("newest first, next page", ArchiveQuery(cursor=cursor([created, 1000], "created_at")), "ix_saved_projects_created_at_id"),
+        ("date range", ArchiveQuery(date_from="2026-01-01", date_to="2026-01-31"), "ix_saved_projects_created_at_id"),
+        ("type", ArchiveQuery(project_type="villa"), "ix_saved_projects_type_created_at_id"),
+        ("type, next page", ArchiveQuery(project_type="villa", cursor=cursor([created, 1000], "created_at")), "ix_saved_projects_type_created_at_id"),
+        ("user", ArchiveQuery(user_id="crm"), "ix_saved_projects_user_created_at_id"),
+        ("user, next page", ArchiveQuery(user_id="crm", cursor=cursor([created, 1000], "created_at")), "ix_saved_projects_user_created_at_id"),
+        ("by cost", ArchiveQuery(sort="total_cost"), "ix_saved_projects_total_cost_id"),
+        ("by cost, range", ArchiveQuery(sort="total_cost", min_cost=2e6, max_cost=3e6), "ix_saved_projects_total_cost_id"),
+        ("type by cost, next page", ArchiveQuery(project_type="villa", sort="total_cost", cursor=cursor([5e6, 1000], "total_cost")), "ix_saved_projects_type_total_cost_id"),
+        ("by type, next page", ArchiveQuery(sort="project_type", order="asc", cursor=cursor(["rental", created, 1000], "project_type", "asc")), "ix_saved_projects_type_created_at_id"),
+    ]
+    for label, query, index in archive:
+        yield f"archive: {label}", ProjectListing.statement(query, dialect), index
+    # GET /projects/ (offset listing kept for the frontend)
+    yield "projects: newest first", select(SavedProject).order_by(SavedProject.created_at.desc()).limit(100), "ix_saved_projects_created_at_id"
+
+
+def plan(db: Session, statement) -> Tuple[List[str], str]:
+    """
+    Names of the indexes a statement's plan uses, and the plan as text.
+    """
+    dialect = db.get_bind().dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    if dialect.name == "sqlite":
+        rows = [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+        indexes = [word for row in rows for word in row.split() if word.startswith("ix_")]
+        return indexes, " | ".join(rows)
+    if dialect.name == "postgresql":
+        for setting in ("enable_seqscan", "enable_bitmapscan", "enable_sort"):
+            db.execute(text(f"SET LOCAL {setting} = off"))
+        document = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        document = json.loads(document) if isinstance(document, str) else document
+        indexes, nodes = [], [document[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if "Index Name" in node:
+                indexes.append(node["Index Name"])
+            nodes += node.get("Plans", [])
+        return indexes, json.dumps(document[0]["Plan"])
+    raise ValueError(f"No plan check for '{dialect.name}'")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    failures = 0
+    try:
+        for label, statement, expected in cases(db.get_bind().dialect.name):
+            indexes, text_plan = plan(db, statement)
+            ok = expected in indexes
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'}  {label:32s} {', '.join(indexes) or 'no index'}")
+            if args.verbose or not ok:
+                print(f"      expected {expected}: {text_plan}")
+        db.rollback()
+    finally:
+        db.close()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
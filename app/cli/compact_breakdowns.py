@@ -0,0 +1,87 @@
+"""
+Converts saved_projects breakdowns between verbose JSON and the compact encoding.
+
+    python -m app.cli.compact_breakdowns [--expand] [--dry-run] [--batch-size N] [--vacuum]
+
+Stores each row's breakdown_json as a breakdown_blob (see BreakdownStorage) and
+reports the breakdown sizes before and after; rows whose breakdown cannot be
+encoded losslessly are left as JSON. --expand writes the verbose JSON back and
+clears the blobs (run it before downgrading past migration 0003). Set
+BREAKDOWN_STORAGE to match, or new saves keep arriving in the other form.
+--vacuum compacts a SQLite database.
+"""
+import argparse
+import json
+import os
+import sys
+
+from sqlalchemy import select, update
+
+from app.database.session import SessionLocal, engine
+from app.models.saved_project import SavedProject
+from app.services.breakdown_storage import BreakdownStorage
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--expand", action="store_true", help="convert compact rows back to JSON")
+    parser.add_argument("--dry-run", action="store_true", help="report sizes without writing")
+    parser.add_argument("--batch-size", type=int, default=500, help="rows per transaction")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards (SQLite)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        # Plain column selects: the load event would materialize every blob
+        stored = SavedProject.breakdown_blob.isnot(None) if args.expand else SavedProject.breakdown_blob.is_(None)
+        last_id = rows = converted = skipped = json_bytes = blob_bytes = 0
+        while True:
+            batch = db.execute(
+                select(SavedProject.id, SavedProject.version, SavedProject.total_cost, SavedProject.breakdown_json, SavedProject.breakdown_blob)
+                .where(stored, SavedProject.id > last_id)
+                .order_by(SavedProject.id)
+                .limit(args.batch_size)
+            ).all()
+            if not batch:
+                break
+            last_id = batch[-1].id
+            changes = []
+            for row in batch:
+                rows += 1
+                if args.expand:
+                    breakdown, blob = BreakdownStorage.decode(engine, row.breakdown_blob, row.total_cost), row.breakdown_blob
+                    changes.append({"id": row.id, "version": row.version, "breakdown_json": breakdown, "breakdown_blob": None})
+                else:
+                    breakdown, blob = row.breakdown_json, BreakdownStorage.encode(engine, row.breakdown_json, row.total_cost)
+                    if blob is None:
+                        skipped += 1
+                        continue
+                    changes.append({"id": row.id, "version": row.version, "breakdown_json": None, "breakdown_blob": blob})
+                json_bytes += len(json.dumps(breakdown))
+                blob_bytes += len(blob)
+                converted += 1
+            if changes and not args.dry_run:
+                # Checked against each row's version, so a save racing the batch fails it
+                db.execute(update(SavedProject), changes)
+                db.commit()
+
+        action = "expanded" if args.expand else "compacted"
+        print(f"rows: {rows:,}  {action}: {converted:,}  left as JSON: {skipped:,}{' (dry run)' if args.dry_run else ''}")
+        if converted:
+            print(f"breakdowns: {json_bytes / 1e6:.2f} MB JSON, {blob_bytes / 1e6:.2f} MB compact "
+                  f"({json_bytes / converted:,.0f} -> {blob_bytes / converted:,.0f} bytes/row)")
+
+        if args.vacuum and not args.dry_run and engine.dialect.name == "sqlite":
+            db.close()
+            database = engine.url.database
+            size = os.path.getsize(database)
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.exec_driver_sql("VACUUM")
+            print(f"vacuum: {database} {size / 1e6:.2f} MB -> {os.path.getsize(database) / 1e6:.2f} MB")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
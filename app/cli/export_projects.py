@@ -0,0 +1,57 @@
+"""
+Exports saved projects as CSV, NDJSON or Parquet through a server-side cursor.
+
+    python -m app.cli.export_projects -o projects.csv [--format csv|ndjson|parquet]
+                                      [--flatten] [--project-type villa]
+                                      [--from 2026-01-01] [--to 2026-03-31] [--batch-size N]
+
+--flatten turns each breakdown into one amount column per component. The format
+defaults to the output file's extension. Throughput and peak memory are
+reported on stderr.
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+from datetime import date
+
+from app.services.project_export_service import FORMATS, ProjectDataExporter
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", required=True, help='output path, or "-" for stdout')
+    parser.add_argument("--format", choices=list(FORMATS))
+    parser.add_argument("--flatten", action="store_true", help="one column per breakdown component")
+    parser.add_argument("--project-type")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="created on or after (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="created on or before (YYYY-MM-DD)")
+    parser.add_argument("--batch-size", type=int, help="rows per cursor batch")
+    args = parser.parse_args(argv)
+
+    format = args.format or os.path.splitext(args.output)[1].lstrip(".") or "csv"
+    try:
+        exporter = ProjectDataExporter(format, args.flatten, args.project_type, args.date_from, args.date_to, args.batch_size)
+    except ValueError as e:
+        parser.error(str(e))
+    target = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    start = time.perf_counter()
+    try:
+        for chunk in exporter.stream():
+            target.write(chunk)
+    finally:
+        if target is not sys.stdout.buffer:
+            target.close()
+    elapsed = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{exporter.rows:,} projects, {exporter.bytes / 1e6:.1f} MB {format} in {elapsed:.1f}s  "
+          f"{exporter.rows / elapsed:,.0f} rows/s  peak RSS {peak:.0f} MB",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Exports saved project reports as a ZIP, rendering missing ones across a process pool.
+
+    python -m app.cli.export_reports -o reports.zip [--project-type villa]
+                                     [--from 2026-01-01] [--to 2026-03-31] [--workers N]
+
+Throughput (reports and pages per second) is reported on stderr.
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from app.services.archive_export_service import ArchiveExporter
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", required=True, help='ZIP path, or "-" for stdout')
+    parser.add_argument("--project-type")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="created on or after (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="created on or before (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, help="render processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    exporter = ArchiveExporter(args.project_type, args.date_from, args.date_to, args.workers)
+    target = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    start = time.perf_counter()
+    try:
+        for chunk in exporter.stream():
+            target.write(chunk)
+    finally:
+        if target is not sys.stdout.buffer:
+            target.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"{exporter.projects:,} reports ({exporter.rendered:,} rendered, {exporter.pages:,} pages, "
+          f"{exporter.bytes / 1e6:.1f} MB) in {elapsed:.1f}s with {exporter.workers} workers  "
+          f"{exporter.projects / elapsed:,.1f} reports/s  {exporter.pages / elapsed:,.1f} pages/s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Moves inline base64 signatures out of saved_projects.input_json into the blob store.
+
+    python -m app.cli.externalize_signatures [--dry-run] [--gc] [--vacuum]
+
+Rewrites each row's signature data URL as a "blob:sha256:<hex>" reference and
+reports the input_json and list-endpoint payload sizes before and after.
+--gc removes blobs no row references (run it while no saves are in flight);
+--vacuum compacts a SQLite database.
+"""
+import argparse
+import json
+import os
+import sys
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.database.session import SessionLocal, engine
+from app.models.saved_project import SavedProject
+from app.services.blob_store import BlobStore, SIGNATURE_FIELDS, externalize_signatures
+from app.services.project_service import ProjectService
+from app.schemas.project_schema import SavedProjectResponse
+
+BATCH_SIZE = 500
+
+
+def list_payload_bytes(db) -> int:
+    # GET /projects/ with its default page size
+    projects = ProjectService.get_all_projects(db, limit=100)
+    return len(json.dumps(jsonable_encoder([SavedProjectResponse.model_validate(project) for project in projects])))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="report sizes without writing")
+    parser.add_argument("--gc", action="store_true", help="delete unreferenced blobs")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards (SQLite)")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        payload_before = list_payload_bytes(db)
+        ids = [project_id for (project_id,) in db.query(SavedProject.id).order_by(SavedProject.id)]
+        rows = migrated = size_before = size_after = 0
+        referenced = set()
+
+        for start in range(0, len(ids), BATCH_SIZE):
+            batch = db.query(SavedProject).filter(SavedProject.id.in_(ids[start:start + BATCH_SIZE])).all()
+            for project in batch:
+                rows += 1
+                before = project.input_json
+                after = before if args.dry_run else externalize_signatures(before)
+                if args.dry_run and isinstance(before, dict):
+                    # Size the row as it would be stored, without touching the blob store
+                    after = {
+                        key: ("blob:sha256:" + "0" * 64 if key in SIGNATURE_FIELDS and str(value).startswith("data:image") else value)
+                        for key, value in before.items()
+                    }
+                size_before += len(json.dumps(before))
+                size_after += len(json.dumps(after))
+                if after != before and not args.dry_run:
+                    project.input_json = after
+                    flag_modified(project, "input_json")
+                    migrated += 1
+                for field in SIGNATURE_FIELDS:
+                    digest = BlobStore.digest((after or {}).get(field) if isinstance(after, dict) else None)
+                    if digest:
+                        referenced.add(digest)
+            if not args.dry_run:
+                db.commit()
+            db.expunge_all()
+
+        print(f"rows: {rows:,}  migrated: {migrated:,}{' (dry run)' if args.dry_run else ''}")
+        if rows:
+            print(f"input_json: {size_before / 1e6:.2f} MB -> {size_after / 1e6:.2f} MB  "
+                  f"({size_before / rows:,.0f} -> {size_after / rows:,.0f} bytes/row)")
+        if not args.dry_run:
+            print(f"GET /projects payload (limit=100): {payload_before / 1e3:,.1f} kB -> {list_payload_bytes(db) / 1e3:,.1f} kB")
+
+        if args.gc and not args.dry_run:
+            removed = 0
+            for digest in list(BlobStore.digests()):
+                if digest not in referenced:
+                    BlobStore.remove(digest)
+                    removed += 1
+            print(f"gc: removed {removed} unreferenced blobs, {len(referenced)} referenced")
+
+        if args.vacuum and not args.dry_run and engine.dialect.name == "sqlite":
+            db.close()
+            database = engine.url.database
+            size = os.path.getsize(database)
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                connection.exec_driver_sql("VACUUM")
+            print(f"vacuum: {database} {size / 1e6:.2f} MB -> {os.path.getsize(database) / 1e6:.2f} MB")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
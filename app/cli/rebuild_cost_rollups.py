@@ -0,0 +1,39 @@
+"""
+Recomputes the cost_rollups table behind /analytics from saved_projects.
+
+    python -m app.cli.rebuild_cost_rollups [--batch-size N]
+
+Saves and deletes keep the rollups current on their own, and the migration
+that creates the table fills it; run this after changing
+COST_ROLLUP_RELATIVE_ACCURACY, or to clear accumulated float drift. Run it
+while no saves are in flight, or their projects can be missed or counted twice.
+"""
+import argparse
+import sys
+import time
+
+from sqlalchemy import func, select
+
+from app.database.session import SessionLocal
+from app.models.cost_rollup import CostRollup
+from app.services.cost_rollup_service import CostRollups
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=5000, help="projects read per batch")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        projects = CostRollups.rebuild(db, batch_size=args.batch_size)
+        rows = db.scalar(select(func.count()).select_from(CostRollup))
+        print(f"projects: {projects:,}  rollup rows: {rows:,}  ({time.perf_counter() - start:.1f}s)")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Re-prices saved projects on the current rate card (app/core/constants.py).
+
+    python -m app.cli.reprice_projects [--project-type villa] [--report deltas.csv]
+                                       [--workers N] [--chunk-size N]
+
+Every project saved on an older rate card gets a new version in estimations;
+the saved project itself is left as it was. Each project's change
+(previous_total_cost -> total_cost) is written to --report, CSV or NDJSON by
+its extension, and the run ends with a summary and the largest changes. An
+interrupted run (Ctrl-C, crash) resumes from its last checkpoint when started
+again on the same rate card; --report then covers only the remaining projects.
+"""
+import argparse
+import csv
+import heapq
+import json
+import sys
+import time
+
+from app.database.session import SessionLocal
+from app.services.repricing_service import ProjectRepricer
+
+FIELDS = ["project_id", "project_type", "previous_total_cost", "total_cost", "delta", "delta_pct", "error"]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project-type")
+    parser.add_argument("--report", help="per-project deltas, .csv or .ndjson")
+    parser.add_argument("--workers", type=int, help="worker processes (default REPRICE_WORKERS)")
+    parser.add_argument("--chunk-size", type=int, help="projects per task and checkpoint")
+    parser.add_argument("--top", type=int, default=10, help="largest changes to list")
+    args = parser.parse_args(argv)
+
+    try:
+        repricer = ProjectRepricer(args.project_type, args.workers, args.chunk_size)
+    except ValueError as e:
+        parser.error(str(e))
+
+    db = SessionLocal()
+    report = open(args.report, "w", newline="") if args.report else None
+    try:
+        run = repricer.start(db)
+        if repricer.resumed:
+            print(f"resuming run {run.id} on rate card {run.rate_card_version} after project {run.last_project_id:,} "
+                  f"({run.projects:,} done)")
+        else:
+            print(f"run {run.id} on rate card {run.rate_card_version} ({repricer.workers} worker processes)")
+        writer = None
+        if report and not args.report.endswith(".ndjson"):
+            writer = csv.DictWriter(report, FIELDS)
+            writer.writeheader()
+
+        start = time.perf_counter()
+        projects = 0
+        largest = []
+        for delta in repricer.reprice(db):
+            projects += 1
+            if writer:
+                writer.writerow(delta)
+            elif report:
+                report.write(json.dumps(delta) + "\n")
+            if delta["delta_pct"] is not None:
+                heapq.heappush(largest, (abs(delta["delta_pct"]), delta["project_id"], delta))
+                if len(largest) > args.top:
+                    heapq.heappop(largest)
+            if projects % 10000 == 0:
+                print(f"  {projects:,} projects, {projects / (time.perf_counter() - start):,.0f}/s", file=sys.stderr)
+        elapsed = time.perf_counter() - start
+
+        print(f"projects: {run.projects:,}  changed: {run.changed:,}  failed: {run.failed:,}  "
+              f"({projects:,} this session in {elapsed:.1f}s, {projects / elapsed if elapsed else 0:,.0f}/s)")
+        if run.previous_total:
+            print(f"total: {run.previous_total:,.2f} -> {run.total:,.2f}  ({100 * (run.total / run.previous_total - 1):+.2f}%)")
+        for _, _, delta in sorted(largest, reverse=True):
+            print(f"  project {delta['project_id']:>8} {delta['project_type'] or '':12s} "
+                  f"{delta['previous_total_cost']:>16,.2f} -> {delta['total_cost']:>16,.2f}  {delta['delta_pct']:+.2f}%")
+    finally:
+        if report:
+            report.close()
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
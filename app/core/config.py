@@ -10,9 +10,102 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./test.db"
     SQLALCHEMY_DATABASE_URI: str = DATABASE_URL
+    # Estimate/save/list/get/delete routes on an AsyncSession (aiosqlite/asyncpg);
+    # False keeps the blocking Session, run in the threadpool
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URI: str = "" # derived from SQLALCHEMY_DATABASE_URI when empty
+    # Schema is managed by Alembic (`alembic upgrade head`); startup only checks the
+    # revision unless this runs the upgrade itself (single-instance/dev setups)
+    DATABASE_MIGRATE_ON_STARTUP: bool = False
 
     # Reports
     REPORTS_DIR: str = "reports"
+    REPORT_QUEUE_WORKERS: int = 2 # 0 renders inline during the save
+    REPORT_MAX_ATTEMPTS: int = 3
+    REPORT_RETRY_BACKOFF_SECONDS: float = 2.0
+    REPORT_DOWNLOAD_WAIT_SECONDS: float = 10.0
+    # A job "running" without an update for this long belongs to a dead process and
+    # is requeued on startup; younger ones may be rendering in another worker
+    REPORT_STALE_RUNNING_SECONDS: float = 600
+    REPORT_RENDER_ON_SAVE: bool = False # otherwise rendered on first download
+    REPORT_INLINE_RENDER: bool = False # download-pdf renders in-request instead of queueing
+    REPORT_WRITE_THROUGH: bool = True # keep inline-rendered reports in the report store
+    REPORT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    REPORT_CACHE_MAX_AGE_SECONDS: float = 30 * 24 * 3600 # 0 disables the age bound
+
+    # Content-addressed blobs (signature images) referenced from input_json
+    BLOB_DIR: str = "data/blobs"
+    SIGNATURE_CACHE_SIZE: int = 256 # decoded ImageReaders kept in memory
+
+    # Bulk project save (/projects/save-bulk): rows per request and per transaction
+    PROJECT_BULK_SAVE_MAX_ROWS: int = 50000
+    PROJECT_BULK_SAVE_CHUNK_SIZE: int = 1000
+
+    # Saved breakdowns: "json" (verbose list) or "compact" (codebook ids and
+    # amounts in breakdown_blob, materialized on load; see BreakdownStorage)
+    BREAKDOWN_STORAGE: str = "json"
+
+    # Cost analytics rollups: relative accuracy of the percentile sketch. Bucket
+    # boundaries depend on it; after a change run `python -m app.cli.rebuild_cost_rollups`
+    COST_ROLLUP_RELATIVE_ACCURACY: float = 0.01
+
+    # Archive export (0 workers = one per core)
+    EXPORT_WORKERS: int = 0
+    EXPORT_IN_FLIGHT_PER_WORKER: int = 4
+    EXPORT_START_METHOD: str = "spawn" # safe alongside the server's threads
+    # Data export (/projects/export/data): rows per cursor batch, CSV chunk and Parquet
+    # row group. Peak memory follows it (about 20 MB per 1000 own-house rows)
+    EXPORT_DATA_BATCH_SIZE: int = 1000
+
+    # Re-pricing on rate card changes (python -m app.cli.reprice_projects; 0 workers = one per core)
+    REPRICE_WORKERS: int = 0
+    REPRICE_CHUNK_SIZE: int = 500 # projects per worker task and per checkpoint commit
+    REPRICE_START_METHOD: str = "spawn"
+
+    # Engines
+    OWN_HOUSE_BATCH_MAX_ROWS: int = 100000
+    OWN_HOUSE_PRICING_TABLE: str = "startup" # "off", "startup", "file"
+    OWN_HOUSE_PRICING_TABLE_PATH: str = "data/own_house_pricing_table.npz"
+
+    # Estimate result cache (0 disables)
+    ESTIMATE_CACHE_MAXSIZE: int = 10000
+    ESTIMATE_CACHE_TTL_SECONDS: float = 3600
+
+    # Concurrent identical estimates and PDF renders share one computation; how
+    # long a caller waits on someone else's before giving up (0 waits forever)
+    SINGLE_FLIGHT_ESTIMATE_TIMEOUT_SECONDS: float = 30.0
+    SINGLE_FLIGHT_REPORT_TIMEOUT_SECONDS: float = 120.0
+
+    # HTTP caching: GET estimates and catalog data carry strong ETags (inputs + rate
+    # card version). The max-age is how long a browser or proxy may reuse a response
+    # without revalidating, so also how long a new rate card can take to show
+    HTTP_CACHE_ESTIMATE_MAX_AGE: int = 300
+    HTTP_CACHE_CATALOG_MAX_AGE: int = 3600
+
+    # Wizard estimation sessions (WebSocket) are closed after this long without a message
+    ESTIMATE_SESSION_IDLE_SECONDS: float = 600
+
+    # Latency histograms served at /metrics (Prometheus text format); off removes
+    # the timers entirely
+    METRICS_ENABLED: bool = True
+    # Engine and breakdown-stage timers time one call in this many (counted that
+    # many times); timing every microsecond-scale call costs over 10%. 1 times all
+    METRICS_SAMPLE_EVERY: int = 256
+
+    # Per-request profiling (listed at /admin/profiles). When enabled, a request is
+    # profiled if it sends PROFILING_HEADER (equal to PROFILING_TOKEN when one is set)
+    # or falls in PROFILING_SAMPLE_RATE; one profile runs at a time
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_TOKEN: str = ""
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_SECONDS: float = 0.002 # stack sampling period
+    PROFILING_DIR: str = "data/profiles"
+    PROFILING_MAX_PROFILES: int = 100 # oldest deleted past this
+
+    # Bulk estimation uploads above this size spool to disk; larger than the max are refused (413)
+    BULK_SPOOL_MAX_MEMORY: int = 8 * 1024 * 1024
+    BULK_MAX_UPLOAD_BYTES: int = 1024 * 1024 * 1024
 
     class Config:
         case_sensitive = True
@@ -34,12 +34,16 @@ OWN_HOUSE_PLAN_MULTIPLIERS = {
 # Base floor is G+1. 1.12 multiplier per extra floor level.
 FLOOR_INCREASE_MULTIPLIER = 1.12
 
+# 3.5 Inflation Factor (1.02% Increase, applied to the final multi-tiered total)
+INFLATION_FACTOR = 1.0102
+
 # 4. Optional Add-ons (Fixed Fixed Costs)
 OWN_HOUSE_ADDONS = {
     "compound_wall": 300000,
     "rainwater_harvesting": 60000,
     "car_parking": 55000
 }
+TERRACE_GUEST_BEDROOM_COST = 225000  # ₹2.25 lakhs
 
 # 5. Core 18-Component Breakdown Ratios (Sum to 1.0)
 # Categorized into: STRUCTURE, UTILITIES, BATHROOMS, ELECTRICAL, FLOORING, EXTERIOR
@@ -187,6 +191,18 @@ BREAKDOWN_PERCENTAGES = {
 }
 
 
+# --- Uncertainty (Monte Carlo cost ranges) ---
+# Each breakdown ratio is sampled as ratio * Normal(1, RATIO_SPREAD), clipped at 0
+UNCERTAINTY_RATIO_SPREAD = 0.08
+# Inflation factor ~ Triangular(low, mode, high); mode is the point-estimate factor.
+# Bounds are symmetric about it (no deflation below, as much again above) so the
+# mean, (low + mode + high) / 3, stays on the point estimate and P50 is not skewed
+UNCERTAINTY_INFLATION = {"low": 1.0, "mode": INFLATION_FACTOR, "high": 2 * INFLATION_FACTOR - 1.0}
+# Zone multiplier ~ Triangular(z * (1 - spread), z, z * (1 + spread))
+UNCERTAINTY_ZONE_SPREAD = 0.05
+UNCERTAINTY_DEFAULT_SAMPLES = 10000
+UNCERTAINTY_MAX_SAMPLES = 1000000
+
 
 # Facilities Data
 OWN_HOUSE_GRADE_FACILITIES = {
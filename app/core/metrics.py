@@ -0,0 +1,259 @@
+import functools
+import inspect
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+from app.core.config import settings
+
+# Upper bounds in seconds; engines and stages run in microseconds, requests in milliseconds
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Label values past a metric's first max_series combinations are folded into this one
+OVERFLOW = "other"
+
+
+def escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Series:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, buckets: int):
+        # Per-bucket (not cumulative) counts; the last slot is +Inf
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+
+
+class Histogram:
+    """
+    Prometheus histogram with a fixed label set. Observing costs a bisect and two
+    additions under a lock; cumulative bucket counts are only built at scrape
+    time. At most max_series label combinations are kept, so a label can never
+    grow without bound (later combinations are counted under "other").
+
+    With sample_every=N, time() and clock() only time one call in N and count it
+    N times, so _count and _sum still estimate every call. For code paths that
+    run in microseconds, where timing each call would cost several percent.
+    """
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = REQUEST_BUCKETS, max_series: int = 500, sample_every: int = 1):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.max_series = max_series
+        self.sample_every = max(1, sample_every)
+        self._series: Dict[Tuple[str, ...], _Series] = {}
+        self._lock = threading.Lock()
+        self._clock_countdown = self.sample_every
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.observe_weighted(value, labels, 1)
+
+    def observe_weighted(self, value: float, labels: Tuple[str, ...], weight: int) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels) or self._new_series(labels)
+            series.counts[index] += weight
+            series.sum += value * weight
+
+    def observe_laps(self, labels: Sequence[str], marks: Sequence[float], weight: int = 1) -> None:
+        """
+        Observes marks[i + 1] - marks[i] under labels[i] (a single label per
+        series), taking the lock once for the lot.
+        """
+        buckets = self.buckets
+        with self._lock:
+            for label, start, end in zip(labels, marks, marks[1:]):
+                key = (label,)
+                series = self._series.get(key) or self._new_series(key)
+                value = end - start
+                series.counts[bisect_left(buckets, value)] += weight
+                series.sum += value * weight
+
+    def _new_series(self, labels: Tuple[str, ...]) -> _Series:
+        # Caller holds the lock
+        if len(self._series) >= self.max_series:
+            labels = (OVERFLOW,) * len(self.label_names)
+        return self._series.setdefault(labels, _Series(len(self.buckets)))
+
+    def time(self, *labels: str) -> Callable:
+        """
+        Decorator observing the wrapped function's duration (exceptions included).
+        A no-op when METRICS_ENABLED is off. When sample_every > 1 the wrapper
+        only forwards positional arguments, and a single-argument function (an
+        engine's estimate_cost) gets a single-argument wrapper: CPython calls
+        through it without packing a tuple, which halves its cost.
+        """
+        every = self.sample_every
+
+        def decorator(fn: Callable) -> Callable:
+            if not settings.METRICS_ENABLED:
+                return fn
+
+            if every == 1:
+                @functools.wraps(fn)
+                def timed(*args, **kwargs):
+                    start = time.perf_counter()
+                    try:
+                        return fn(*args, **kwargs)
+                    finally:
+                        self.observe_weighted(time.perf_counter() - start, labels, 1)
+                return timed
+
+            def timed_call(*args):
+                start = time.perf_counter()
+                try:
+                    return fn(*args)
+                finally:
+                    self.observe_weighted(time.perf_counter() - start, labels, every)
+
+            # Unsynchronized: a race only shifts which call gets timed
+            countdown = every
+            code = getattr(fn, "__code__", None)
+            if code is not None and code.co_argcount == 1 and not code.co_flags & inspect.CO_VARARGS:
+                def sampled(arg):
+                    nonlocal countdown
+                    countdown -= 1
+                    if countdown > 0:
+                        return fn(arg)
+                    countdown = every
+                    return timed_call(arg)
+            else:
+                def sampled(*args):
+                    nonlocal countdown
+                    countdown -= 1
+                    if countdown > 0:
+                        return fn(*args)
+                    countdown = every
+                    return timed_call(*args)
+            return functools.wraps(fn)(sampled)
+        return decorator
+
+    def clock(self) -> "StageClock":
+        """
+        A StageClock for one run of a staged computation (see StageClock), or the
+        no-op NULL_CLOCK when metrics are off or this run is not sampled.
+        """
+        if not settings.METRICS_ENABLED:
+            return NULL_CLOCK
+        self._clock_countdown -= 1
+        if self._clock_countdown > 0:
+            return NULL_CLOCK
+        self._clock_countdown = self.sample_every
+        return StageClock(self)
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(labels, list(series.counts), series.sum) for labels, series in self._series.items()]
+        for labels, counts, total in sorted(snapshot):
+            pairs = [f'{name}="{escape(value)}"' for name, value in zip(self.label_names, labels)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                label_text = ",".join(pairs + [f'le="{format_value(bound)}"'])
+                yield f"{self.name}_bucket{{{label_text}}} {cumulative}"
+            suffix = "{" + ",".join(pairs) + "}" if pairs else ""
+            yield f"{self.name}_sum{suffix} {format_value(total)}"
+            yield f"{self.name}_count{suffix} {cumulative}"
+
+
+class Registry:
+    """
+    Histograms plus scrape-time collectors: callables returning
+    (name, type, help, [(labels dict, value)]) for counters and gauges the app
+    already keeps elsewhere (estimate cache, single-flight).
+    """
+
+    def __init__(self):
+        self.histograms: List[Histogram] = []
+        self.collectors: List[Callable[[], Iterable[tuple]]] = []
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        histogram = Histogram(*args, **kwargs)
+        self.histograms.append(histogram)
+        return histogram
+
+    def collector(self, fn: Callable[[], Iterable[tuple]]) -> Callable:
+        self.collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.collect())
+        for collect in self.collectors:
+            for name, kind, documentation, samples in collect():
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_text = ",".join(f'{key}="{escape(str(val))}"' for key, val in labels.items())
+                    lines.append(f"{name}{{{label_text}}} {format_value(value)}" if label_text else f"{name} {format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, method and status.",
+    labels=("method", "route", "status"), buckets=REQUEST_BUCKETS
+)
+ENGINE_SECONDS = registry.histogram(
+    "engine_estimate_duration_seconds", "Engine estimate_cost time by project type (sampled).",
+    labels=("engine",), buckets=FAST_BUCKETS, sample_every=settings.METRICS_SAMPLE_EVERY
+)
+BREAKDOWN_STAGE_SECONDS = registry.histogram(
+    "breakdown_stage_duration_seconds", "calculate_smart_breakdown time by stage (sampled).",
+    labels=("stage",), buckets=FAST_BUCKETS, sample_every=settings.METRICS_SAMPLE_EVERY
+)
+PDF_RENDER_SECONDS = registry.histogram(
+    "pdf_render_duration_seconds", "PDF report render time.", buckets=SLOW_BUCKETS
+)
+DB_SECONDS = registry.histogram(
+    "db_session_duration_seconds", "SQLAlchemy session flush and commit time.",
+    labels=("operation",), buckets=SLOW_BUCKETS
+)
+
+
+class StageClock:
+    """
+    Timestamps the end of each stage of a computation; observe() records the
+    stage durations in one go. Get one from Histogram.clock().
+    """
+    __slots__ = ("histogram", "marks")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.marks = [time.perf_counter()]
+
+    def lap(self) -> None:
+        self.marks.append(time.perf_counter())
+
+    def observe(self, stages: Sequence[str]) -> None:
+        self.histogram.observe_laps(stages, self.marks, self.histogram.sample_every)
+
+
+class _NullClock:
+    __slots__ = ()
+
+    def lap(self) -> None:
+        pass
+
+    def observe(self, stages: Sequence[str]) -> None:
+        pass
+
+
+NULL_CLOCK = _NullClock()
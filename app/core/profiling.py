@@ -0,0 +1,149 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Tuple
+
+# Leaf frames of a thread with nothing to do: the event loop in select(), pool
+# and report-queue workers blocked on their queues. Samples ending in one are dropped
+IDLE_LEAVES = frozenset({("selectors.py", "select"), ("threading.py", "wait"), ("queue.py", "get")})
+
+# Inclusive time reported on its own for every profile, by function qualname
+HIGHLIGHTS = {
+    "pdf_render": ("PDFService.generate_project_report", "PDFService.render_project_report"),
+    "db_commit": ("Session.commit", "AsyncSession.commit")
+}
+
+
+def frame_label(code) -> str:
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def function_key(code) -> Tuple[str, int, str]:
+    # pstats' (filename, line, function name), with the class in the name
+    return code.co_filename, code.co_firstlineno, code.co_qualname
+
+
+class StackSampler:
+    """
+    Samples the Python stack of every thread except its own each interval, until
+    stop(). A request's work is spread over the event loop, the threadpool (sync
+    sessions, run_in_threadpool) and the report queue, which a cProfile enabled
+    in one thread would not see; the sampler sees them all. Each sample is
+    weighted by the time since the previous one and keyed by thread name and stack.
+    While it runs the interpreter's switch interval is lowered to the sampling
+    interval, or the sampler would wait up to 5 ms for the GIL between samples.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples: Counter = Counter() # (thread name, stack) -> seconds
+        self.sample_count = 0
+        self._done = threading.Event()
+        self._switch_interval = sys.getswitchinterval()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> "StackSampler":
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        # Returns at once; join() before reading samples
+        self._done.set()
+        sys.setswitchinterval(self._switch_interval)
+
+    def join(self) -> None:
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        last = time.perf_counter()
+        while not self._done.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = now - last, now
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(names.get(ident, str(ident)), tuple(stack))] += weight
+                self.sample_count += 1
+
+
+def collapsed_stacks(samples: Counter) -> Iterable[str]:
+    """
+    Brendan Gregg's collapsed format (flamegraph.pl, speedscope): one
+    "thread;outer;...;leaf <microseconds>" line per distinct stack.
+    """
+    lines = Counter()
+    for (thread, stack), seconds in samples.items():
+        frames = [thread] + [frame_label(code) for code in stack]
+        lines[";".join(frame.replace(";", ":") for frame in frames)] += seconds
+    for line, seconds in sorted(lines.items()):
+        yield f"{line} {max(1, round(seconds * 1e6))}"
+
+
+def pstats_table(samples: Counter) -> Dict[tuple, tuple]:
+    """
+    Samples as the dict pstats.Stats loads (marshal'd, as cProfile's dump_stats
+    writes it): self and cumulative seconds per function and per caller edge.
+    Call counts are sample counts.
+    """
+    table: Dict[tuple, list] = {}
+    callers: Dict[tuple, Dict[tuple, list]] = {}
+    for (_, stack), seconds in samples.items():
+        keys = [function_key(code) for code in stack]
+        seen = set()
+        for index, key in enumerate(keys):
+            entry = table.setdefault(key, [0, 0, 0.0, 0.0])
+            if index == len(keys) - 1:
+                entry[2] += seconds
+            if key in seen:
+                continue
+            seen.add(key)
+            entry[0] += 1
+            entry[1] += 1
+            entry[3] += seconds
+            if index:
+                edge = callers.setdefault(key, {}).setdefault(keys[index - 1], [0, 0, 0.0, 0.0])
+                edge[0] += 1
+                edge[1] += 1
+                edge[3] += seconds
+                if index == len(keys) - 1:
+                    edge[2] += seconds
+    return {
+        key: (cc, nc, tt, ct, {caller: tuple(edge) for caller, edge in callers.get(key, {}).items()})
+        for key, (cc, nc, tt, ct) in table.items()
+    }
+
+
+def summarize(samples: Counter, top: int = 10) -> Dict[str, Any]:
+    """
+    Sampled time, the HIGHLIGHTS' inclusive time and the functions with the most
+    self time. Times are summed over threads, so busy threads running side by
+    side can add up to more than the request's duration.
+    """
+    total = sum(samples.values())
+    highlights = {name: 0.0 for name in HIGHLIGHTS}
+    own: Counter = Counter()
+    for (_, stack), seconds in samples.items():
+        names = {code.co_qualname for code in stack}
+        for name, functions in HIGHLIGHTS.items():
+            if not names.isdisjoint(functions):
+                highlights[name] += seconds
+        own[frame_label(stack[-1])] += seconds
+    share = lambda seconds: round(seconds / total, 4) if total else 0.0
+    return {
+        "sampled_ms": round(total * 1e3, 3),
+        "highlights": {name: {"ms": round(seconds * 1e3, 3), "share": share(seconds)} for name, seconds in highlights.items()},
+        "top_self": [{"function": name, "ms": round(seconds * 1e3, 3), "share": share(seconds)} for name, seconds in own.most_common(top)]
+    }
@@ -0,0 +1,15 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+CONSTANTS_PATH = Path(__file__).with_name("constants.py")
+
+
+@lru_cache(maxsize=None)
+def rate_card_version() -> str:
+    """
+    Short content hash of app/core/constants.py. Anything derived from the rate card
+    (precomputed tables, cached or stored estimates) is tagged with it so a change to
+    the constants is detected instead of silently serving stale prices.
+    """
+    return hashlib.sha256(CONSTANTS_PATH.read_bytes()).hexdigest()[:16]
@@ -0,0 +1,54 @@
+from typing import Union
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.session import SessionLocal
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg"
+}
+
+# What get_async_db hands to the async routes, depending on DATABASE_ASYNC
+AnySession = Union[AsyncSession, Session]
+
+
+def async_database_uri(uri: str) -> str:
+    """
+    The async-driver form of a sync database URL (sqlite -> aiosqlite,
+    postgresql -> asyncpg).
+    """
+    scheme, rest = uri.split("://", 1)
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{dialect}'")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URI or async_database_uri(settings.SQLALCHEMY_DATABASE_URI),
+        pool_pre_ping=True
+    )
+    # Routes serialize ORM rows after the commit; expiring them would need lazy IO
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """
+    Session for the async routes: an AsyncSession when DATABASE_ASYNC is set,
+    otherwise the blocking Session, which AsyncProjectService runs in the threadpool.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        # Each threadpool call already closed it; nothing left to release
+        db.close()
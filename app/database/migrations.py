@@ -0,0 +1,40 @@
+from pathlib import Path
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+def alembic_config() -> Config:
+    config = Config(str(ALEMBIC_INI))
+    # Leave the application's logging configuration alone
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def head_revision() -> Optional[str]:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(engine: Engine) -> Optional[str]:
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def ensure_schema(engine: Engine) -> None:
+    """
+    Fails startup unless the database is at the latest migration, running the
+    upgrade first when DATABASE_MIGRATE_ON_STARTUP is set.
+    """
+    if settings.DATABASE_MIGRATE_ON_STARTUP:
+        command.upgrade(alembic_config(), "head")
+    current, head = current_revision(engine), head_revision()
+    if current != head:
+        raise RuntimeError(
+            f"Database schema is at revision {current or 'none'}, expected {head}; run `alembic upgrade head`"
+        )
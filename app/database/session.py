@@ -1,6 +1,8 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.metrics import DB_SECONDS
 
 engine_kwargs = {"pool_pre_ping": True}
 if settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
@@ -9,6 +11,29 @@ if settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite"):
 engine = create_engine(settings.SQLALCHEMY_DATABASE_URI, **engine_kwargs)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+if settings.METRICS_ENABLED:
+    # Every Session, including the one behind each AsyncSession; a commit's time
+    # includes the flush it triggers
+    @event.listens_for(Session, "before_flush")
+    def _flush_started(session, flush_context, instances):
+        session.info["flush_started"] = time.perf_counter()
+
+    @event.listens_for(Session, "after_flush_postexec")
+    def _flush_finished(session, flush_context):
+        started = session.info.pop("flush_started", None)
+        if started is not None:
+            DB_SECONDS.observe(time.perf_counter() - started, "flush")
+
+    @event.listens_for(Session, "before_commit")
+    def _commit_started(session):
+        session.info["commit_started"] = time.perf_counter()
+
+    @event.listens_for(Session, "after_commit")
+    def _commit_finished(session):
+        started = session.info.pop("commit_started", None)
+        if started is not None:
+            DB_SECONDS.observe(time.perf_counter() - started, "commit")
+
 def get_db():
     db = SessionLocal()
     try:
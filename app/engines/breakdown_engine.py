@@ -1,15 +1,21 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from app.core.constants import (
     OWN_HOUSE_PLOT_RULES,
     EXTRA_BEDROOM_INCREASE,
     FLOOR_INCREASE_MULTIPLIER,
+    INFLATION_FACTOR,
     CORE_BREAKDOWN_COMPONENTS,
     OWN_HOUSE_ADDONS,
+    TERRACE_GUEST_BEDROOM_COST,
     OWN_HOUSE_PLAN_MULTIPLIERS,
     INTERIOR_PACKAGE_BASE,
     BREAKDOWN_PERCENTAGES,
     OWN_HOUSE_INTERIOR_COSTS
 )
+from app.core.metrics import BREAKDOWN_STAGE_SECONDS
+
+# Stage labels of calculate_smart_breakdown, in the order the clock laps them
+STAGES = ("base", "core", "optional", "plan_inflation", "summary")
 
 class BreakdownEngine:
     @staticmethod
@@ -25,13 +31,44 @@ class BreakdownEngine:
         7. Recalculate total, compute percentages & sort descending
         """
         
+        # Per-stage latency histograms (sampled; a no-op with METRICS_ENABLED off)
+        clock = BREAKDOWN_STAGE_SECONDS.clock()
+
+        # 1-3. Base budget, bedroom adjustment & floor multiplier
+        adjusted = BreakdownEngine.adjusted_base(inputs)
+        clock.lap()
+        
+        # 4. Generate base 18-component breakdown (PRE-INFLATION)
+        breakdown_items = BreakdownEngine.core_breakdown(adjusted["running_total"])
+        clock.lap()
+            
+        # 5. Add optional features (ONLY IF SELECTED)
+        breakdown_items += BreakdownEngine.optional_breakdown(inputs, adjusted["floors"], adjusted["current_beds"])
+        clock.lap()
+
+        # 6-8. Plan multiplier, inflation, percentages & sort
+        plan_type = inputs.get("structural_style", "Base")
+        priced = BreakdownEngine.apply_plan_and_inflation(breakdown_items, plan_type)
+        clock.lap()
+            
+        # Project Summary (STRICT FORMAT)
+        summary = BreakdownEngine.build_project_summary(inputs, adjusted["plot_size"], adjusted["current_beds"], adjusted["floors"], plan_type)
+        clock.lap()
+        clock.observe(STAGES)
+
+        return {
+            "project_summary": summary,
+            **priced
+        }
+
+    @staticmethod
+    def adjusted_base(inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Stages 1-3: plot base budget, bedroom adjustment and floor multiplier.
+        """
         # 1. Get base budget from plot
         plot_size = inputs.get("dimensions", "30x40")
-        base_type = "FULL" 
-        if plot_size in ["40x60", "50x80", "60x80", "60x100"]:
-            base_type = "DOUBLE"
-            
-        base_budget = OWN_HOUSE_PLOT_RULES.get(base_type, {}).get(plot_size, 6000000)
+        base_type, base_budget = BreakdownEngine.resolve_plot(plot_size)
         
         # 2. Apply bedroom adjustment (+₹3L per extra bedroom)
         base_beds = OWN_HOUSE_PLOT_RULES[base_type].get("min_bedrooms", 3)
@@ -47,10 +84,18 @@ class BreakdownEngine:
         elif floors == "G+3":
             running_total *= (FLOOR_INCREASE_MULTIPLIER ** 2)
 
-        # 3.5 Apply Inflation Factor (1.02% Increase)
-        INFLATION_FACTOR = 1.0102
-            
-        # 4. Generate base 18-component breakdown (PRE-INFLATION)
+        return {
+            "plot_size": plot_size,
+            "current_beds": current_beds,
+            "floors": floors,
+            "running_total": running_total
+        }
+
+    @staticmethod
+    def core_breakdown(running_total: float) -> List[Dict[str, Any]]:
+        """
+        Stage 4: the 18 core components of the bedroom/floor-adjusted total (pre-multiplier).
+        """
         breakdown_items = []
         septic_cost = CORE_BREAKDOWN_COMPONENTS["Septic Tank"].get("amount", 50000)
         total_fixed = septic_cost
@@ -72,8 +117,14 @@ class BreakdownEngine:
                 "category": data.get("category", "STRUCTURE"),
                 "amount": round(amt, 2)
             })
-            
-        # 5. Add optional features (ONLY IF SELECTED)
+        return breakdown_items
+
+    @staticmethod
+    def optional_breakdown(inputs: Dict[str, Any], floors: str, current_beds: int) -> List[Dict[str, Any]]:
+        """
+        Stage 5: add-ons, interior package and terrace bedroom (ONLY IF SELECTED).
+        """
+        breakdown_items = []
         if inputs.get("include_compound"):
             breakdown_items.append({"component": "Compound Wall", "category": "EXTERIOR", "amount": OWN_HOUSE_ADDONS["compound_wall"]})
             
@@ -95,11 +146,16 @@ class BreakdownEngine:
             
         # Add terrace guest bedroom cost if selected (₹2.25 lakhs)
         if inputs.get("terrace_guest_bedroom"):
-            terrace_bedroom_cost = 225000  # ₹2.25 lakhs
-            breakdown_items.append({"component": "Terrace Guest Bedroom", "category": "OPTIONAL", "amount": terrace_bedroom_cost})
+            breakdown_items.append({"component": "Terrace Guest Bedroom", "category": "OPTIONAL", "amount": TERRACE_GUEST_BEDROOM_COST})
+        return breakdown_items
 
+    @staticmethod
+    def apply_plan_and_inflation(breakdown_items: List[Dict[str, Any]], plan_type: str) -> Dict[str, Any]:
+        """
+        Stages 6-8 on pre-multiplier items (modified in place): plan multiplier,
+        inflation, percentages and descending sort.
+        """
         # 6. Apply plan multiplier (Base / Classic / Premium / Elite)
-        plan_type = inputs.get("structural_style", "Base")
         multiplier = OWN_HOUSE_PLAN_MULTIPLIERS.get(plan_type, 1.0)
         total_pre_inflation = 0
         for item in breakdown_items:
@@ -118,8 +174,31 @@ class BreakdownEngine:
                 item["percentage"] = round((item["amount"] / total_pre_inflation) * 100, 2)
         
         sorted_breakdown = sorted(breakdown_items, key=lambda x: x["amount"], reverse=True)
+
+        return {
+            "total_cost": round(final_total, 2),
+            "total_before_inflation": round(total_pre_inflation, 2),
+            "inflation_amount": round(inflation_amount, 2),
+            "breakdown": sorted_breakdown
+        }
+
+    @staticmethod
+    def resolve_plot(plot_size: str) -> Tuple[str, int]:
+        """
+        Maps a plot size onto its rule group (FULL / DOUBLE) and base budget.
+        """
+        base_type = "FULL" 
+        if plot_size in ["40x60", "50x80", "60x80", "60x100"]:
+            base_type = "DOUBLE"
             
-        # Project Summary (STRICT FORMAT)
+        base_budget = OWN_HOUSE_PLOT_RULES.get(base_type, {}).get(plot_size, 6000000)
+        return base_type, base_budget
+
+    @staticmethod
+    def build_project_summary(inputs: Dict[str, Any], plot_size: str, current_beds: int, floors: str, plan_type: str) -> Dict[str, Any]:
+        """
+        Project Summary (STRICT FORMAT) shared by the scalar and batched Own House paths.
+        """
         summary = {
             "plot_size": plot_size,
             "bedrooms": f"{current_beds} BHK",
@@ -137,14 +216,7 @@ class BreakdownEngine:
         summary["compound_wall"] = "Included" if inputs.get("include_compound") else "Not Added"
         summary["rainwater_harvesting"] = "Included" if inputs.get("include_rainwater") else "Not Added"
         summary["car_parking"] = "Included" if inputs.get("include_parking") else "Not Added"
-
-        return {
-            "project_summary": summary,
-            "total_cost": round(final_total, 2),
-            "total_before_inflation": round(total_pre_inflation, 2),
-            "inflation_amount": round(inflation_amount, 2),
-            "breakdown": sorted_breakdown
-        }
+        return summary
 
     @staticmethod
     def calculate_breakdown(total_cost: float) -> List[Dict[str, Any]]:
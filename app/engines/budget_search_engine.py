@@ -0,0 +1,153 @@
+import itertools
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.constants import (
+    OWN_HOUSE_PLOT_RULES,
+    OWN_HOUSE_FLOOR_MULTIPLIER,
+    VILLA_UPGRADE_MULTIPLIER,
+    ZONE_MULTIPLIER
+)
+from app.engines.own_house_batch_engine import INTERIOR_COLUMN
+from app.engines.own_house_pricing_table import OwnHousePricingTable, AXES, INTERIOR_AXIS
+from app.engines.villa_engine import VillaEngine
+
+# Pricing-table axes under the OwnHouseCreate field names a match is returned with
+OWN_HOUSE_FIELDS = [
+    "dimensions", "bedrooms", "floor", "structural_style", "interior_package",
+    "include_compound_wall", "include_rainwater_harvesting", "include_car_parking"
+]
+VILLA_FIELDS = ["floor", "upgrade_level", "zone"]
+
+
+class BudgetIndex:
+    """
+    Every configuration of an option space sorted by total cost.
+
+    Each field is stored as a column of codes into its value list, so a set of fixed
+    constraints is a vectorised mask and the budget boundary is a binary search.
+    """
+
+    def __init__(self, values: Dict[str, list], codes: Dict[str, np.ndarray], totals: np.ndarray):
+        order = np.argsort(totals, kind="stable")
+        self.values = values
+        self.codes = {field: column[order] for field, column in codes.items()}
+        self.totals = totals[order]
+
+    def mask(self, equals: Dict[str, Any], ranges: Optional[Dict[str, Tuple[Any, Any]]] = None) -> np.ndarray:
+        """
+        Rows whose field equals the given value / lies in the inclusive (low, high)
+        range. None means unconstrained.
+        """
+        mask = np.ones(len(self.totals), dtype=bool)
+        for field, value in equals.items():
+            if value is None:
+                continue
+            if value not in self.values[field]:
+                raise ValueError(f"Unknown {field}: {value}")
+            mask &= self.codes[field] == self.values[field].index(value)
+        for field, (low, high) in (ranges or {}).items():
+            column = np.asarray(self.values[field])[self.codes[field]]
+            if low is not None:
+                mask &= column >= low
+            if high is not None:
+                mask &= column <= high
+        return mask
+
+    def search(self, budget: float, top_k: int, mode: str, mask: np.ndarray) -> np.ndarray:
+        """
+        Sorted positions of the top_k matches: the most expensive rows at or under
+        budget ("under"), or the rows with the smallest |total - budget| ("closest").
+        """
+        candidates = np.flatnonzero(mask)
+        totals = self.totals[candidates]
+        split = int(np.searchsorted(totals, budget, side="right"))
+        if mode == "under":
+            return candidates[max(0, split - top_k):split][::-1]
+        # The k closest rows lie within k places either side of the budget
+        window = candidates[max(0, split - top_k):split + top_k]
+        nearest = np.argsort(np.abs(self.totals[window] - budget), kind="stable")[:top_k]
+        return window[nearest]
+
+    def configuration(self, position: int) -> Dict[str, Any]:
+        return {field: self.values[field][int(self.codes[field][position])] for field in self.values}
+
+    def matches(self, budget: float, positions: np.ndarray) -> List[Dict[str, Any]]:
+        return [
+            {
+                "configuration": self.configuration(position),
+                "total_cost": float(self.totals[position]),
+                "delta": round(float(self.totals[position]) - budget, 2)
+            }
+            for position in positions.tolist()
+        ]
+
+
+class BudgetSearchEngine:
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def own_house_index() -> BudgetIndex:
+        """
+        Index over the Own House pricing table, restricted to bedroom counts each
+        plot supports (below the minimum prices the same as the minimum) and to
+        interior packages OWN_HOUSE_INTERIOR_COSTS prices for the floor and bedroom
+        count (an unpriced one prices the same as "none").
+        """
+        table = OwnHousePricingTable.get() or OwnHousePricingTable.build()
+        totals = table["total_cost"]
+        axis_codes = np.unravel_index(np.arange(len(totals)), [len(axis) for axis in AXES])
+
+        bedrooms = np.asarray(AXES[1])[axis_codes[1]]
+        plot_min = np.empty(len(AXES[0]), dtype=int)
+        plot_max = np.empty(len(AXES[0]), dtype=int)
+        for i, plot in enumerate(AXES[0]):
+            rules = next(rules for rules in OWN_HOUSE_PLOT_RULES.values() if plot in rules)
+            plot_min[i], plot_max[i] = rules["min_bedrooms"], rules["max_bedrooms"]
+        valid = (bedrooms >= plot_min[axis_codes[0]]) & (bedrooms <= plot_max[axis_codes[0]])
+        no_interior = axis_codes[4] == INTERIOR_AXIS.index("none")
+        valid &= no_interior | (table["amounts"][:, INTERIOR_COLUMN] > 0)
+
+        values = {field: list(axis) for field, axis in zip(OWN_HOUSE_FIELDS, AXES)}
+        codes = {field: column[valid].astype(np.int8) for field, column in zip(OWN_HOUSE_FIELDS, axis_codes)}
+        return BudgetIndex(values, codes, totals[valid])
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def villa_index() -> BudgetIndex:
+        values = {
+            "floor": list(OWN_HOUSE_FLOOR_MULTIPLIER),
+            "upgrade_level": list(VILLA_UPGRADE_MULTIPLIER),
+            "zone": list(ZONE_MULTIPLIER)
+        }
+        combos = list(itertools.product(*(range(len(values[field])) for field in VILLA_FIELDS)))
+        totals = np.array([
+            VillaEngine.estimate_cost({field: values[field][code] for field, code in zip(VILLA_FIELDS, combo)})["total_cost"]
+            for combo in combos
+        ], dtype=float)
+        codes = {field: np.array([combo[i] for combo in combos], dtype=np.int8) for i, field in enumerate(VILLA_FIELDS)}
+        return BudgetIndex(values, codes, totals)
+
+    @staticmethod
+    def search_own_house(query: dict) -> dict:
+        index = BudgetSearchEngine.own_house_index()
+        mask = index.mask(
+            {field: query.get(field) for field in OWN_HOUSE_FIELDS if field != "bedrooms"},
+            {"bedrooms": (query.get("min_bedrooms"), query.get("max_bedrooms"))}
+        )
+        return BudgetSearchEngine._respond(index, query, mask)
+
+    @staticmethod
+    def search_villa(query: dict) -> dict:
+        index = BudgetSearchEngine.villa_index()
+        mask = index.mask({field: query.get(field) for field in VILLA_FIELDS})
+        return BudgetSearchEngine._respond(index, query, mask)
+
+    @staticmethod
+    def _respond(index: BudgetIndex, query: dict, mask: np.ndarray) -> dict:
+        positions = index.search(query["budget"], query["top_k"], query["mode"], mask)
+        return {
+            "budget": query["budget"],
+            "mode": query["mode"],
+            "candidates": int(mask.sum()),
+            "matches": index.matches(query["budget"], positions)
+        }
@@ -6,10 +6,29 @@ from app.core.constants import (
     ZONE_MULTIPLIER
 )
 from app.engines.breakdown_engine import BreakdownEngine
+from app.core.metrics import ENGINE_SECONDS
 
 class CommercialEngine:
     @staticmethod
+    @ENGINE_SECONDS.time("commercial")
     def estimate_cost(data: dict) -> dict:
+        zoned_cost, zone_multiplier, lift_cost = CommercialEngine.cost_terms(data)
+        cost = zoned_cost * zone_multiplier
+        if lift_cost:
+            cost += lift_cost
+            
+        breakdown = BreakdownEngine.calculate_breakdown(cost)
+        
+        return {
+            "total_cost": cost,
+            "breakdown": breakdown
+        }
+
+    @staticmethod
+    def cost_terms(data: dict) -> tuple:
+        """
+        (cost subject to the zone multiplier, zone multiplier, cost added after it)
+        """
         total_sqft = data['total_sqft']
         floors = data['floors']
         
@@ -23,16 +42,11 @@ class CommercialEngine:
         cost = base_cost + fire_safety + electrical
         
         # Zone adjustment (on base construction ideally, but let's apply to total for simplicity unless specified)
-        cost *= ZONE_MULTIPLIER.get(data['zone'], 1.0)
+        zone_multiplier = ZONE_MULTIPLIER.get(data['zone'], 1.0)
         
         # Lift is mandatory > 2 floors
+        lift_cost = 0
         lift_required = data.get('lift_required') or floors > 2
         if lift_required:
-            cost += COMMERCIAL_LIFT_FIXED
-            
-        breakdown = BreakdownEngine.calculate_breakdown(cost)
-        
-        return {
-            "total_cost": cost,
-            "breakdown": breakdown
-        }
+            lift_cost = COMMERCIAL_LIFT_FIXED
+        return cost, zone_multiplier, lift_cost
@@ -1,8 +1,10 @@
 from app.core.constants import EXTERIOR_BASE_COST
 from app.engines.breakdown_engine import BreakdownEngine
+from app.core.metrics import ENGINE_SECONDS
 
 class ExteriorEngine:
     @staticmethod
+    @ENGINE_SECONDS.time("exterior")
     def estimate_cost(data: dict) -> dict:
         # For simplicity, we use the base cost and adjust slightly if some items are excluded
         cost = EXTERIOR_BASE_COST
@@ -1,8 +1,10 @@
 from app.core.constants import INTERIOR_SQFT_RATES
 from app.engines.breakdown_engine import BreakdownEngine
+from app.core.metrics import ENGINE_SECONDS
 
 class InteriorEngine:
     @staticmethod
+    @ENGINE_SECONDS.time("interior")
     def estimate_cost(data: dict) -> dict:
         total_sqft = data['total_sqft']
         style = data['style']
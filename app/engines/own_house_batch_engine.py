@@ -0,0 +1,234 @@
+from typing import Any, Dict, List
+import numpy as np
+from app.core.constants import (
+    EXTRA_BEDROOM_INCREASE,
+    FLOOR_INCREASE_MULTIPLIER,
+    INFLATION_FACTOR,
+    CORE_BREAKDOWN_COMPONENTS,
+    OWN_HOUSE_ADDONS,
+    OWN_HOUSE_PLAN_MULTIPLIERS,
+    OWN_HOUSE_PLOT_RULES,
+    OWN_HOUSE_INTERIOR_COSTS,
+    TERRACE_GUEST_BEDROOM_COST
+)
+from app.engines.breakdown_engine import BreakdownEngine
+
+# Column layout of the N x components amount matrix: the 18 core components in
+# CORE_BREAKDOWN_COMPONENTS order, then the optional lines in the order
+# calculate_smart_breakdown appends them. Keeping the scalar order matters because
+# totals are accumulated column by column to reproduce its float summation exactly.
+CORE_COLUMNS = list(CORE_BREAKDOWN_COMPONENTS.keys())
+OPTIONAL_COLUMNS = [
+    ("Compound Wall", "EXTERIOR"),
+    ("Rainwater Harvesting", "EXTERIOR"),
+    ("Car Parking Covering", "EXTERIOR"),
+    ("Interior Package", "OPTIONAL"),
+    ("Terrace Guest Bedroom", "OPTIONAL")
+]
+BATCH_COLUMNS = CORE_COLUMNS + [name for name, _ in OPTIONAL_COLUMNS]
+BATCH_CATEGORIES = [
+    CORE_BREAKDOWN_COMPONENTS[name].get("category", "STRUCTURE") for name in CORE_COLUMNS
+] + [category for _, category in OPTIONAL_COLUMNS]
+INTERIOR_COLUMN = BATCH_COLUMNS.index("Interior Package")
+
+FLOOR_FACTORS = {
+    "G+2": FLOOR_INCREASE_MULTIPLIER,
+    "G+3": FLOOR_INCREASE_MULTIPLIER ** 2
+}
+
+
+def round2(values: np.ndarray) -> np.ndarray:
+    """
+    Element-wise equivalent of Python's round(x, 2).
+
+    np.round scales by 100 and rounds the already-rounded product, which disagrees with
+    round() when x * 100 sits within float noise of a .5 boundary (common here: a
+    2-decimal amount times 1.30 lands on x.xx5). Those elements are re-decided from the
+    exact product, recovered with Dekker's TwoProduct, with half-even on exact ties.
+    """
+    rounded = np.round(values, 2)
+    scaled = values * 100.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-4
+    if near_tie.any():
+        x = values[near_tie]
+        product = scaled[near_tie]
+        split = x * 134217729.0
+        hi = split - (split - x)
+        error = (hi * 100.0 - product) + (x - hi) * 100.0
+        floor = np.floor(product)
+        above = (product - floor - 0.5) + error
+        k = floor + (above > 0) + ((above == 0) & (np.fmod(floor, 2) == 1))
+        rounded[near_tie] = k / 100.0
+    return rounded
+
+
+class OwnHouseBatchEngine:
+    @staticmethod
+    def encode_inputs(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Turns engine-compatible input dicts (see OwnHouseEngine.map_inputs) into
+        per-field arrays for price().
+        """
+        n = len(rows)
+        base_budget = np.empty(n)
+        base_beds = np.empty(n)
+        bedrooms = np.empty(n)
+        floor_factor = np.ones(n)
+        plan_multiplier = np.ones(n)
+        optional = np.zeros((n, len(OPTIONAL_COLUMNS)))
+
+        plot_sizes, current_beds, floors, plan_types, interior_pkgs = [], [], [], [], []
+        plot_cache = {}
+        for i, inputs in enumerate(rows):
+            plot_size = inputs.get("dimensions", "30x40")
+            if plot_size not in plot_cache:
+                base_type, budget = BreakdownEngine.resolve_plot(plot_size)
+                plot_cache[plot_size] = (budget, OWN_HOUSE_PLOT_RULES[base_type].get("min_bedrooms", 3))
+            budget, min_beds = plot_cache[plot_size]
+            beds = int(inputs.get("bedrooms", min_beds))
+            floor = inputs.get("floor", "G+1")
+            plan_type = inputs.get("structural_style", "Base")
+
+            base_budget[i] = budget
+            base_beds[i] = min_beds
+            bedrooms[i] = beds
+            floor_factor[i] = FLOOR_FACTORS.get(floor, 1.0)
+            plan_multiplier[i] = OWN_HOUSE_PLAN_MULTIPLIERS.get(plan_type, 1.0)
+
+            if inputs.get("include_compound"):
+                optional[i, 0] = OWN_HOUSE_ADDONS["compound_wall"]
+            if inputs.get("include_rainwater"):
+                optional[i, 1] = OWN_HOUSE_ADDONS["rainwater_harvesting"]
+            if inputs.get("include_parking"):
+                optional[i, 2] = OWN_HOUSE_ADDONS["car_parking"]
+            interior_pkg = inputs.get("interior_package", "none")
+            if interior_pkg and interior_pkg != "none":
+                optional[i, 3] = OWN_HOUSE_INTERIOR_COSTS.get(floor, {}).get(interior_pkg, {}).get(beds, 0)
+            if inputs.get("terrace_guest_bedroom"):
+                optional[i, 4] = TERRACE_GUEST_BEDROOM_COST
+
+            plot_sizes.append(plot_size)
+            current_beds.append(beds)
+            floors.append(floor)
+            plan_types.append(plan_type)
+            interior_pkgs.append(interior_pkg)
+
+        return {
+            "base_budget": base_budget,
+            "base_beds": base_beds,
+            "bedrooms": bedrooms,
+            "floor_factor": floor_factor,
+            "plan_multiplier": plan_multiplier,
+            "optional": optional,
+            "plot_sizes": plot_sizes,
+            "current_beds": current_beds,
+            "floors": floors,
+            "plan_types": plan_types,
+            "interior_pkgs": interior_pkgs
+        }
+
+    @staticmethod
+    def price(encoded: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """
+        Runs steps 1-8 of calculate_smart_breakdown on whole columns at once.
+        Returns the N x len(BATCH_COLUMNS) amount and percentage matrices, the
+        presence mask and the per-row totals.
+        """
+        n = len(encoded["base_budget"])
+
+        # 1-3. Base budget, bedroom adjustment, floor multiplier
+        extra_beds = np.maximum(0, encoded["bedrooms"] - encoded["base_beds"])
+        running_total = (encoded["base_budget"] + extra_beds * EXTRA_BEDROOM_INCREASE) * encoded["floor_factor"]
+
+        # 4. Base 18-component breakdown (PRE-INFLATION)
+        septic_cost = CORE_BREAKDOWN_COMPONENTS["Septic Tank"].get("amount", 50000)
+        variable_total = running_total - septic_cost
+        total_ratio = sum(c.get("ratio", 0) for c in CORE_BREAKDOWN_COMPONENTS.values() if "ratio" in c)
+
+        pre_multiplier = np.zeros((n, len(BATCH_COLUMNS)))
+        for col, name in enumerate(CORE_COLUMNS):
+            data = CORE_BREAKDOWN_COMPONENTS[name]
+            if "amount" in data:
+                pre_multiplier[:, col] = data["amount"]
+            elif total_ratio > 0:
+                pre_multiplier[:, col] = round2(variable_total * (data.get("ratio", 0) / total_ratio))
+
+        # 5. Optional features (only where selected)
+        pre_multiplier[:, len(CORE_COLUMNS):] = encoded["optional"]
+        present = np.ones((n, len(BATCH_COLUMNS)), dtype=bool)
+        present[:, len(CORE_COLUMNS):] = encoded["optional"] > 0
+
+        # 6. Plan multiplier, then accumulate the total column by column (scalar summation order)
+        amounts = round2(pre_multiplier * encoded["plan_multiplier"][:, None])
+        total_pre_inflation = np.zeros(n)
+        for col in range(len(BATCH_COLUMNS)):
+            total_pre_inflation += amounts[:, col]
+
+        # 7. Inflation
+        inflation_amount = total_pre_inflation * (INFLATION_FACTOR - 1)
+        final_total = total_pre_inflation + inflation_amount
+
+        # 8. Percentages relative to total_pre_inflation
+        has_total = total_pre_inflation > 0
+        safe_total = np.where(has_total, total_pre_inflation, 1.0)
+        percentages = round2((amounts / safe_total[:, None]) * 100)
+
+        return {
+            "amounts": amounts,
+            "percentages": percentages,
+            "present": present,
+            "has_total": has_total,
+            "total_cost": round2(final_total),
+            "total_before_inflation": round2(total_pre_inflation),
+            "inflation_amount": round2(inflation_amount)
+        }
+
+    @staticmethod
+    def calculate_smart_breakdown_batch(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Batched calculate_smart_breakdown: same output, row for row.
+        """
+        encoded = OwnHouseBatchEngine.encode_inputs(rows)
+        priced = OwnHouseBatchEngine.price(encoded)
+
+        # Descending by amount; stable so ties keep scalar insertion order, absent lines last.
+        order = np.argsort(np.where(priced["present"], -priced["amounts"], np.inf), axis=1, kind="stable")
+        counts = priced["present"].sum(axis=1)
+
+        amounts = priced["amounts"].tolist()
+        percentages = priced["percentages"].tolist()
+        order = order.tolist()
+        counts = counts.tolist()
+        has_total = priced["has_total"].tolist()
+        total_cost = priced["total_cost"].tolist()
+        total_before_inflation = priced["total_before_inflation"].tolist()
+        inflation_amount = priced["inflation_amount"].tolist()
+
+        results = []
+        for i, inputs in enumerate(rows):
+            interior_pkg = encoded["interior_pkgs"][i]
+            breakdown = []
+            for col in order[i][:counts[i]]:
+                name = BATCH_COLUMNS[col]
+                if col == INTERIOR_COLUMN:
+                    name = f"Interior Package - {interior_pkg.replace('_', ' ').title()}"
+                item = {"component": name, "category": BATCH_CATEGORIES[col], "amount": amounts[i][col]}
+                if has_total[i]:
+                    item["percentage"] = percentages[i][col]
+                breakdown.append(item)
+
+            summary = BreakdownEngine.build_project_summary(
+                inputs,
+                encoded["plot_sizes"][i],
+                encoded["current_beds"][i],
+                encoded["floors"][i],
+                encoded["plan_types"][i]
+            )
+            results.append({
+                "project_summary": summary,
+                "total_cost": total_cost[i],
+                "total_before_inflation": total_before_inflation[i],
+                "inflation_amount": inflation_amount[i],
+                "breakdown": breakdown
+            })
+        return results
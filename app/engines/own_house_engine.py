@@ -1,16 +1,143 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set, Tuple
 from fastapi import HTTPException
+from app.core.constants import OWN_HOUSE_PLAN_MULTIPLIERS, OWN_HOUSE_INTERIOR_COSTS
 from app.engines.breakdown_engine import BreakdownEngine
+from app.engines.own_house_batch_engine import OwnHouseBatchEngine
+from app.engines.own_house_pricing_table import OwnHousePricingTable
+from app.core.metrics import ENGINE_SECONDS
+
+# Schema fields read by each stage of calculate_smart_breakdown (via map_inputs);
+# anything else (zone, lift_required) doesn't change the price
+BASE_STAGE_FIELDS = frozenset({"dimensions", "bedrooms", "floor"})
+OPTIONAL_STAGE_FIELDS = frozenset({
+    "include_compound_wall", "include_rainwater_harvesting", "include_car_parking", "interior_package", "terrace_guest_bedroom"
+})
 
 class OwnHouseEngine:
     @staticmethod
+    @ENGINE_SECONDS.time("own_house")
     def estimate_cost(data: dict) -> dict:
         """
         Wraps the 2026 Smart Breakdown Engine for the Own House flow.
         """
+        OwnHouseEngine.map_inputs(data)
+
+        try:
+            # O(1) row lookup when the configuration is in the precomputed table
+            result = OwnHousePricingTable.lookup(data)
+            if result is None:
+                result = BreakdownEngine.calculate_smart_breakdown(data)
+            return OwnHouseEngine.to_response(result)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    def estimate_batch(rows: List[dict]) -> List[dict]:
+        """
+        Batched equivalent of estimate_cost: prices all rows in one NumPy pass.
+        """
+        for data in rows:
+            OwnHouseEngine.map_inputs(data)
+
+        try:
+            results = OwnHouseBatchEngine.calculate_smart_breakdown_batch(rows)
+            return [OwnHouseEngine.to_response(result) for result in results]
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    @ENGINE_SECONDS.time("own_house_incremental")
+    def estimate_incremental(data: dict, stages: Optional[Dict[str, Any]], changed: Set[str]) -> Tuple[dict, Dict[str, Any]]:
+        """
+        estimate_cost for a configuration that differs from the previous call only
+        in the changed fields. Returns (response, stages). Outside the pricing
+        table, stages 1-4 and stage 5 are reused from the previous call's stages
+        unless a field they read changed.
+        """
+        inputs = OwnHouseEngine.map_inputs(dict(data))
+        stages = dict(stages or {})
+        result = OwnHousePricingTable.lookup(inputs)
+        if result is not None:
+            # Every stage is precomputed in the table; the kept stages are now stale for these fields
+            stages["stale"] = stages.get("stale", frozenset()) | changed
+            return OwnHouseEngine.to_response(result), stages
+        changed = changed | stages.pop("stale", frozenset())
+
+        if "core" not in stages or changed & BASE_STAGE_FIELDS:
+            adjusted = BreakdownEngine.adjusted_base(inputs)
+            stages["adjusted"] = adjusted
+            stages["core"] = BreakdownEngine.core_breakdown(adjusted["running_total"])
+            stages.pop("optional", None)
+        if "optional" not in stages or changed & OPTIONAL_STAGE_FIELDS:
+            adjusted = stages["adjusted"]
+            stages["optional"] = BreakdownEngine.optional_breakdown(inputs, adjusted["floors"], adjusted["current_beds"])
+
+        # Stages 6-8 total every item, so they always run, on copies of the kept stages
+        items = [dict(item) for item in stages["core"]] + [dict(item) for item in stages["optional"]]
+        priced = BreakdownEngine.apply_plan_and_inflation(items, inputs.get("structural_style", "Base"))
+        return OwnHouseEngine.to_response(priced), stages
+
+    @staticmethod
+    def what_if(data: dict) -> dict:
+        """
+        Prices every single-option change from a base configuration in one call.
+        Stages 1-4 (bedroom/floor-adjusted component vector) run once; each variant
+        only re-runs the add-on stage and the plan multiplier / inflation stages.
+        """
+        base_inputs = OwnHouseEngine.map_inputs(dict(data))
+        adjusted = BreakdownEngine.adjusted_base(base_inputs)
+        core = BreakdownEngine.core_breakdown(adjusted["running_total"])
+
+        def price(inputs: dict) -> dict:
+            items = [dict(item) for item in core]
+            items += BreakdownEngine.optional_breakdown(inputs, adjusted["floors"], adjusted["current_beds"])
+            return BreakdownEngine.apply_plan_and_inflation(items, inputs.get("structural_style", "Base"))
+
+        base = price(base_inputs)
+        base_amounts = {item["component"]: item["amount"] for item in base["breakdown"]}
+
+        options = []
+        for field, value in OwnHouseEngine.what_if_options(data):
+            priced = price(OwnHouseEngine.map_inputs({**data, field: value}))
+            amounts = {item["component"]: item["amount"] for item in priced["breakdown"]}
+            component_deltas = []
+            for name in list(amounts) + [name for name in base_amounts if name not in amounts]:
+                delta = round(amounts.get(name, 0) - base_amounts.get(name, 0), 2)
+                if delta:
+                    component_deltas.append({"component": name, "delta": delta})
+            options.append({
+                "option": field,
+                "value": value,
+                "total_cost": priced["total_cost"],
+                "total_delta": round(priced["total_cost"] - base["total_cost"], 2),
+                "component_deltas": component_deltas
+            })
+
+        return {"base_total_cost": base["total_cost"], "options": options}
+
+    @staticmethod
+    def what_if_options(data: dict) -> List[tuple]:
+        """
+        (field, value) pairs for every alternative plan style, interior package and add-on toggle.
+        """
+        options = [
+            ("structural_style", style) for style in OWN_HOUSE_PLAN_MULTIPLIERS
+            if style != data.get("structural_style", "Base")
+        ]
+        packages = OWN_HOUSE_INTERIOR_COSTS.get(data.get("floor", "G+1"), {})
+        options += [
+            ("interior_package", pkg) for pkg in packages
+            if pkg != data.get("interior_package", "none")
+        ]
+        for flag in ["include_compound_wall", "include_rainwater_harvesting", "include_car_parking"]:
+            options.append((flag, not data.get(flag, False)))
+        return options
+
+    @staticmethod
+    def map_inputs(data: dict) -> dict:
         # Mapping frontend boolean flags to engine-compatible flags if necessary
         # The frontend uses 'dimensions', 'bedrooms', 'floor', 'structural_style', 'include_lift', 'include_compound', etc.
-        
+
         # Ensure 'include_compound', 'include_rainwater', 'include_parking', 'include_interior' are set correctly
         # Mapping frontend keys to engine-compatible flags
         data['include_compound'] = data.get('include_compound_wall', False)
@@ -19,13 +146,12 @@ class OwnHouseEngine:
         data['include_lift'] = data.get('lift_required', False)
         data['include_interior'] = data.get('interior_package', 'none') != 'none'
         data['terrace_guest_bedroom'] = data.get('terrace_guest_bedroom', False)
-        
-        try:
-            result = BreakdownEngine.calculate_smart_breakdown(data)
-            return {
-                'project_summary': result.get('summary', {}),
-                'total_cost': result.get('total_cost', 0),
-                'breakdown': result.get('breakdown', [])
-            }
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+        return data
+
+    @staticmethod
+    def to_response(result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'project_summary': result.get('summary', {}),
+            'total_cost': result.get('total_cost', 0),
+            'breakdown': result.get('breakdown', [])
+        }
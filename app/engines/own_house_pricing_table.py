@@ -0,0 +1,195 @@
+import hashlib
+import itertools
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+import numpy as np
+from app.core.config import settings
+from app.core.constants import (
+    OWN_HOUSE_PLOT_RULES,
+    OWN_HOUSE_PLAN_MULTIPLIERS,
+    OWN_HOUSE_INTERIOR_COSTS
+)
+from app.core.rate_card import rate_card_version
+from app.engines.breakdown_engine import BreakdownEngine
+from app.engines.own_house_batch_engine import OwnHouseBatchEngine, BATCH_COLUMNS, BATCH_CATEGORIES, INTERIOR_COLUMN
+
+# Every input the Own House schema exposes that changes the price, one axis each.
+# The table is dense over the product of the axes, so a configuration's row is a
+# mixed-radix number and lookup is pure arithmetic. Zone and lift only feed the
+# summary, and terrace_guest_bedroom is not reachable from OwnHouseCreate; inputs
+# outside the axes fall back to the live engine.
+PLOT_AXIS = [size for rules in OWN_HOUSE_PLOT_RULES.values() for size in rules if not size.endswith("_bedrooms")]
+BEDROOM_AXIS = list(range(1, max(rules["max_bedrooms"] for rules in OWN_HOUSE_PLOT_RULES.values()) + 1))
+FLOOR_AXIS = ["G+1", "G+2", "G+3"]
+STYLE_AXIS = list(OWN_HOUSE_PLAN_MULTIPLIERS.keys())
+INTERIOR_AXIS = ["none"] + [pkg for pkg in OWN_HOUSE_INTERIOR_COSTS["G+1"] if pkg != "none"]
+FLAG_AXES = ["include_compound", "include_rainwater", "include_parking"]
+
+AXES = [PLOT_AXIS, BEDROOM_AXIS, FLOOR_AXIS, STYLE_AXIS, INTERIOR_AXIS] + [[False, True]] * len(FLAG_AXES)
+AXIS_INDEX = [{value: i for i, value in enumerate(axis)} for axis in AXES]
+
+TABLE_FORMAT = "1"
+FINGERPRINT_SOURCES = [
+    Path(__file__),
+    Path(__file__).with_name("breakdown_engine.py"),
+    Path(__file__).with_name("own_house_batch_engine.py")
+]
+
+
+def table_fingerprint() -> str:
+    """
+    Identifies the rate card and pricing code a table was built from.
+    """
+    digest = hashlib.sha256(f"{TABLE_FORMAT}:{rate_card_version()}".encode())
+    for path in FINGERPRINT_SOURCES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class OwnHousePricingTable:
+    """
+    Precomputed Own House price for every combination of the axes above.
+
+    Modes (settings.OWN_HOUSE_PRICING_TABLE):
+      "off"     - always compute live
+      "startup" - enumerate in memory on first use (warmed in the app lifespan)
+      "file"    - load the compressed .npz at OWN_HOUSE_PRICING_TABLE_PATH, rebuilding
+                  and rewriting it if its fingerprint no longer matches
+    """
+    _table: Optional[Dict[str, np.ndarray]] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def build() -> Dict[str, np.ndarray]:
+        rows = []
+        for combo in itertools.product(*AXES):
+            plot, beds, floor, style, interior = combo[:5]
+            row = {
+                "dimensions": plot,
+                "bedrooms": beds,
+                "floor": floor,
+                "structural_style": style,
+                "interior_package": interior
+            }
+            row.update(zip(FLAG_AXES, combo[5:]))
+            rows.append(row)
+
+        priced = OwnHouseBatchEngine.price(OwnHouseBatchEngine.encode_inputs(rows))
+        order = np.argsort(np.where(priced["present"], -priced["amounts"], np.inf), axis=1, kind="stable")
+        return {
+            "fingerprint": np.array(table_fingerprint()),
+            "amounts": priced["amounts"],
+            "percentages": priced["percentages"],
+            "order": order.astype(np.int8),
+            "counts": priced["present"].sum(axis=1).astype(np.int8),
+            "has_total": priced["has_total"],
+            "total_cost": priced["total_cost"],
+            "total_before_inflation": priced["total_before_inflation"],
+            "inflation_amount": priced["inflation_amount"]
+        }
+
+    @staticmethod
+    def save(table: Dict[str, np.ndarray], path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, **table)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load_file(path: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Returns the stored table, or None if it is missing or was built from a
+        different rate card / pricing code.
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as stored:
+            if str(stored["fingerprint"]) != table_fingerprint():
+                return None
+            return {key: stored[key] for key in stored.files}
+
+    @staticmethod
+    def get() -> Optional[Dict[str, np.ndarray]]:
+        mode = settings.OWN_HOUSE_PRICING_TABLE
+        if mode == "off":
+            return None
+        if OwnHousePricingTable._table is None:
+            with OwnHousePricingTable._lock:
+                if OwnHousePricingTable._table is None:
+                    table = None
+                    if mode == "file":
+                        table = OwnHousePricingTable.load_file(settings.OWN_HOUSE_PRICING_TABLE_PATH)
+                    if table is None:
+                        table = OwnHousePricingTable.build()
+                        if mode == "file":
+                            OwnHousePricingTable.save(table, settings.OWN_HOUSE_PRICING_TABLE_PATH)
+                    OwnHousePricingTable._table = table
+        return OwnHousePricingTable._table
+
+    @staticmethod
+    def row_index(inputs: Dict[str, Any]) -> Optional[int]:
+        """
+        Mixed-radix row number of an engine-compatible input dict, or None if the
+        configuration lies outside the table.
+        """
+        if inputs.get("terrace_guest_bedroom"):
+            return None
+        try:
+            values = [
+                inputs.get("dimensions", "30x40"),
+                int(inputs.get("bedrooms")),
+                inputs.get("floor", "G+1"),
+                inputs.get("structural_style", "Base"),
+                inputs.get("interior_package", "none") or "none"
+            ] + [bool(inputs.get(flag)) for flag in FLAG_AXES]
+            index = 0
+            for value, axis, positions in zip(values, AXES, AXIS_INDEX):
+                index = index * len(axis) + positions[value]
+            return index
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def lookup(inputs: Dict[str, Any], table: Optional[Dict[str, np.ndarray]] = None) -> Optional[Dict[str, Any]]:
+        """
+        calculate_smart_breakdown(inputs) served from the table, or None on a miss.
+        """
+        if table is None:
+            table = OwnHousePricingTable.get()
+        if table is None:
+            return None
+        index = OwnHousePricingTable.row_index(inputs)
+        if index is None:
+            return None
+
+        amounts = table["amounts"][index].tolist()
+        percentages = table["percentages"][index].tolist()
+        has_total = bool(table["has_total"][index])
+        interior_pkg = inputs.get("interior_package", "none")
+        breakdown = []
+        for col in table["order"][index][:table["counts"][index]].tolist():
+            name = BATCH_COLUMNS[col]
+            if col == INTERIOR_COLUMN:
+                name = f"Interior Package - {interior_pkg.replace('_', ' ').title()}"
+            item = {"component": name, "category": BATCH_CATEGORIES[col], "amount": amounts[col]}
+            if has_total:
+                item["percentage"] = percentages[col]
+            breakdown.append(item)
+
+        plot_size = inputs.get("dimensions", "30x40")
+        summary = BreakdownEngine.build_project_summary(
+            inputs, plot_size, int(inputs.get("bedrooms")), inputs.get("floor", "G+1"), inputs.get("structural_style", "Base")
+        )
+        return {
+            "project_summary": summary,
+            "total_cost": float(table["total_cost"][index]),
+            "total_before_inflation": float(table["total_before_inflation"][index]),
+            "inflation_amount": float(table["inflation_amount"][index]),
+            "breakdown": breakdown
+        }
+
+    @staticmethod
+    def nbytes(table: Dict[str, np.ndarray]) -> int:
+        return sum(array.nbytes for array in table.values())
@@ -0,0 +1,22 @@
+from app.schemas.own_house_schema import OwnHouseCreate
+from app.schemas.rental_schema import RentalCreate
+from app.schemas.villa_schema import VillaCreate
+from app.schemas.commercial_schema import CommercialCreate
+from app.schemas.interior_schema import InteriorCreate
+from app.schemas.exterior_schema import ExteriorCreate
+from app.engines.own_house_engine import OwnHouseEngine
+from app.engines.rental_engine import RentalEngine
+from app.engines.villa_engine import VillaEngine
+from app.engines.commercial_engine import CommercialEngine
+from app.engines.interior_engine import InteriorEngine
+from app.engines.exterior_engine import ExteriorEngine
+
+# project_type -> (input schema, engine); project_type matches SavedProject.project_type
+PROJECT_ENGINES = {
+    "own_house": (OwnHouseCreate, OwnHouseEngine),
+    "rental": (RentalCreate, RentalEngine),
+    "villa": (VillaCreate, VillaEngine),
+    "commercial": (CommercialCreate, CommercialEngine),
+    "interior": (InteriorCreate, InteriorEngine),
+    "exterior": (ExteriorCreate, ExteriorEngine)
+}
@@ -6,24 +6,37 @@ from app.core.constants import (
     RENTAL_INTERIOR_BASE
 )
 from app.engines.breakdown_engine import BreakdownEngine
+from app.core.metrics import ENGINE_SECONDS
 
 class RentalEngine:
     @staticmethod
+    @ENGINE_SECONDS.time("rental")
     def estimate_cost(data: dict) -> dict:
+        zoned_cost, zone_multiplier, unzoned_cost = RentalEngine.cost_terms(data)
+        cost = zoned_cost * zone_multiplier
+        if unzoned_cost:
+            cost += unzoned_cost
+            
+        breakdown = BreakdownEngine.calculate_breakdown(cost)
+        
+        return {
+            "total_cost": cost,
+            "breakdown": breakdown
+        }
+
+    @staticmethod
+    def cost_terms(data: dict) -> tuple:
+        """
+        (cost subject to the zone multiplier, zone multiplier, cost added after it)
+        """
         cost = RENTAL_BASE_COST
         
         floor_multiplier = RENTAL_FLOOR_MULTIPLIER.get(data['floor'], 1.0)
         cost *= floor_multiplier
         cost *= RENTAL_UPGRADE_MULTIPLIER.get(data['upgrade_level'], 1.0)
-        cost *= ZONE_MULTIPLIER.get(data['zone'], 1.0)
         
+        interior_cost = 0
         if data.get('include_interior'):
             # Scaled using floor multiplier as per prompt
-            cost += RENTAL_INTERIOR_BASE * floor_multiplier
-            
-        breakdown = BreakdownEngine.calculate_breakdown(cost)
-        
-        return {
-            "total_cost": cost,
-            "breakdown": breakdown
-        }
+            interior_cost = RENTAL_INTERIOR_BASE * floor_multiplier
+        return cost, ZONE_MULTIPLIER.get(data['zone'], 1.0), interior_cost
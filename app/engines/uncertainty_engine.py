@@ -0,0 +1,151 @@
+from typing import Any, Dict, List, Optional
+import numpy as np
+from app.core.constants import (
+    BREAKDOWN_PERCENTAGES,
+    CORE_BREAKDOWN_COMPONENTS,
+    OWN_HOUSE_PLAN_MULTIPLIERS,
+    UNCERTAINTY_INFLATION,
+    UNCERTAINTY_RATIO_SPREAD,
+    UNCERTAINTY_ZONE_SPREAD
+)
+from app.engines.breakdown_engine import BreakdownEngine
+from app.engines.own_house_engine import OwnHouseEngine
+from app.engines.rental_engine import RentalEngine
+from app.engines.villa_engine import VillaEngine
+from app.engines.commercial_engine import CommercialEngine
+from app.engines.interior_engine import InteriorEngine
+from app.engines.exterior_engine import ExteriorEngine
+
+# Generic engines; those with cost_terms() get a sampled zone multiplier.
+GENERIC_ENGINES = {
+    "rental": RentalEngine,
+    "villa": VillaEngine,
+    "commercial": CommercialEngine,
+    "interior": InteriorEngine,
+    "exterior": ExteriorEngine
+}
+
+
+# Per-component bands are read from the first BAND_SAMPLES draws; P10/P50/P90 of a
+# single component settle well before that, and partitioning every column of a
+# 100k-sample matrix would cost more than the sampling itself. Totals use all draws.
+BAND_SAMPLES = 20000
+
+
+def triangular(rng: np.random.Generator, low: float, mode: float, high: float, size: int) -> np.ndarray:
+    if high <= low:
+        return np.full(size, mode)
+    return rng.triangular(low, min(max(mode, low), high), high, size)
+
+
+def ratio_factors(rng: np.random.Generator, spread: float, components: int, samples: int) -> np.ndarray:
+    """
+    components x samples matrix of Normal(1, spread) multipliers clipped at 0 (float32,
+    component-major so each component's draws are contiguous).
+    """
+    factors = rng.standard_normal((components, samples), dtype=np.float32)
+    factors *= spread
+    factors += 1
+    np.maximum(factors, 0, out=factors)
+    return factors
+
+
+class UncertaintyEngine:
+    @staticmethod
+    def simulate(
+        project_type: str,
+        data: dict,
+        samples: int,
+        seed: Optional[int] = None,
+        ratio_spread: float = UNCERTAINTY_RATIO_SPREAD,
+        zone_spread: float = UNCERTAINTY_ZONE_SPREAD,
+        inflation_low: float = UNCERTAINTY_INFLATION["low"],
+        inflation_high: float = UNCERTAINTY_INFLATION["high"]
+    ) -> Dict[str, Any]:
+        """
+        Monte Carlo cost range: components x samples matrix of amounts drawn around
+        the point estimate, summarised as P10/P50/P90 bands. Only the inputs an engine
+        actually applies are sampled (inflation for Own House, zone multiplier for
+        Rental / Villa / Commercial, breakdown ratios everywhere).
+        """
+        rng = np.random.default_rng(seed)
+        if project_type == "own_house":
+            simulated = UncertaintyEngine._own_house(rng, data, samples, ratio_spread, inflation_low, inflation_high)
+        elif project_type in GENERIC_ENGINES:
+            simulated = UncertaintyEngine._generic(rng, GENERIC_ENGINES[project_type], data, samples, ratio_spread, zone_spread)
+        else:
+            raise ValueError(f"Unknown project type: {project_type}")
+
+        point_estimate, point_items, band_amounts, totals = simulated
+        component_bands = np.percentile(band_amounts, [10, 50, 90], axis=1)
+        total_band = np.percentile(totals, [10, 50, 90])
+
+        components = []
+        for row, item in enumerate(point_items):
+            p10, p50, p90 = component_bands[:, row].tolist()
+            components.append({
+                "component": item["component"],
+                "category": item["category"],
+                "point": item["amount"],
+                "p10": round(p10, 2),
+                "p50": round(p50, 2),
+                "p90": round(p90, 2)
+            })
+        components.sort(key=lambda x: x["point"], reverse=True)
+
+        return {
+            "samples": samples,
+            "seed": seed,
+            "point_estimate": point_estimate,
+            "total": {
+                "p10": round(float(total_band[0]), 2),
+                "p50": round(float(total_band[1]), 2),
+                "p90": round(float(total_band[2]), 2),
+                "mean": round(float(totals.mean()), 2)
+            },
+            "components": components
+        }
+
+    @staticmethod
+    def _own_house(rng, data, samples, ratio_spread, inflation_low, inflation_high) -> tuple:
+        inputs = OwnHouseEngine.map_inputs(dict(data))
+        adjusted = BreakdownEngine.adjusted_base(inputs)
+        items = BreakdownEngine.core_breakdown(adjusted["running_total"])
+        items += BreakdownEngine.optional_breakdown(inputs, adjusted["floors"], adjusted["current_beds"])
+        plan_type = inputs.get("structural_style", "Base")
+
+        # Point estimate from the deterministic stages 6-8 (items kept in pre-sort order)
+        point_items = [dict(item) for item in items]
+        point = BreakdownEngine.apply_plan_and_inflation(point_items, plan_type)
+
+        # Ratio-driven core components vary; fixed-price lines (septic, add-ons, interior) do not
+        multiplier = OWN_HOUSE_PLAN_MULTIPLIERS.get(plan_type, 1.0)
+        nominal = np.array([item["amount"] for item in items], dtype=float) * multiplier
+        ratio_based = np.array(["ratio" in CORE_BREAKDOWN_COMPONENTS.get(item["component"], {}) for item in items])
+        factors = ratio_factors(rng, ratio_spread, int(ratio_based.sum()), samples)
+
+        inflation = triangular(rng, inflation_low, UNCERTAINTY_INFLATION["mode"], inflation_high, samples)
+        totals = (nominal[ratio_based].astype(np.float32) @ factors + nominal[~ratio_based].sum()) * inflation
+
+        band_amounts = np.repeat(nominal[:, None], min(samples, BAND_SAMPLES), axis=1)
+        band_amounts[ratio_based] *= factors[:, :BAND_SAMPLES]
+        return point["total_cost"], point_items, band_amounts, totals
+
+    @staticmethod
+    def _generic(rng, engine, data, samples, ratio_spread, zone_spread) -> tuple:
+        point = engine.estimate_cost(dict(data))
+        if hasattr(engine, "cost_terms"):
+            zoned_cost, zone_multiplier, unzoned_cost = engine.cost_terms(dict(data))
+            zone = triangular(rng, zone_multiplier * (1 - zone_spread), zone_multiplier, zone_multiplier * (1 + zone_spread), samples)
+            cost = zoned_cost * zone + unzoned_cost
+        else:
+            cost = np.full(samples, float(point["total_cost"]))
+
+        ratios = np.array(list(BREAKDOWN_PERCENTAGES.values()))
+        factors = ratio_factors(rng, ratio_spread, len(ratios), samples)
+        totals = (ratios.astype(np.float32) @ factors) * cost
+        band_amounts = (ratios[:, None] * factors[:, :BAND_SAMPLES]) * cost[:BAND_SAMPLES]
+
+        point_by_name = {item["component"]: item for item in point["breakdown"]}
+        point_items: List[dict] = [point_by_name[name] for name in BREAKDOWN_PERCENTAGES]
+        return point["total_cost"], point_items, band_amounts, totals
@@ -5,16 +5,14 @@ from app.core.constants import (
     ZONE_MULTIPLIER
 )
 from app.engines.breakdown_engine import BreakdownEngine
+from app.core.metrics import ENGINE_SECONDS
 
 class VillaEngine:
     @staticmethod
+    @ENGINE_SECONDS.time("villa")
     def estimate_cost(data: dict) -> dict:
-        cost = VILLA_BASE_COST
-        
-        # Floor scaling similar to own house
-        cost *= OWN_HOUSE_FLOOR_MULTIPLIER.get(data['floor'], 1.0)
-        cost *= VILLA_UPGRADE_MULTIPLIER.get(data['upgrade_level'], 1.0)
-        cost *= ZONE_MULTIPLIER.get(data['zone'], 1.0)
+        zoned_cost, zone_multiplier, _ = VillaEngine.cost_terms(data)
+        cost = zoned_cost * zone_multiplier
             
         breakdown = BreakdownEngine.calculate_breakdown(cost)
         
@@ -22,3 +20,15 @@ class VillaEngine:
             "total_cost": cost,
             "breakdown": breakdown
         }
+
+    @staticmethod
+    def cost_terms(data: dict) -> tuple:
+        """
+        (cost subject to the zone multiplier, zone multiplier, cost added after it)
+        """
+        cost = VILLA_BASE_COST
+        
+        # Floor scaling similar to own house
+        cost *= OWN_HOUSE_FLOOR_MULTIPLIER.get(data['floor'], 1.0)
+        cost *= VILLA_UPGRADE_MULTIPLIER.get(data['upgrade_level'], 1.0)
+        return cost, ZONE_MULTIPLIER.get(data['zone'], 1.0), 0
@@ -1,19 +1,34 @@
 from fastapi import FastAPI
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import (
-    own_house, rental, villa, commercial, interior, exterior, projects
+    own_house, rental, villa, commercial, interior, exterior, projects, estimates, admin, analytics
 )
+from app.api.http_cache import ConditionalGetMiddleware
+from app.api.metrics import CONTENT_TYPE, MetricsMiddleware
+from app.api.profiling import ProfilingMiddleware
+from app.core.metrics import registry
 from app.core.config import settings
-from app.database import base
 from app.database.session import engine
+from app.database.migrations import ensure_schema
+from app.database.async_session import async_engine
+from app.engines.own_house_pricing_table import OwnHousePricingTable
+from app.services.report_queue import report_queue
 
 from contextlib import asynccontextmanager
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create database tables on startup
-    base.Base.metadata.create_all(bind=engine)
+    # Schema comes from the Alembic migrations; refuse to serve an outdated one
+    ensure_schema(engine)
+    # Enumerate (or load) the Own House pricing table before the first request
+    OwnHousePricingTable.get()
+    # Resume report renders interrupted by the last shutdown
+    report_queue.requeue_pending()
     yield
+    report_queue.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -22,6 +37,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# 304s for GET responses whose ETag the client already has; added before CORS
+# so the CORS headers still go on the 304
+app.add_middleware(ConditionalGetMiddleware)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +50,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so request latency covers the other middleware too
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Opt-in request profiles (see ProfilingMiddleware); outside the metrics so a
+# profiled request's sampling overhead stays out of the latency histograms
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
 # Include Routers
 app.include_router(own_house.router, prefix=f"{settings.API_V1_STR}/own-house", tags=["Own House"])
 app.include_router(rental.router, prefix=f"{settings.API_V1_STR}/rental", tags=["Rental"])
@@ -39,7 +67,15 @@ app.include_router(commercial.router, prefix=f"{settings.API_V1_STR}/commercial"
 app.include_router(interior.router, prefix=f"{settings.API_V1_STR}/interior", tags=["Interior"])
 app.include_router(exterior.router, prefix=f"{settings.API_V1_STR}/exterior", tags=["Exterior"])
 app.include_router(projects.router, prefix=f"{settings.API_V1_STR}/projects", tags=["Projects"])
+app.include_router(estimates.router, prefix=f"{settings.API_V1_STR}/estimates", tags=["Estimates"])
+app.include_router(analytics.router, prefix=f"{settings.API_V1_STR}/analytics", tags=["Analytics"])
+app.include_router(admin.router, prefix=f"{settings.API_V1_STR}/admin", tags=["Admin"])
 
 @app.get("/")
 def root():
     return {"message": "Construction AI Cost Estimation API is running"}
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+from app.database.base import Base
+
+class BreakdownComponent(Base):
+    """
+    Append-only codebook of breakdown line labels. Compact breakdowns store
+    these ids instead of repeating the strings in every saved project, so a
+    row is never updated or deleted once written.
+    """
+    __tablename__ = "breakdown_components"
+
+    id = Column(Integer, primary_key=True)
+    component = Column(String, nullable=False)
+    category = Column(String, nullable=False) # "" when the item has no category
+
+    __table_args__ = (UniqueConstraint("component", "category", name="uq_breakdown_components_label"),)
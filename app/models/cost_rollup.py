@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float
+from app.database.base import Base
+
+class CostRollup(Base):
+    """
+    Saved-project cost aggregates per (project_type, month, grade) and cost
+    bucket, kept current by ProjectService on every save and delete. Each row is
+    one bucket of a log-scale histogram (see CostRollups) carrying its count,
+    sum and sum of squares, so groups merge by plain addition.
+    """
+    __tablename__ = "cost_rollups"
+
+    project_type = Column(String, primary_key=True) # "" when the project has none
+    month = Column(String(7), primary_key=True) # "YYYY-MM" of created_at (UTC)
+    grade = Column(String, primary_key=True) # plan style, "" when the inputs have none
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    total = Column(Float, nullable=False, default=0.0)
+    sum_squares = Column(Float, nullable=False, default=0.0)
@@ -1,9 +1,26 @@
-# Marker file for future expansion of granular estimation records
-from sqlalchemy import Column, Integer, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.sql import func
 from app.database.base import Base
 
 class Estimation(Base):
+    """
+    A saved project re-priced on a later rate card. The saved project keeps the
+    estimate it was saved with; each re-pricing adds a row here, so the price
+    history survives rate card changes. Breakdowns use the same storage as
+    saved_projects (see BreakdownStorage).
+    """
     __tablename__ = "estimations"
+    __table_args__ = (
+        # One version per project and rate card; re-runs and resumed runs skip existing ones
+        UniqueConstraint("project_id", "rate_card_version", name="uq_estimations_project_rate_card"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("saved_projects.id"), nullable=False, index=True)
+    run_id = Column(Integer, ForeignKey("repricing_runs.id"), nullable=True, index=True)
+    rate_card_version = Column(String(16), nullable=False)
     total_cost = Column(Float)
+    previous_total_cost = Column(Float) # the saved project's total_cost
+    breakdown_json = Column(JSON) # None when stored compactly in breakdown_blob
+    breakdown_blob = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, String, Float, Text, DateTime
+from sqlalchemy.sql import func
+from app.database.base import Base
+
+class RepricingRun(Base):
+    """
+    One pass of the re-pricing job over saved_projects for a rate card version.
+    last_project_id is the checkpoint: every project up to it has been handled,
+    and it is committed together with their estimations, so an interrupted run
+    resumes after it.
+    """
+    __tablename__ = "repricing_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    rate_card_version = Column(String(16), nullable=False, index=True)
+    project_type = Column(String, nullable=True) # None re-prices every type
+    status = Column(String, default="running") # "running", "completed"
+    last_project_id = Column(Integer, nullable=False, default=0)
+    projects = Column(Integer, nullable=False, default=0)
+    changed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    previous_total = Column(Float, nullable=False, default=0.0) # of the re-priced projects
+    total = Column(Float, nullable=False, default=0.0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
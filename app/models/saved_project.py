@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, JSON, DateTime, ForeignKey, Index, LargeBinary, event, inspect
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.sql import func
 from app.database.base import Base
 
@@ -6,10 +7,52 @@ class SavedProject(Base):
     __tablename__ = "saved_projects"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(String, index=True, nullable=True) # Optional for now
-    project_type = Column(String, index=True)
+    user_id = Column(String, nullable=True) # Optional for now
+    project_type = Column(String)
     input_json = Column(JSON)
     total_cost = Column(Float)
-    breakdown_json = Column(JSON)
+    breakdown_json = Column(JSON) # None when stored compactly in breakdown_blob
+    breakdown_blob = Column(LargeBinary, nullable=True) # see BreakdownStorage
+    rate_card_version = Column(String(16), nullable=True) # rate card the breakdown was priced on
     pdf_path = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Bumped by every ORM update of the row; GET /projects/{id} derives its ETag from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # created_at comes back from the INSERT, so the save can file the project's cost rollup
+    __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
+
+    # Keyset pagination of the archive listing, one per sort (see ProjectListing);
+    # created in migration 0002, which also dropped the project_type/user_id indexes
+    __table_args__ = (
+        Index("ix_saved_projects_created_at_id", "created_at", "id"),
+        Index("ix_saved_projects_total_cost_id", "total_cost", "id"),
+        Index("ix_saved_projects_type_created_at_id", "project_type", "created_at", "id"),
+        Index("ix_saved_projects_type_total_cost_id", "project_type", "total_cost", "id"),
+        Index("ix_saved_projects_user_created_at_id", "user_id", "created_at", "id"),
+    )
+
+
+@event.listens_for(SavedProject, "load")
+def _materialize_breakdown(target, context):
+    _materialize(target, context.session)
+
+
+@event.listens_for(SavedProject, "refresh")
+def _rematerialize_breakdown(target, context, attrs):
+    if attrs is None or {"breakdown_json", "breakdown_blob"} & set(attrs):
+        _materialize(target, context.session)
+
+
+def _materialize(target, session):
+    """
+    Compact rows get their verbose breakdown_json back as soon as they load, so
+    readers of the entity never see the blob.
+    """
+    from app.services.breakdown_storage import BreakdownStorage
+
+    if "breakdown_blob" in inspect(target).unloaded or target.breakdown_blob is None:
+        return
+    if target.__dict__.get("breakdown_json") is None:
+        breakdown = BreakdownStorage.decode(session.get_bind(), target.breakdown_blob, target.__dict__.get("total_cost"))
+        set_committed_value(target, "breakdown_json", breakdown)
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+from datetime import date
+
+class ArchiveQuery(BaseModel):
+    project_type: Optional[str] = None
+    user_id: Optional[str] = None
+    min_cost: Optional[float] = Field(None, ge=0)
+    max_cost: Optional[float] = Field(None, ge=0)
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    sort: Literal["created_at", "total_cost", "project_type"] = "created_at"
+    order: Literal["desc", "asc"] = "desc"
+    limit: int = Field(25, ge=1, le=100)
+    cursor: Optional[str] = None # next_cursor of the previous page
+    fields: Literal["summary", "full"] = "summary" # "full" adds input_json, breakdown_json, pdf_path
+
+class ArchivePage(BaseModel):
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] # None on the last page
@@ -0,0 +1,35 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+class BudgetSearchOptions(BaseModel):
+    budget: float = Field(..., gt=0)
+    top_k: int = Field(10, ge=1, le=100)
+    mode: Literal["under", "closest"] = "under" # "under": best fits at or below budget
+
+class OwnHouseBudgetSearch(BudgetSearchOptions):
+    # Fixed constraints; anything left unset is searched over
+    dimensions: Optional[str] = None # "30x40", "40x60", etc.
+    min_bedrooms: Optional[int] = None
+    max_bedrooms: Optional[int] = None
+    floor: Optional[str] = None # "G+1", "G+2", "G+3"
+    structural_style: Optional[str] = None # "Base", "Classic", "Premium", "Elite"
+    interior_package: Optional[str] = None # "none", "base", "semi", "full_furnished"
+    include_compound_wall: Optional[bool] = None
+    include_rainwater_harvesting: Optional[bool] = None
+    include_car_parking: Optional[bool] = None
+
+class VillaBudgetSearch(BudgetSearchOptions):
+    floor: Optional[str] = None # "G+1", "G+2", "G+3"
+    upgrade_level: Optional[str] = None # "Basic", "Premium", "Luxury"
+    zone: Optional[str] = None # "A", "B", "C"
+
+class BudgetMatch(BaseModel):
+    configuration: Dict[str, Any]
+    total_cost: float
+    delta: float # total_cost - budget
+
+class BudgetSearchResponse(BaseModel):
+    budget: float
+    mode: str
+    candidates: int # configurations satisfying the constraints
+    matches: List[BudgetMatch]
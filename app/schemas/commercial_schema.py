@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Any, Dict, List
 
 class CommercialCreate(BaseModel):
     total_sqft: float
@@ -8,4 +9,4 @@ class CommercialCreate(BaseModel):
 
 class CommercialResponse(BaseModel):
     total_cost: float
-    breakdown: dict
+    breakdown: List[Dict[str, Any]]
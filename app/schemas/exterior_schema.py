@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Any, Dict, List
 
 class ExteriorCreate(BaseModel):
     include_compound_wall: bool = True
@@ -8,4 +9,4 @@ class ExteriorCreate(BaseModel):
 
 class ExteriorResponse(BaseModel):
     total_cost: float
-    breakdown: dict
+    breakdown: List[Dict[str, Any]]
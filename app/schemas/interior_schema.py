@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Any, Dict, List
 
 class InteriorCreate(BaseModel):
     total_sqft: float
@@ -6,4 +7,4 @@ class InteriorCreate(BaseModel):
 
 class InteriorResponse(BaseModel):
     total_cost: float
-    breakdown: dict
+    breakdown: List[Dict[str, Any]]
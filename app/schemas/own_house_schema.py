@@ -19,6 +19,24 @@ class OwnHouseResponse(BaseModel):
     breakdown: List[Dict[str, Any]]
 
 
+class ComponentDelta(BaseModel):
+    component: str
+    delta: float
+
+
+class WhatIfOption(BaseModel):
+    option: str # "structural_style", "interior_package", "include_compound_wall", ...
+    value: Any
+    total_cost: float
+    total_delta: float
+    component_deltas: List[ComponentDelta]
+
+
+class OwnHouseWhatIfResponse(BaseModel):
+    base_total_cost: float
+    options: List[WhatIfOption]
+
+
 class FacilityItem(BaseModel):
     category: str
     specification: str
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+class SavedProjectResponse(BaseModel):
+    # Read from the SavedProject entity; breakdown_blob stays internal
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    user_id: Optional[str] = None
+    project_type: Optional[str] = None
+    input_json: Optional[Dict[str, Any]] = None
+    total_cost: Optional[float] = None
+    breakdown_json: Any = None
+    pdf_path: Optional[str] = None
+    rate_card_version: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class EstimationResponse(BaseModel):
+    # A saved project re-priced on a later rate card (see ProjectRepricer)
+    id: int
+    project_id: int
+    run_id: Optional[int] = None
+    rate_card_version: str
+    total_cost: Optional[float] = None
+    previous_total_cost: Optional[float] = None
+    breakdown_json: Any = None
+    created_at: Optional[datetime] = None
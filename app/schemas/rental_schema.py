@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Any, Dict, List
 
 class RentalCreate(BaseModel):
     floor: str # "G+1", "G+2", "G+3"
@@ -8,4 +9,4 @@ class RentalCreate(BaseModel):
 
 class RentalResponse(BaseModel):
     total_cost: float
-    breakdown: dict
+    breakdown: List[Dict[str, Any]]
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from app.core.constants import (
+    UNCERTAINTY_RATIO_SPREAD,
+    UNCERTAINTY_INFLATION,
+    UNCERTAINTY_ZONE_SPREAD,
+    UNCERTAINTY_DEFAULT_SAMPLES,
+    UNCERTAINTY_MAX_SAMPLES
+)
+
+class UncertaintyOptions(BaseModel):
+    samples: int = Field(UNCERTAINTY_DEFAULT_SAMPLES, ge=100, le=UNCERTAINTY_MAX_SAMPLES)
+    seed: Optional[int] = Field(None, ge=0) # Fix for reproducible reports
+    ratio_spread: float = Field(UNCERTAINTY_RATIO_SPREAD, ge=0, le=1)
+    zone_spread: float = Field(UNCERTAINTY_ZONE_SPREAD, ge=0, le=1)
+    # Asymmetric bounds about the point-estimate factor shift P50 off the point estimate
+    inflation_low: float = Field(UNCERTAINTY_INFLATION["low"], gt=0)
+    inflation_high: float = Field(UNCERTAINTY_INFLATION["high"], gt=0)
+
+class ValueBand(BaseModel):
+    p10: float
+    p50: float
+    p90: float
+    mean: float
+
+class ComponentBand(BaseModel):
+    component: str
+    category: str
+    point: float
+    p10: float
+    p50: float
+    p90: float
+
+class CostRangeResponse(BaseModel):
+    samples: int
+    seed: Optional[int]
+    point_estimate: float
+    total: ValueBand
+    components: List[ComponentBand]
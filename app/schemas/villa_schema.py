@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import Any, Dict, List
 
 class VillaCreate(BaseModel):
     floor: str # "G+1", "G+2"
@@ -7,4 +8,4 @@ class VillaCreate(BaseModel):
 
 class VillaResponse(BaseModel):
     total_cost: float
-    breakdown: dict
+    breakdown: List[Dict[str, Any]]
@@ -0,0 +1,190 @@
+import csv
+import io
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date, datetime, time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.saved_project import SavedProject
+from app.services.report_store import ReportStore
+from app.services.breakdown_storage import BreakdownStorage
+
+PAGE_PATTERN = re.compile(rb"/Type\s*/Page[^s]")
+
+
+def render_report(project_data: Dict[str, Any]) -> str:
+    # Runs in a worker process; ReportStore renders only if no identical report exists
+    return ReportStore.ensure(project_data)
+
+
+def count_pages(pdf: bytes) -> int:
+    return len(PAGE_PATTERN.findall(pdf))
+
+
+class ZipChunks(io.RawIOBase):
+    """
+    Write-only, non-seekable sink for zipfile (and the Parquet writer); the
+    bytes written so far are drained by the streaming generator after each
+    member or row group.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ArchiveExporter:
+    """
+    Streams a ZIP of saved project reports.
+
+    Reports already in the ReportStore are added straight away; missing ones are
+    rendered across a ProcessPoolExecutor, at most EXPORT_IN_FLIGHT_PER_WORKER
+    per worker at a time, and added to the archive in completion order. The
+    archive is written to a non-seekable sink that is drained after every member,
+    so memory is bounded by the in-flight window, not the archive size.
+    """
+
+    def __init__(
+        self,
+        project_type: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        workers: Optional[int] = None
+    ):
+        self.project_type = project_type
+        self.date_from = date_from
+        self.date_to = date_to
+        self.workers = workers or settings.EXPORT_WORKERS or os.cpu_count() or 1
+        self.projects = 0
+        self.rendered = 0
+        self.pages = 0
+        self.bytes = 0
+
+    def project_rows(self, db: Session) -> List[Any]:
+        query = db.query(
+            SavedProject.id, SavedProject.project_type, SavedProject.created_at,
+            SavedProject.total_cost, SavedProject.pdf_path
+        )
+        if self.project_type:
+            query = query.filter(SavedProject.project_type == self.project_type)
+        if self.date_from:
+            query = query.filter(SavedProject.created_at >= datetime.combine(self.date_from, time.min))
+        if self.date_to:
+            query = query.filter(SavedProject.created_at <= datetime.combine(self.date_to, time.max))
+        return query.order_by(SavedProject.id).all()
+
+    def stream(self) -> Iterator[bytes]:
+        sink = ZipChunks()
+        db = SessionLocal()
+        try:
+            with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as archive:
+                manifest = io.StringIO()
+                writer = csv.writer(manifest)
+                writer.writerow(["project_id", "project_type", "created_at", "total_cost", "file", "error"])
+
+                for project, path, error in self._reports(db):
+                    name = ""
+                    if path:
+                        with open(path, "rb") as f:
+                            pdf = f.read()
+                        name = f"{project['project_type']}/project_{project['id']}.pdf"
+                        archive.writestr(name, pdf)
+                        self.projects += 1
+                        self.pages += count_pages(pdf)
+                    writer.writerow([project["id"], project["project_type"], project["created_at"], project["total_cost"], name, error or ""])
+                    chunk = sink.drain()
+                    self.bytes += len(chunk)
+                    yield chunk
+
+                archive.writestr("manifest.csv", manifest.getvalue())
+            chunk = sink.drain()
+            self.bytes += len(chunk)
+            yield chunk
+        finally:
+            db.close()
+
+    def _reports(self, db: Session) -> Iterator[Tuple[Dict[str, Any], Optional[str], Optional[str]]]:
+        """
+        (project metadata, report path, render error) triples, rendering missing
+        reports in the process pool.
+        """
+        missing = []
+        for row in self.project_rows(db):
+            if row.pdf_path and os.path.exists(row.pdf_path):
+                yield self._metadata(row), row.pdf_path, None
+            else:
+                missing.append(row)
+        if not missing:
+            return
+
+        in_flight_limit = self.workers * settings.EXPORT_IN_FLIGHT_PER_WORKER
+        pending = {}
+        queue = iter(missing)
+        context = multiprocessing.get_context(settings.EXPORT_START_METHOD)
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            while True:
+                while len(pending) < in_flight_limit:
+                    row = next(queue, None)
+                    if row is None:
+                        break
+                    content = (
+                        db.query(SavedProject.input_json, SavedProject.breakdown_json, SavedProject.breakdown_blob)
+                        .filter(SavedProject.id == row.id).first()
+                    )
+                    if content is None:
+                        # Deleted since the export started
+                        continue
+                    project_data = {
+                        "project_type": row.project_type,
+                        "input_json": content.input_json,
+                        "total_cost": row.total_cost,
+                        "breakdown_json": BreakdownStorage.materialize(
+                            db, content.breakdown_json, content.breakdown_blob, row.total_cost
+                        )
+                    }
+                    pending[pool.submit(render_report, project_data)] = self._metadata(row)
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    project = pending.pop(future)
+                    try:
+                        path = future.result()
+                    except Exception as e:
+                        yield project, None, str(e)
+                        continue
+                    # Record the path so the next download or export reuses the report
+                    ReportStore.attach(db, project["id"], path)
+                    self.rendered += 1
+                    yield project, path, None
+                db.commit()
+
+    @staticmethod
+    def _metadata(project) -> Dict[str, Any]:
+        return {
+            "id": project.id,
+            "project_type": project.project_type,
+            "created_at": project.created_at,
+            "total_cost": project.total_cost
+        }
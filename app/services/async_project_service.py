@@ -0,0 +1,109 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database.async_session import AnySession
+from app.models.saved_project import SavedProject
+from app.models.report_job import ReportJob
+from app.services.project_service import ProjectService
+from app.services.report_queue import report_queue
+from app.services.project_listing_service import ProjectListing
+from app.schemas.archive_schema import ArchiveQuery
+from app.core.config import settings
+
+async def _in_threadpool(db: Session, method, *args):
+    """
+    Runs a ProjectService method in the threadpool and closes the session in the
+    same thread, so no request holds a pooled connection while it waits for its
+    next threadpool slot (which deadlocks once waiting threads fill the pool).
+    """
+    def call():
+        try:
+            return method(db, *args)
+        finally:
+            db.close()
+    return await run_in_threadpool(call)
+
+class AsyncProjectService:
+    """
+    ProjectService for the async routes. On the blocking Session each call is
+    handed to the matching ProjectService method in the threadpool. On an
+    AsyncSession (DATABASE_ASYNC) reads are awaited on the event loop, and writes
+    run the same ProjectService code through run_sync, so the two paths share
+    one implementation.
+    """
+
+    @staticmethod
+    async def save_project(db: AnySession, project_type: str, input_json: dict, total_cost: float, breakdown_json: dict):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.save_project, project_type, input_json, total_cost, breakdown_json)
+        db_project = await db.run_sync(ProjectService.insert_project, project_type, input_json, total_cost, breakdown_json)
+        if settings.REPORT_RENDER_ON_SAVE:
+            await AsyncProjectService.request_report(db, db_project)
+        return db_project
+
+    @staticmethod
+    async def save_projects(db: AnySession, projects: list, chunk_size: int = None):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.save_projects, projects, chunk_size)
+        return await db.run_sync(ProjectService.save_projects, projects, chunk_size)
+
+    @staticmethod
+    async def request_report(db: AnySession, project: SavedProject):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.request_report, project)
+        job, queue = await db.run_sync(ProjectService.prepare_report_job, project)
+        if queue:
+            # With REPORT_QUEUE_WORKERS=0 the render runs inside enqueue, so keep it off the event loop
+            await run_in_threadpool(report_queue.enqueue, job.id, project.id)
+            await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_project(db: AnySession, project_id: int):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.get_project, project_id)
+        return await db.get(SavedProject, project_id)
+
+    @staticmethod
+    async def get_project_version(db: AnySession, project_id: int):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.get_project_version, project_id)
+        return await db.scalar(select(SavedProject.version).where(SavedProject.id == project_id))
+
+    @staticmethod
+    async def get_report_job(db: AnySession, project_id: int):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.get_report_job, project_id)
+        return await db.scalar(
+            select(ReportJob)
+            .where(ReportJob.project_id == project_id)
+            .order_by(ReportJob.id.desc())
+            .limit(1)
+        )
+
+    @staticmethod
+    async def report_status(db: AnySession, project_id: int) -> str:
+        job = await AsyncProjectService.get_report_job(db, project_id)
+        return job.status if job else "not_rendered"
+
+    @staticmethod
+    async def get_all_projects(db: AnySession, skip: int = 0, limit: int = 100):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.get_all_projects, skip, limit)
+        result = await db.scalars(
+            select(SavedProject).order_by(SavedProject.created_at.desc()).offset(skip).limit(limit)
+        )
+        return result.all()
+
+    @staticmethod
+    async def list_archive(db: AnySession, query: ArchiveQuery):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.list_archive, query)
+        stmt = ProjectListing.statement(query, db.get_bind().dialect.name)
+        return await db.run_sync(ProjectListing.page, (await db.execute(stmt)).all(), query)
+
+    @staticmethod
+    async def delete_project(db: AnySession, project_id: int):
+        if isinstance(db, Session):
+            return await _in_threadpool(db, ProjectService.delete_project, project_id)
+        return await db.run_sync(ProjectService.delete_project, project_id)
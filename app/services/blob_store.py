@@ -0,0 +1,138 @@
+import base64
+import binascii
+import hashlib
+import os
+import uuid
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Dict, Iterator, Optional
+from reportlab.lib.utils import ImageReader
+from app.core.config import settings
+
+BLOB_PREFIX = "blob:sha256:"
+SIGNATURE_FIELDS = ("signature",)
+
+IMAGE_TYPES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+    (b"RIFF", "image/webp")
+]
+
+
+class BlobStore:
+    """
+    Content-addressed binary blobs under BLOB_DIR, fanned out by the first two hex
+    digits of their sha256. Rows keep a "blob:sha256:<hex>" reference instead of
+    the bytes, so identical blobs (a client signing several projects) are stored once.
+    """
+
+    @staticmethod
+    def path_for(digest: str) -> str:
+        return os.path.join(settings.BLOB_DIR, digest[:2], digest)
+
+    @staticmethod
+    def put(data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = BlobStore.path_for(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return f"{BLOB_PREFIX}{digest}"
+
+    @staticmethod
+    def get(ref: str) -> Optional[bytes]:
+        digest = BlobStore.digest(ref)
+        if digest is None:
+            return None
+        try:
+            with open(BlobStore.path_for(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def digest(ref: Any) -> Optional[str]:
+        if not isinstance(ref, str) or not ref.startswith(BLOB_PREFIX):
+            return None
+        digest = ref[len(BLOB_PREFIX):]
+        if len(digest) != 64 or any(ch not in "0123456789abcdef" for ch in digest):
+            return None
+        return digest
+
+    @staticmethod
+    def digests() -> Iterator[str]:
+        if not os.path.isdir(settings.BLOB_DIR):
+            return
+        for fan_out in os.scandir(settings.BLOB_DIR):
+            if fan_out.is_dir():
+                for entry in os.scandir(fan_out.path):
+                    if BlobStore.digest(f"{BLOB_PREFIX}{entry.name}"):
+                        yield entry.name
+
+    @staticmethod
+    def remove(digest: str) -> None:
+        try:
+            os.remove(BlobStore.path_for(digest))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def media_type(data: bytes) -> str:
+        for magic, media_type in IMAGE_TYPES:
+            if data.startswith(magic):
+                return media_type
+        return "application/octet-stream"
+
+
+def externalize_signatures(input_json: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of input_json with inline base64 signature data URLs moved into the blob
+    store and replaced by their reference. Anything else, including a data URL
+    that does not decode, is left untouched (the report skips an unusable
+    signature, as it always has).
+    """
+    if not isinstance(input_json, dict):
+        return input_json
+    result = dict(input_json)
+    for field in SIGNATURE_FIELDS:
+        value = result.get(field)
+        if isinstance(value, str) and value.startswith("data:image") and "," in value:
+            header, encoded = value.split(",", 1)
+            if not header.endswith(";base64"):
+                continue
+            try:
+                data = base64.b64decode(encoded)
+            except binascii.Error:
+                continue
+            if data:
+                result[field] = BlobStore.put(data)
+    return result
+
+
+@lru_cache(maxsize=settings.SIGNATURE_CACHE_SIZE)
+def signature_bytes(value: str) -> bytes:
+    """
+    Image bytes behind a blob reference or (legacy rows) an inline data URL.
+    Raises ValueError if there is no image behind it, so misses are not cached.
+    """
+    if value.startswith(BLOB_PREFIX):
+        data = BlobStore.get(value)
+    elif value.startswith("data:image"):
+        data = base64.b64decode(value.split(",", 1)[1])
+    else:
+        data = None
+    if not data:
+        raise ValueError(f"No signature image for {value[:80]}")
+    return data
+
+
+def signature_image(value: str) -> ImageReader:
+    """
+    A new ImageReader over the cached bytes. Readers decode lazily and are not
+    thread-safe, so one is never shared between concurrent renders.
+    """
+    return ImageReader(BytesIO(signature_bytes(value)))
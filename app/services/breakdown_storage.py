@@ -0,0 +1,227 @@
+import math
+import struct
+import threading
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.rate_card import rate_card_version
+from app.models.breakdown_component import BreakdownComponent
+
+# Header: magic, wrapped in {"items": [...]}, amount mode, percentage mode, item count
+HEADER = struct.Struct("<4sBBBI")
+MAGIC = b"BDC1"
+
+AMOUNT_FLOAT, AMOUNT_CENTS = 0, 1
+PERCENT_STORED, PERCENT_OF_TOTAL, PERCENT_OF_SUM, PERCENT_NONE = 0, 1, 2, 3
+
+# Per-item flags: original JSON types and absent keys
+AMOUNT_IS_INT, PERCENT_IS_INT, NO_CATEGORY, NO_PERCENT = 1, 2, 4, 8
+
+# Item keys in the order the engines write them; other orders stay JSON so the
+# materialized breakdown serializes byte for byte as saved
+ITEM_KEYS = ("component", "category", "amount", "percentage")
+NUMBER_TYPES = (int, float)
+
+
+def _same(a: float, b: float) -> bool:
+    # Equal including the sign of zero, which json.dumps keeps
+    return a == b and (a != 0 or math.copysign(1.0, a) == math.copysign(1.0, b))
+
+
+class BreakdownCodebook:
+    """
+    Process-wide cache of the breakdown_components table, one per database.
+    Ids are only ever appended, so a cached id never goes stale; unknown labels
+    or ids reload it. New labels are committed on their own connection before
+    any row refers to them, so a rolled-back save cannot leave an id behind that
+    another process might reuse.
+    """
+
+    def __init__(self):
+        # database URL -> (label -> id, id -> label)
+        self._caches: Dict[str, Tuple[Dict[Tuple[str, str], int], Dict[int, Tuple[str, str]]]] = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        # For a database whose codebook table was dropped and recreated
+        with self._lock:
+            self._caches.clear()
+
+    def _cache(self, engine: Engine):
+        key = engine.url.render_as_string(hide_password=False)
+        with self._lock:
+            return self._caches.setdefault(key, ({}, {}))
+
+    def _reload(self, connection, cache) -> None:
+        ids, labels = cache
+        rows = connection.execute(
+            select(BreakdownComponent.id, BreakdownComponent.component, BreakdownComponent.category)
+            .where(BreakdownComponent.id > max(labels, default=0))
+        ).all()
+        with self._lock:
+            for code, component, category in rows:
+                labels[code] = (component, category)
+                ids[(component, category)] = code
+
+    def codes(self, engine: Engine, labels: List[Tuple[str, str]]) -> List[int]:
+        cache = self._cache(engine)
+        ids = cache[0]
+        if any(label not in ids for label in labels):
+            with engine.begin() as connection:
+                self._reload(connection, cache)
+                missing = sorted({label for label in labels if label not in ids})
+                if missing:
+                    dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+                    connection.execute(
+                        dialect.insert(BreakdownComponent).on_conflict_do_nothing(),
+                        [{"component": component, "category": category} for component, category in missing]
+                    )
+                    self._reload(connection, cache)
+        return [ids[label] for label in labels]
+
+    def labels(self, engine: Engine, codes: List[int]) -> List[Tuple[str, str]]:
+        cache = self._cache(engine)
+        if any(code not in cache[1] for code in codes):
+            with engine.connect() as connection:
+                self._reload(connection, cache)
+        return [cache[1][code] for code in codes]
+
+
+breakdown_codebook = BreakdownCodebook()
+
+
+class BreakdownStorage:
+    """
+    Compact storage of saved-project breakdowns (BREAKDOWN_STORAGE="compact").
+
+    A breakdown whose items are plain {component, category, amount, percentage}
+    dicts is stored as a zlib-compressed blob of codebook ids, per-item flags and
+    amounts (integer cents when that is exact); percentages are left out when
+    they re-derive exactly from the amounts. Anything else stays verbose JSON.
+    The blob is decoded back to the identical breakdown when a row is loaded.
+    """
+
+    @staticmethod
+    def storage_columns(db: Session, breakdown: Any, total_cost: float) -> Dict[str, Any]:
+        """
+        Column values for storing a breakdown under the configured mode.
+        """
+        columns = {"breakdown_json": breakdown, "breakdown_blob": None, "rate_card_version": rate_card_version()}
+        if settings.BREAKDOWN_STORAGE == "compact":
+            blob = BreakdownStorage.encode(db.get_bind(), breakdown, total_cost)
+            if blob is not None:
+                columns.update(breakdown_json=None, breakdown_blob=blob)
+        return columns
+
+    @staticmethod
+    def encode(engine: Engine, breakdown: Any, total_cost: float) -> Optional[bytes]:
+        """
+        The compact blob for a breakdown, or None if it cannot be stored losslessly.
+        """
+        wrapped = type(breakdown) is dict
+        items = breakdown.get("items") if wrapped and breakdown.keys() == {"items"} else breakdown
+        if type(items) is not list:
+            return None
+
+        labels, flags, amounts, percents = [], bytearray(len(items)), [], []
+        for i, item in enumerate(items):
+            if type(item) is not dict or list(item) != [key for key in ITEM_KEYS if key in item]:
+                return None
+            component, category = item.get("component"), item.get("category", "")
+            amount, percent = item.get("amount"), item.get("percentage", 0.0)
+            # type() rather than isinstance keeps bools (and other subclasses) out
+            if type(component) is not str or type(category) is not str:
+                return None
+            if type(amount) not in NUMBER_TYPES or type(percent) not in NUMBER_TYPES:
+                return None
+            if (type(amount) is int and abs(amount) >= 2 ** 53) or (type(percent) is int and abs(percent) >= 2 ** 53):
+                return None
+            if not (math.isfinite(amount) and math.isfinite(percent)):
+                return None
+            labels.append((component, category))
+            flags[i] = (
+                (NO_CATEGORY if "category" not in item else 0)
+                | (AMOUNT_IS_INT if type(amount) is int else 0)
+                | (PERCENT_IS_INT if type(percent) is int else 0)
+                | (NO_PERCENT if "percentage" not in item else 0)
+            )
+            amounts.append(float(amount))
+            percents.append(float(percent))
+
+        count = len(items)
+        cents = [round(amount * 100) for amount in amounts]
+        exact = all(abs(c) < 2 ** 53 and _same(c / 100, amount) for c, amount in zip(cents, amounts))
+        amount_mode = AMOUNT_CENTS if exact else AMOUNT_FLOAT
+        percent_mode = BreakdownStorage._percent_mode(amounts, percents, flags, total_cost)
+
+        codes = breakdown_codebook.codes(engine, labels)
+        payload = struct.pack(f"<{count}I", *codes) + bytes(flags)
+        payload += struct.pack(f"<{count}q", *cents) if amount_mode == AMOUNT_CENTS else struct.pack(f"<{count}d", *amounts)
+        if percent_mode == PERCENT_STORED:
+            payload += struct.pack(f"<{count}d", *percents)
+        return HEADER.pack(MAGIC, wrapped, amount_mode, percent_mode, count) + zlib.compress(payload)
+
+    @staticmethod
+    def decode(engine: Engine, blob: bytes, total_cost: Optional[float]) -> Any:
+        magic, wrapped, amount_mode, percent_mode, count = HEADER.unpack_from(blob)
+        if magic != MAGIC:
+            raise ValueError("Not a compact breakdown")
+        payload = zlib.decompress(blob[HEADER.size:])
+        codes = struct.unpack_from(f"<{count}I", payload)
+        offset = 4 * count
+        flags = payload[offset:offset + count]
+        offset += count
+        if amount_mode == AMOUNT_CENTS:
+            amounts = [c / 100 for c in struct.unpack_from(f"<{count}q", payload, offset)]
+        else:
+            amounts = list(struct.unpack_from(f"<{count}d", payload, offset))
+        offset += 8 * count
+        if percent_mode == PERCENT_STORED:
+            percents = struct.unpack_from(f"<{count}d", payload, offset)
+        elif percent_mode == PERCENT_OF_TOTAL:
+            percents = [round((amount / total_cost) * 100, 2) for amount in amounts]
+        elif percent_mode == PERCENT_OF_SUM:
+            subtotal = sum(amounts)
+            percents = [round((amount / subtotal) * 100, 2) for amount in amounts]
+        else:
+            percents = [0.0] * count
+
+        items = []
+        for (component, category), flag, amount, percent in zip(breakdown_codebook.labels(engine, codes), flags, amounts, percents):
+            item = {"component": component}
+            if not flag & NO_CATEGORY:
+                item["category"] = category
+            item["amount"] = int(amount) if flag & AMOUNT_IS_INT else amount
+            if not flag & NO_PERCENT:
+                item["percentage"] = int(percent) if flag & PERCENT_IS_INT else percent
+            items.append(item)
+        return {"items": items} if wrapped else items
+
+    @staticmethod
+    def materialize(db: Session, breakdown_json: Any, breakdown_blob: Optional[bytes], total_cost: Optional[float]) -> Any:
+        """
+        The verbose breakdown of a row selected column by column.
+        """
+        if breakdown_blob is None:
+            return breakdown_json
+        return BreakdownStorage.decode(db.get_bind(), breakdown_blob, total_cost)
+
+    @staticmethod
+    def _percent_mode(amounts: List[float], percents: List[float], flags: bytearray, total_cost: float) -> int:
+        """
+        PERCENT_OF_TOTAL / PERCENT_OF_SUM when every percentage re-derives exactly
+        (as a float) from the decoded amounts, PERCENT_NONE when none is present.
+        """
+        if all(flag & NO_PERCENT for flag in flags):
+            return PERCENT_NONE
+        if any(flag & (NO_PERCENT | PERCENT_IS_INT) for flag in flags):
+            return PERCENT_STORED
+        total_cost = total_cost if type(total_cost) in NUMBER_TYPES and math.isfinite(total_cost) else None
+        for mode, base in ((PERCENT_OF_TOTAL, total_cost), (PERCENT_OF_SUM, sum(amounts))):
+            if base and all(_same(round((amount / base) * 100, 2), percent) for amount, percent in zip(amounts, percents)):
+                return mode
+        return PERCENT_STORED
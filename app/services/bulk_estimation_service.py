@@ -0,0 +1,124 @@
+import csv
+import itertools
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from fastapi import HTTPException
+from pydantic import ValidationError
+from app.engines.registry import PROJECT_ENGINES
+
+FORMATS = ("csv", "ndjson")
+
+
+def detect_format(name_or_content_type: Optional[str]) -> Optional[str]:
+    value = (name_or_content_type or "").lower()
+    if "csv" in value:
+        return "csv"
+    if "ndjson" in value or "jsonl" in value or "json" in value:
+        return "ndjson"
+    return None
+
+
+class BulkEstimator:
+    """
+    Row-at-a-time estimation pipeline shared by the bulk endpoint and CLI.
+
+    Rows are decoded, validated against the project type's schema and priced one by
+    one; each produces exactly one NDJSON result line, so memory stays constant no
+    matter how large the input is. A bad row yields an inline error line instead of
+    aborting the stream.
+    """
+
+    def __init__(self, fmt: str, project_type: Optional[str] = None, include_breakdown: bool = True):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.fmt = fmt
+        self.project_type = project_type
+        self.include_breakdown = include_breakdown
+        self.header: Optional[List[str]] = None
+        self.rows = 0
+        self.errors = 0
+
+    def process(self, lines: Iterable[str]) -> Iterator[str]:
+        for record in self.records(lines):
+            self.rows += 1
+            result = self.estimate_record(record)
+            if "error" in result:
+                self.errors += 1
+            yield json.dumps(result) + "\n"
+
+    def records(self, lines: Iterable[str]) -> Iterator[Any]:
+        """
+        NDJSON: each non-blank line. CSV: the rows of one csv.reader over the whole
+        stream (so a quoted field may span lines) after the header row; a row the
+        reader rejects is passed on as its csv.Error, to be reported in place.
+        """
+        if self.fmt == "ndjson":
+            yield from (line for line in lines if line.strip())
+            return
+        reader = csv.reader(lines)
+        while True:
+            try:
+                values = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield e
+                continue
+            if not any(value.strip() for value in values):
+                continue
+            if self.header is None:
+                self.header = [column.strip() for column in values]
+                continue
+            yield values
+
+    def process_batches(self, lines: Iterable[str], batch_size: int = 500) -> Iterator[str]:
+        """
+        process() grouped into batches of output lines, so a consumer that pays a
+        fixed cost per chunk (e.g. a threadpool hop per StreamingResponse chunk)
+        does not pay it per row.
+        """
+        results = self.process(lines)
+        while True:
+            batch = "".join(itertools.islice(results, batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def summary(self) -> str:
+        return json.dumps({"summary": {"rows": self.rows, "errors": self.errors}}) + "\n"
+
+    def decode(self, record: Any) -> Dict[str, Any]:
+        if self.fmt == "ndjson":
+            row = json.loads(record)
+            if not isinstance(row, dict):
+                raise ValueError("Row is not a JSON object")
+            return row
+        if isinstance(record, csv.Error):
+            raise ValueError(f"Malformed CSV row: {record}")
+        values = record
+        if len(values) != len(self.header):
+            raise ValueError(f"Expected {len(self.header)} columns, got {len(values)}")
+        # Empty cells fall back to the schema defaults
+        return {key: value.strip() for key, value in zip(self.header, values) if value.strip() != ""}
+
+    def estimate_record(self, record: Any) -> Dict[str, Any]:
+        row_number = self.rows
+        try:
+            row = self.decode(record)
+            project_type = row.pop("project_type", None) or self.project_type
+            if project_type not in PROJECT_ENGINES:
+                return {"row": row_number, "error": f"Unknown project_type: {project_type}"}
+            schema, engine = PROJECT_ENGINES[project_type]
+            result = engine.estimate_cost(schema(**row).dict())
+        except ValidationError as e:
+            errors = [f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()]
+            return {"row": row_number, "error": "; ".join(errors)}
+        except HTTPException as e:
+            return {"row": row_number, "error": str(e.detail)}
+        except Exception as e:
+            return {"row": row_number, "error": str(e)}
+
+        output = {"row": row_number, "project_type": project_type, "total_cost": result["total_cost"]}
+        if self.include_breakdown:
+            output["breakdown"] = result["breakdown"]
+        return output
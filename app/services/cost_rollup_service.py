@@ -0,0 +1,197 @@
+import math
+from functools import lru_cache
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.cost_rollup import CostRollup
+from app.models.saved_project import SavedProject
+from app.services.project_listing_service import ProjectListing
+
+# Log-scale buckets: every cost in bucket i lies within
+# COST_ROLLUP_RELATIVE_ACCURACY of bucket_value(i)
+GAMMA = (1 + settings.COST_ROLLUP_RELATIVE_ACCURACY) / (1 - settings.COST_ROLLUP_RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+ZERO_BUCKET = -(2 ** 31) # costs <= 0
+
+DIMENSIONS = ("project_type", "month", "grade")
+
+# (project_type, created_at, grade, total_cost) of one saved project
+Entry = Tuple[Optional[str], Optional[datetime], Any, Optional[float]]
+
+
+class CostRollups:
+    """
+    Incrementally maintained cost aggregates behind /analytics. Saves add and
+    deletes subtract each project's count, cost and squared cost in its
+    (project_type, month, grade, cost bucket) row, in the same transaction as
+    the project itself. The buckets form a mergeable quantile sketch, so any
+    grouping and its percentiles are answered from the rollup rows alone,
+    however many projects there are.
+    """
+
+    @staticmethod
+    def bucket(cost: float) -> int:
+        return math.ceil(math.log(cost) / LOG_GAMMA) if cost > 0 else ZERO_BUCKET
+
+    @staticmethod
+    def bucket_value(bucket: int) -> float:
+        # Midpoint (in relative error) of (GAMMA^(i-1), GAMMA^i]
+        return 0.0 if bucket == ZERO_BUCKET else 2 * GAMMA ** bucket / (GAMMA + 1)
+
+    @staticmethod
+    def month(created_at: Optional[datetime]) -> str:
+        if created_at is None:
+            return ""
+        if created_at.tzinfo is not None:
+            created_at = created_at.astimezone(timezone.utc)
+        return created_at.strftime("%Y-%m")
+
+    @staticmethod
+    def entry(project: SavedProject) -> Entry:
+        grade = ProjectListing.summary_value(project.input_json, "grade")
+        return project.project_type, project.created_at, grade, project.total_cost
+
+    @staticmethod
+    def deltas(entries: Iterable[Entry], sign: int = 1) -> Dict[tuple, List[float]]:
+        """
+        Rollup row key -> [count, total, sum_squares] change for some projects.
+        """
+        changes = defaultdict(lambda: [0, 0.0, 0.0])
+        for project_type, created_at, grade, total_cost in entries:
+            if total_cost is None:
+                continue
+            key = (
+                project_type or "", CostRollups.month(created_at),
+                "" if grade is None else str(grade), CostRollups.bucket(total_cost)
+            )
+            change = changes[key]
+            change[0] += sign
+            change[1] += sign * total_cost
+            change[2] += sign * total_cost * total_cost
+        return changes
+
+    @staticmethod
+    def apply(db: Session, entries: Iterable[Entry], sign: int = 1) -> None:
+        """
+        Adds (sign=1) or subtracts (sign=-1) projects in the session's transaction.
+        """
+        changes = CostRollups.deltas(entries, sign)
+        if not changes:
+            return
+        stmt = CostRollups.upsert_statement(db.get_bind().dialect.name)
+        # Key order keeps concurrent writers from deadlocking on PostgreSQL
+        db.execute(stmt, [
+            dict(zip(DIMENSIONS + ("bucket",), key), count=count, total=total, sum_squares=sum_squares)
+            for key, (count, total, sum_squares) in sorted(changes.items())
+        ])
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def upsert_statement(dialect_name: str):
+        # Built once per dialect; constructing it costs more than running it
+        table = CostRollup.__table__
+        stmt = (postgresql if dialect_name == "postgresql" else sqlite).insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.project_type, table.c.month, table.c.grade, table.c.bucket],
+            set_={name: table.c[name] + stmt.excluded[name] for name in ("count", "total", "sum_squares")}
+        )
+
+    @staticmethod
+    def rebuild(db: Session, batch_size: int = 5000) -> int:
+        """
+        Recomputes every rollup row from saved_projects and returns the number of
+        projects counted. Saves that commit while it runs can be missed or
+        counted twice, so run it while none are in flight.
+        """
+        stmt = select(
+            SavedProject.project_type, SavedProject.created_at,
+            ProjectListing.summary_column("grade"), SavedProject.total_cost
+        ).execution_options(yield_per=batch_size)
+        projects = 0
+        changes = defaultdict(lambda: [0, 0.0, 0.0])
+        for partition in db.execute(stmt).partitions():
+            projects += len(partition)
+            for key, change in CostRollups.deltas(partition).items():
+                total = changes[key]
+                for i, value in enumerate(change):
+                    total[i] += value
+        db.execute(delete(CostRollup))
+        rows = [
+            dict(zip(DIMENSIONS + ("bucket",), key), count=count, total=total, sum_squares=sum_squares)
+            for key, (count, total, sum_squares) in sorted(changes.items())
+        ]
+        for start in range(0, len(rows), batch_size):
+            db.execute(CostRollup.__table__.insert(), rows[start:start + batch_size])
+        db.commit()
+        return projects
+
+    @staticmethod
+    def summary(
+        db: Session,
+        group_by: Sequence[str] = ("project_type",),
+        project_type: Optional[str] = None,
+        grade: Optional[str] = None,
+        month_from: Optional[str] = None,
+        month_to: Optional[str] = None,
+        percentiles: Sequence[float] = (50, 90, 95)
+    ) -> Dict[str, Any]:
+        unknown = [name for name in group_by if name not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Cannot group by {', '.join(unknown)}; use {', '.join(DIMENSIONS)}")
+        if any(not 0 <= q <= 100 for q in percentiles):
+            raise ValueError("Percentiles must be between 0 and 100")
+
+        # Buckets are merged per group in SQL; only groups x buckets rows come back
+        dimensions = [getattr(CostRollup, name) for name in group_by]
+        stmt = select(
+            *dimensions, CostRollup.bucket, func.sum(CostRollup.count).label("count"),
+            func.sum(CostRollup.total).label("total"), func.sum(CostRollup.sum_squares).label("sum_squares")
+        ).where(CostRollup.count > 0)
+        if project_type is not None:
+            stmt = stmt.where(CostRollup.project_type == project_type)
+        if grade is not None:
+            stmt = stmt.where(CostRollup.grade == grade)
+        if month_from:
+            stmt = stmt.where(CostRollup.month >= month_from)
+        if month_to:
+            stmt = stmt.where(CostRollup.month <= month_to)
+        stmt = stmt.group_by(*dimensions, CostRollup.bucket).order_by(*dimensions, CostRollup.bucket)
+
+        groups = defaultdict(lambda: {"count": 0, "total": 0.0, "sum_squares": 0.0, "buckets": []})
+        for *key, bucket, count, total, sum_squares in db.execute(stmt):
+            group = groups[tuple(key)]
+            group["count"] += count
+            group["total"] += total
+            group["sum_squares"] += sum_squares
+            group["buckets"].append((bucket, count))
+
+        results = []
+        for key, group in sorted(groups.items()):
+            count = group["count"]
+            mean = group["total"] / count
+            variance = max(group["sum_squares"] / count - mean * mean, 0.0)
+            result = dict(zip(group_by, key))
+            result.update(
+                count=count,
+                total=round(group["total"], 2),
+                mean=round(mean, 2),
+                stddev=round(math.sqrt(variance), 2),
+                percentiles={f"p{q:g}": round(CostRollups.quantile(group["buckets"], count, q), 2) for q in percentiles}
+            )
+            results.append(result)
+        return {"group_by": list(group_by), "relative_accuracy": settings.COST_ROLLUP_RELATIVE_ACCURACY, "groups": results}
+
+    @staticmethod
+    def quantile(buckets: List[Tuple[int, int]], count: int, q: float) -> float:
+        # Nearest-rank quantile over (bucket, count) pairs in bucket order
+        rank = q / 100 * (count - 1)
+        seen = 0
+        for bucket, bucket_count in buckets:
+            seen += bucket_count
+            if seen > rank:
+                return CostRollups.bucket_value(bucket)
+        return CostRollups.bucket_value(buckets[-1][0])
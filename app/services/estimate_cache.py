@@ -0,0 +1,127 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.rate_card import rate_card_version
+from app.services.single_flight import estimate_flights
+
+
+class EstimateCache:
+    """
+    Bounded LRU + TTL cache in front of the estimation engines.
+
+    Entries are keyed on a canonical hash of the validated schema, the project type
+    and the rate-card version, so identical requests (wizard prefetch, retries, the
+    estimate-then-save flow) are computed once per rate card.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def key_for(project_type: str, data: Dict[str, Any]) -> str:
+        canonical = json.dumps(
+            {"type": project_type, "inputs": data, "rate_card": rate_card_version()},
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get_or_compute(self, project_type: str, data: Dict[str, Any], compute: Callable[[dict], dict]) -> dict:
+        """
+        Returns a private copy of the cached result for (project_type, data), calling
+        compute(data) on a miss. Engines may mutate their input, so they get a copy.
+        Concurrent misses for the same key share one compute call.
+        """
+        key = self.key_for(project_type, data)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        (result, stored), shared = estimate_flights.do(key, lambda: self._compute(key, data, compute))
+        return copy.deepcopy(stored) if shared else result
+
+    async def get_or_compute_async(self, project_type: str, data: Dict[str, Any], compute: Callable[[dict], dict]) -> dict:
+        """
+        get_or_compute() for async routes: hits are served on the event loop, misses
+        are computed in the threadpool and concurrent requests wait on one computation.
+        """
+        key = self.key_for(project_type, data)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        (result, stored), shared = await estimate_flights.do_async(key, lambda: self._compute(key, data, compute))
+        return copy.deepcopy(stored) if shared else result
+
+    def _lookup(self, key: str) -> Optional[dict]:
+        if self.maxsize <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(result)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+        return None
+
+    def _compute(self, key: str, data: Dict[str, Any], compute: Callable[[dict], dict]) -> Tuple[dict, dict]:
+        """
+        (result, stored): result goes to the caller that computed it, and waiters
+        coalesced onto the call copy stored, which nobody mutates.
+        """
+        now = time.monotonic()
+        with self._lock:
+            # Filled by a call that finished between our miss and this one starting
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return copy.deepcopy(entry[1]), entry[1]
+
+        result = compute(dict(data))
+        stored = copy.deepcopy(result)
+        if self.maxsize <= 0:
+            return result, stored
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result, stored
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl_seconds,
+                "rate_card_version": rate_card_version(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+estimate_cache = EstimateCache(settings.ESTIMATE_CACHE_MAXSIZE, settings.ESTIMATE_CACHE_TTL_SECONDS)
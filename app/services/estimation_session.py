@@ -0,0 +1,93 @@
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from app.engines.own_house_engine import OwnHouseEngine
+from app.engines.registry import PROJECT_ENGINES
+from app.services.estimate_cache import estimate_cache
+
+
+def breakdown_diff(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Changes between two breakdowns, by component: new components in full,
+    changed ones with only their changed fields, removed ones by name, and the
+    new order only if it changed.
+    """
+    before = {item["component"]: item for item in previous}
+    changed = []
+    for item in current:
+        old = before.get(item["component"])
+        if old == item:
+            continue
+        if old is None:
+            changed.append(item)
+            continue
+        fields = {key: value for key, value in item.items() if old.get(key) != value}
+        if fields:
+            changed.append({"component": item["component"], **fields})
+    names = [item["component"] for item in current]
+    diff = {}
+    if changed:
+        diff["changed"] = changed
+    kept = set(names)
+    removed = [name for name in before if name not in kept]
+    if removed:
+        diff["removed"] = removed
+    if names != [item["component"] for item in previous]:
+        diff["order"] = names
+    return diff
+
+
+class EstimationSession:
+    """
+    Live estimate for one wizard connection. The client sends only the fields
+    it changed; the session keeps the form and the last result, recomputes the
+    own-house stages those fields feed (OwnHouseEngine.estimate_incremental) and
+    answers with a diff against the previous estimate. Other project types have
+    single-stage engines and are re-estimated in full, still answering with a diff.
+    """
+
+    def __init__(self, project_type: str):
+        if project_type not in PROJECT_ENGINES:
+            raise ValueError(f"Unknown project_type: {project_type}")
+        self.project_type = project_type
+        self.schema, self.engine = PROJECT_ENGINES[project_type]
+        self.inputs: Dict[str, Any] = {}
+        self.result: Optional[Dict[str, Any]] = None
+        self._stages: Optional[Dict[str, Any]] = None
+
+    def update(self, fields: Dict[str, Any], full: bool = False) -> Dict[str, Any]:
+        """
+        Applies changed fields and returns the message for the client: the whole
+        estimate on the first valid form (or when full is asked for), a diff after
+        that. An invalid form leaves the session as it was.
+        """
+        known = {name: value for name, value in fields.items() if name in self.schema.model_fields}
+        try:
+            inputs = self.schema(**{**self.inputs, **known}).dict()
+        except ValidationError as e:
+            return {"type": "error", "detail": e.errors(include_url=False, include_context=False)}
+
+        changed = {name for name, value in inputs.items() if self.inputs.get(name) != value}
+        previous = self.result
+        if previous is None or changed:
+            self.result = self._estimate(inputs, changed)
+        self.inputs = inputs
+
+        if previous is None or full:
+            return {"type": "estimate", "estimate": self.result}
+        if previous is self.result:
+            return {"type": "diff"}
+        return {"type": "diff", **self.diff(previous, self.result)}
+
+    @staticmethod
+    def diff(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+        diff = {key: value for key, value in current.items() if key != "breakdown" and previous.get(key) != value}
+        breakdown = breakdown_diff(previous["breakdown"], current["breakdown"])
+        if breakdown:
+            diff["breakdown"] = breakdown
+        return diff
+
+    def _estimate(self, inputs: Dict[str, Any], changed: set) -> Dict[str, Any]:
+        if self.engine is OwnHouseEngine:
+            result, self._stages = OwnHouseEngine.estimate_incremental(inputs, self._stages, changed)
+            return result
+        return estimate_cache.get_or_compute(self.project_type, inputs, self.engine.estimate_cost)
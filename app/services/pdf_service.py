@@ -1,50 +1,84 @@
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.lib import colors
+from reportlab import rl_config
 from datetime import datetime
+from io import BytesIO
+import logging
 import os
 from app.core.config import settings
+from app.core.metrics import PDF_RENDER_SECONDS
+from app.services.blob_store import BLOB_PREFIX, signature_image
+
+# Reports are served as binary application/pdf; the ASCII85 stream filter only
+# inflates them and costs ~20% of render time
+rl_config.useA85 = 0
+
+logger = logging.getLogger(__name__)
+
+WIDTH, HEIGHT = letter
+
+# Colour palette, resolved once per process
+SLATE_900 = colors.HexColor("#0F172A")
+SLATE_500 = colors.HexColor("#64748B")
+SLATE_400 = colors.HexColor("#94A3B8")
+SLATE_300 = colors.HexColor("#CBD5E1")
+SLATE_200 = colors.HexColor("#E2E8F0")
+SLATE_100 = colors.HexColor("#F1F5F9")
+
+BOQ_FONT = ("Helvetica", 10)
+
 
 class PDFService:
     @staticmethod
     def generate_project_report(project_data: dict, filename: str) -> str:
+        """
+        Renders the report and writes it to REPORTS_DIR/filename.
+        """
         # 1. Infrastructure: Ensure reports vault exists
         if not os.path.exists(settings.REPORTS_DIR):
             os.makedirs(settings.REPORTS_DIR)
 
         filepath = os.path.join(settings.REPORTS_DIR, filename)
-        c = canvas.Canvas(filepath, pagesize=letter)
-        width, height = letter
-        
+        pdf = PDFService.render_project_report(project_data)
+        with open(filepath, "wb") as f:
+            f.write(pdf)
+        return filepath
+
+    @staticmethod
+    @PDF_RENDER_SECONDS.time()
+    def render_project_report(project_data: dict) -> bytes:
+        """
+        Renders the report in memory and returns the PDF bytes.
+        """
+        buffer = BytesIO()
+        c = canvas.Canvas(buffer, pagesize=letter)
+        PDFService._define_forms(c)
+        width, height = WIDTH, HEIGHT
+
         # ── 2. BRANDED HEADER SHELL ──
-        c.setFillColor(colors.HexColor("#0F172A")) # Slate-900 Ambient
-        c.rect(0, height - 100, width, 100, fill=1)
-        
-        c.setFillColor(colors.white)
-        c.setFont("Helvetica-Bold", 26)
-        c.drawString(40, height - 55, "ARCHITECTURAL COST ENGINE")
-        
+        c.doForm("header")
         c.setFont("Helvetica", 10)
-        c.setFillColor(colors.HexColor("#94A3B8"))
-        c.drawString(40, height - 75, "2026 AI-DRIVEN PROJECT VALUATION PORTAL")
+        c.setFillColor(SLATE_400)
         c.drawRightString(width - 40, height - 55, f"INDEX DATE: {datetime.now().strftime('%d-%m-%Y')}")
-        
+
         # ── 3. PROJECT IDENTITY BLOCK ──
         c.setFillColor(colors.black)
         c.setFont("Helvetica-Bold", 18)
         y = height - 140
         c.drawString(40, y, f"Project Profile: {project_data['project_type'].replace('_', ' ').title()}")
-        
+
         y -= 40
         c.setFont("Helvetica-Bold", 12)
-        c.setFillColor(colors.HexColor("#64748B"))
+        c.setFillColor(SLATE_500)
         c.drawString(40, y, "CLIENT CONFIGURATION SUMMARY")
         y -= 25
-        
+
         c.setFont("Helvetica", 11)
         c.setFillColor(colors.black)
         inputs = project_data['input_json']
-        
+
         # Grid-like input summary
         input_count = 0
         for key, value in inputs.items():
@@ -61,95 +95,147 @@ class PDFService:
                 c.setFont("Helvetica", 11)
                 y -= 22
             input_count += 1
-        
+
         if input_count % 2 != 0: y -= 22
-            
+
         # ── 4. TOTAL INVESTMENT HUD ──
         y -= 30
-        c.setStrokeColor(colors.HexColor("#E2E8F0"))
+        c.setStrokeColor(SLATE_200)
         c.setLineWidth(1)
         c.line(40, y, width - 40, y)
-        
+
         y -= 45
         c.roundRect(40, y - 15, width - 80, 60, 12, fill=0)
         c.setFont("Helvetica-Bold", 14)
         c.drawString(60, y + 15, "TOTAL ESTIMATED INVESTMENT")
         c.setFont("Helvetica-Bold", 28)
-        c.setFillColor(colors.HexColor("#0F172A"))
+        c.setFillColor(SLATE_900)
         c.drawRightString(width - 60, y - 5, f"INR {project_data['total_cost']:,.2f}")
 
         # ── 5. DETAILED BOQ BREAKDOWN ──
         y -= 60
         c.setFont("Helvetica-Bold", 12)
-        c.setFillColor(colors.HexColor("#64748B"))
+        c.setFillColor(SLATE_500)
         c.drawString(40, y, "BILL OF QUANTITIES (BOQ) BREAKDOWN")
         y -= 30
 
-        # Handle items list correctly
-        items = project_data['breakdown_json'].get('items', [])
-        c.setFont("Helvetica", 10)
-        
+        # Handle items list correctly (/projects/save sends {"items": [...]}, the
+        # per-type /save routes store the engine's breakdown list as-is)
+        breakdown = project_data['breakdown_json'] or []
+        items = breakdown.get('items', []) if isinstance(breakdown, dict) else breakdown
+        c.setFont(*BOQ_FONT)
+
+        rows = []
         for item in items:
             if y < 150: # Trigger new page if overflow
+                PDFService._draw_boq_rows(c, rows)
+                rows = []
                 c.showPage()
                 y = height - 50
-                c.setFont("Helvetica", 10)
-
-            c.setFillColor(colors.HexColor("#F1F5F9"))
-            c.rect(40, y - 5, width - 80, 18, fill=1, stroke=0)
-            
-            c.setFillColor(colors.black)
-            c.drawString(50, y, item['component'])
-            c.drawRightString(width - 50, y, f"INR {item['amount']:,.2f}")
+                c.setFont(*BOQ_FONT)
+            rows.append((y, item['component'], f"INR {item['amount']:,.2f}"))
             y -= 22
-            
+        PDFService._draw_boq_rows(c, rows)
+
         # ── 6. AUTHORIZATION BLOCK (Digital Signature) ──
         if y < 200:
             c.showPage()
             y = height - 50
 
         y -= 40
-        c.setStrokeColor(colors.HexColor("#CBD5E1"))
-        c.line(40, y, width - 40, y)
+        c.saveState()
+        c.translate(0, y)
+        c.doForm("authorization")
+        c.restoreState()
         y -= 30
-        
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(40, y, "DIGITAL AUTHORIZATION")
-        
+
         client_name = inputs.get("client_name", "Authorized Signatory")
         y -= 60
-        
-        c.setFont("Helvetica", 10)
-        c.drawString(40, y, "Client Name:")
+
+        c.setFillColor(colors.black)
         c.setFont("Helvetica-Bold", 14)
         c.drawString(40, y - 20, str(client_name))
-        
-        # Render Digital Signature if present (base64 dataURL)
+
+        # Render Digital Signature if present (blob reference or legacy base64 dataURL)
         signature_data = inputs.get("signature")
-        if signature_data and signature_data.startswith("data:image"):
+        if isinstance(signature_data, str) and signature_data.startswith((BLOB_PREFIX, "data:image")):
             try:
-                import base64
-                from io import BytesIO
-                from reportlab.lib.utils import ImageReader
-                
-                # Strip metadata header
-                header, encoded = signature_data.split(",", 1)
-                img_data = base64.b64decode(encoded)
-                img = ImageReader(BytesIO(img_data))
-                
+                img = signature_image(signature_data)
+
                 # Draw the signature as an image
                 c.drawImage(img, width - 240, y - 60, width=200, height=80, mask='auto', preserveAspectRatio=True)
                 c.setStrokeColor(colors.lightgrey)
                 c.line(width - 240, y - 65, width - 40, y - 65)
                 c.setFont("Helvetica-Oblique", 8)
                 c.drawRightString(width - 40, y - 75, "Digitally Verified via Mouse/Touchpad")
-            except Exception as e:
-                pass
-        
+            except Exception:
+                # The report still renders, unsigned
+                logger.exception("Could not draw signature for %s", project_data.get("project_type"))
+
         # FINAL FOOTER
+        c.doForm("footer")
+
+        c.save()
+        return buffer.getvalue()
+
+    @staticmethod
+    def _define_forms(c: canvas.Canvas) -> None:
+        """
+        Static page furniture, emitted once per document as form XObjects and
+        placed with doForm.
+        """
+        width, height = WIDTH, HEIGHT
+
+        c.beginForm("header")
+        c.setFillColor(SLATE_900) # Slate-900 Ambient
+        c.rect(0, height - 100, width, 100, fill=1)
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", 26)
+        c.drawString(40, height - 55, "ARCHITECTURAL COST ENGINE")
+        c.setFont("Helvetica", 10)
+        c.setFillColor(SLATE_400)
+        c.drawString(40, height - 75, "2026 AI-DRIVEN PROJECT VALUATION PORTAL")
+        c.endForm()
+
+        # Drawn translated to the block's top rule
+        c.beginForm("authorization")
+        c.setStrokeColor(SLATE_300)
+        c.setLineWidth(1)
+        c.line(40, 0, width - 40, 0)
+        c.setFillColor(colors.black)
+        c.setFont("Helvetica-Bold", 12)
+        c.drawString(40, -30, "DIGITAL AUTHORIZATION")
+        c.setFont("Helvetica", 10)
+        c.drawString(40, -90, "Client Name:")
+        c.endForm()
+
+        c.beginForm("footer")
         c.setFont("Helvetica-Oblique", 8)
         c.setFillColor(colors.grey)
-        c.drawCentredString(width/2, 30, "Generated by Construction AI Cost Estimator - For Professional Planning Only")
-        
-        c.save()
-        return filepath
+        c.drawCentredString(width / 2, 30, "Generated by Construction AI Cost Estimator - For Professional Planning Only")
+        c.endForm()
+
+    @staticmethod
+    def _draw_boq_rows(c: canvas.Canvas, rows: list) -> None:
+        """
+        One page of BOQ rows: every row band in a single filled path, then every
+        label and amount in a single text object.
+        """
+        if not rows:
+            return
+        width = WIDTH
+        bands = c.beginPath()
+        for y, _, _ in rows:
+            bands.rect(40, y - 5, width - 80, 18)
+        c.setFillColor(SLATE_100)
+        c.drawPath(bands, fill=1, stroke=0)
+
+        text = c.beginText()
+        text.setFont(*BOQ_FONT)
+        text.setFillColor(colors.black)
+        for y, component, amount in rows:
+            text.setTextOrigin(50, y)
+            text.textOut(component)
+            text.setTextOrigin(width - 50 - stringWidth(amount, *BOQ_FONT), y)
+            text.textOut(amount)
+        c.drawText(text)
@@ -0,0 +1,86 @@
+import json
+import marshal
+import os
+import re
+import time
+import uuid
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.core.profiling import collapsed_stacks, pstats_table, summarize
+
+PROFILE_ID = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+
+# Files kept per profile, by kind: pstats.Stats(path) / flamegraph.pl or speedscope
+PROFILE_FILES = {"pstats": ".prof", "collapsed": ".collapsed"}
+
+
+class ProfileStore:
+    """
+    Request profiles under PROFILING_DIR: <id>.prof (pstats), <id>.collapsed
+    (flamegraph input) and <id>.json (request, highlights, top functions). Ids
+    sort by time; past PROFILING_MAX_PROFILES the oldest are deleted.
+    """
+
+    @staticmethod
+    def new_id() -> str:
+        return f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime())}-{uuid.uuid4().hex[:8]}"
+
+    @staticmethod
+    def path_for(profile_id: str, kind: str) -> Optional[str]:
+        if not PROFILE_ID.match(profile_id) or kind not in PROFILE_FILES:
+            return None
+        return os.path.join(settings.PROFILING_DIR, profile_id + PROFILE_FILES[kind])
+
+    @staticmethod
+    def save(profile_id: str, samples: Counter, request: Dict[str, Any]) -> Dict[str, Any]:
+        os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+        base = os.path.join(settings.PROFILING_DIR, profile_id)
+        with open(base + PROFILE_FILES["pstats"], "wb") as f:
+            marshal.dump(pstats_table(samples), f)
+        with open(base + PROFILE_FILES["collapsed"], "w") as f:
+            f.writelines(line + "\n" for line in collapsed_stacks(samples))
+        meta = {"id": profile_id, **request, **summarize(samples)}
+        # Written last: a profile is listed once its metadata exists
+        tmp_path = f"{base}.json.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, base + ".json")
+        ProfileStore.prune()
+        return meta
+
+    @staticmethod
+    def ids() -> List[str]:
+        if not os.path.isdir(settings.PROFILING_DIR):
+            return []
+        return sorted(
+            (name[:-len(".json")] for name in os.listdir(settings.PROFILING_DIR)
+             if name.endswith(".json") and PROFILE_ID.match(name[:-len(".json")])),
+            reverse=True
+        )
+
+    @staticmethod
+    def prune() -> int:
+        removed = 0
+        for profile_id in ProfileStore.ids()[settings.PROFILING_MAX_PROFILES:]:
+            for suffix in (".json", *PROFILE_FILES.values()):
+                try:
+                    os.remove(os.path.join(settings.PROFILING_DIR, profile_id + suffix))
+                except FileNotFoundError:
+                    pass
+            removed += 1
+        return removed
+
+    @staticmethod
+    def list(limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Metadata of the most recent profiles, newest first.
+        """
+        profiles = []
+        for profile_id in ProfileStore.ids()[:limit]:
+            try:
+                with open(os.path.join(settings.PROFILING_DIR, profile_id + ".json")) as f:
+                    profiles.append(json.load(f))
+            except (FileNotFoundError, ValueError):
+                continue # pruned (or being written) meanwhile
+        return profiles
@@ -0,0 +1,218 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import Text, cast, select
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.saved_project import SavedProject
+from app.services.archive_export_service import ZipChunks
+from app.services.breakdown_storage import BreakdownStorage
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+# Exported in this order; input_json and breakdown_json follow
+COLUMNS = ("id", "user_id", "project_type", "created_at", "total_cost", "rate_card_version", "pdf_path")
+
+# Prefix of the per-component amount columns of a flattened breakdown
+COMPONENT_PREFIX = "breakdown."
+
+
+def breakdown_items(breakdown: Any) -> List[Any]:
+    # Engine breakdowns are lists, frontend saves wrap them in {"items": [...]}
+    items = breakdown.get("items") if isinstance(breakdown, dict) else breakdown
+    return items if isinstance(items, list) else []
+
+
+def component_amounts(breakdown: Any) -> Dict[str, float]:
+    amounts = defaultdict(float)
+    for item in breakdown_items(breakdown):
+        if isinstance(item, dict) and isinstance(item.get("component"), str) and isinstance(item.get("amount"), (int, float)):
+            amounts[item["component"]] += item["amount"]
+    return amounts
+
+
+class ProjectDataExporter:
+    """
+    Streams saved projects as CSV, NDJSON or Parquet.
+
+    Rows are read through a server-side cursor (yield_per) in batches of
+    EXPORT_DATA_BATCH_SIZE and each batch is written out and yielded before the
+    next is fetched, so memory stays flat however large the table is (Parquet
+    apart from its footer, about 50 kB of row group metadata per batch). With
+    flatten, breakdowns become one amount column per component; CSV and Parquet
+    need the column set up front, which costs an extra pass over the breakdowns.
+    """
+
+    def __init__(
+        self,
+        format: str = "csv",
+        flatten: bool = False,
+        project_type: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        batch_size: Optional[int] = None
+    ):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format '{format}'; use {', '.join(FORMATS)}")
+        if format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError("Parquet export needs pyarrow installed")
+        self.format = format
+        self.flatten = flatten
+        self.project_type = project_type
+        self.date_from = date_from
+        self.date_to = date_to
+        self.batch_size = batch_size or settings.EXPORT_DATA_BATCH_SIZE
+        self.rows = 0
+        self.bytes = 0
+
+    @property
+    def media_type(self) -> str:
+        return FORMATS[self.format][0]
+
+    @property
+    def filename(self) -> str:
+        suffix = f"_{self.project_type}" if self.project_type else ""
+        return f"saved_projects{suffix}.{FORMATS[self.format][1]}"
+
+    def _filtered(self, stmt):
+        if self.project_type:
+            stmt = stmt.where(SavedProject.project_type == self.project_type)
+        if self.date_from:
+            stmt = stmt.where(SavedProject.created_at >= datetime.combine(self.date_from, time.min))
+        if self.date_to:
+            stmt = stmt.where(SavedProject.created_at <= datetime.combine(self.date_to, time.max))
+        return stmt.order_by(SavedProject.id).execution_options(yield_per=self.batch_size)
+
+    def _batches(self, db: Session) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Export rows, one list per cursor batch. input_json, and breakdown_json
+        unless flattening, are JSON text: stored JSON is passed through as read
+        rather than parsed and re-serialized, and only compact rows are decoded.
+        """
+        breakdown = SavedProject.breakdown_json if self.flatten else cast(SavedProject.breakdown_json, Text)
+        stmt = self._filtered(select(
+            *[getattr(SavedProject, name) for name in COLUMNS],
+            cast(SavedProject.input_json, Text).label("input_json"),
+            breakdown.label("breakdown_json"), SavedProject.breakdown_blob
+        ))
+        for partition in db.execute(stmt).partitions():
+            rows = []
+            for row in partition:
+                record = {name: getattr(row, name) for name in COLUMNS}
+                record["input_json"] = row.input_json or "null"
+                if self.flatten:
+                    record["breakdown_json"] = BreakdownStorage.materialize(db, row.breakdown_json, row.breakdown_blob, row.total_cost)
+                elif row.breakdown_blob is not None:
+                    record["breakdown_json"] = json.dumps(BreakdownStorage.decode(db.get_bind(), row.breakdown_blob, row.total_cost))
+                else:
+                    record["breakdown_json"] = row.breakdown_json or "null"
+                rows.append(record)
+            yield rows
+
+    def components(self, db: Session) -> List[str]:
+        """
+        Every breakdown component in the export, in first-seen order.
+        """
+        seen = {}
+        stmt = self._filtered(select(SavedProject.total_cost, SavedProject.breakdown_json, SavedProject.breakdown_blob))
+        for total_cost, breakdown, blob in db.execute(stmt):
+            for component in component_amounts(BreakdownStorage.materialize(db, breakdown, blob, total_cost)):
+                seen.setdefault(component, None)
+        return list(seen)
+
+    def stream(self) -> Iterator[bytes]:
+        db = SessionLocal()
+        try:
+            components = self.components(db) if self.flatten and self.format != "ndjson" else None
+            writer = {"csv": self._csv, "ndjson": self._ndjson, "parquet": self._parquet}[self.format]
+            for chunk in writer(db, components):
+                self.bytes += len(chunk)
+                yield chunk
+        finally:
+            db.close()
+
+    def _flattened(self, record: Dict[str, Any], components: Optional[List[str]]) -> Dict[str, Any]:
+        amounts = component_amounts(record.pop("breakdown_json"))
+        for component in components if components is not None else amounts:
+            record[COMPONENT_PREFIX + component] = amounts.get(component)
+        return record
+
+    def _csv(self, db: Session, components: Optional[List[str]]) -> Iterator[bytes]:
+        header = list(COLUMNS) + ["input_json"]
+        header += [COMPONENT_PREFIX + component for component in components] if self.flatten else ["breakdown_json"]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for rows in self._batches(db):
+            for record in rows:
+                record["created_at"] = record["created_at"].isoformat() if record["created_at"] else None
+                if self.flatten:
+                    record = self._flattened(record, components)
+                writer.writerow(record.values())
+            self.rows += len(rows)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if self.rows == 0:
+            yield buffer.getvalue().encode()
+
+    def _ndjson(self, db: Session, components: Optional[List[str]]) -> Iterator[bytes]:
+        for rows in self._batches(db):
+            lines = []
+            for record in rows:
+                if self.flatten:
+                    record = self._flattened(record, None)
+                documents = [(name, record.pop(name)) for name in ("input_json", "breakdown_json") if name in record]
+                # The JSON-text columns are spliced in as they are
+                line = json.dumps(record, default=lambda value: value.isoformat())[:-1]
+                for name, document in documents:
+                    line += f', "{name}": {document}'
+                lines.append(line + "}")
+            self.rows += len(rows)
+            yield ("\n".join(lines) + "\n").encode()
+
+    def _parquet(self, db: Session, components: Optional[List[str]]) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        fields = [
+            ("id", pa.int64()), ("user_id", pa.string()), ("project_type", pa.string()),
+            ("created_at", pa.timestamp("us", tz="UTC")), ("total_cost", pa.float64()),
+            ("rate_card_version", pa.string()), ("pdf_path", pa.string()), ("input_json", pa.string())
+        ]
+        if self.flatten:
+            fields += [(COMPONENT_PREFIX + component, pa.float64()) for component in components]
+        else:
+            fields.append(("breakdown_json", pa.string()))
+        schema = pa.schema(fields)
+
+        sink = ZipChunks()
+        # One row group per cursor batch, drained as soon as it is written
+        with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+            for rows in self._batches(db):
+                columns = defaultdict(list)
+                for record in rows:
+                    created_at = record["created_at"]
+                    if created_at is not None and created_at.tzinfo is None:
+                        # SQLite hands back UTC timestamps without a zone
+                        created_at = created_at.replace(tzinfo=timezone.utc)
+                    record["created_at"] = created_at
+                    if self.flatten:
+                        record = self._flattened(record, components)
+                    for name, value in record.items():
+                        columns[name].append(value)
+                writer.write_batch(pa.record_batch([columns[name] for name, _ in fields], schema=schema))
+                self.rows += len(rows)
+                yield sink.drain()
+        yield sink.drain()
@@ -0,0 +1,127 @@
+import base64
+import json
+from datetime import datetime, time
+from typing import Any, Dict, List, Sequence
+from sqlalchemy import Select, String, func, literal, select, tuple_, type_coerce
+from sqlalchemy.orm import Session
+from app.models.saved_project import SavedProject
+from app.schemas.archive_schema import ArchiveQuery
+from app.services.breakdown_storage import BreakdownStorage
+
+# Keyset columns per sort; each ends in id so the key is unique
+SORT_KEYS = {
+    "created_at": ("created_at", "id"),
+    "total_cost": ("total_cost", "id"),
+    "project_type": ("project_type", "created_at", "id")
+}
+
+# Summary field -> input_json keys it is read from, first one present wins
+SUMMARY_FIELDS = {
+    "client_name": ("client_name",),
+    "floor": ("floor",),
+    "zone": ("zone",),
+    "grade": ("structural_style", "upgrade_level", "style")
+}
+
+FULL_COLUMNS = ("user_id", "input_json", "breakdown_json", "pdf_path")
+# Selected for "full" pages and folded back into breakdown_json (see BreakdownStorage)
+COMPACT_COLUMNS = ("breakdown_blob",)
+
+
+class ProjectListing:
+    """
+    Keyset-paginated archive listing. Pages are ordered on a unique key ending in
+    id and continue from an opaque cursor holding the last row's key, so each page
+    is one index range scan of `limit` rows however deep it is.
+    """
+
+    @staticmethod
+    def key_columns(sort: str, dialect: str) -> List[Any]:
+        columns = []
+        for name in SORT_KEYS[sort]:
+            column = getattr(SavedProject, name)
+            if name == "created_at" and dialect == "sqlite":
+                # SQLite keeps datetimes as text and compares them as text; the
+                # cursor has to carry the stored string, not a re-formatted datetime
+                column = type_coerce(column, String)
+            columns.append(column)
+        return columns
+
+    @staticmethod
+    def summary_column(name: str):
+        values = [SavedProject.input_json[source].as_string() for source in SUMMARY_FIELDS[name]]
+        return (func.coalesce(*values) if len(values) > 1 else values[0]).label(name)
+
+    @staticmethod
+    def summary_value(input_json: Any, name: str) -> Any:
+        # summary_column evaluated on an input_json dict
+        values = [input_json.get(source) for source in SUMMARY_FIELDS[name]] if isinstance(input_json, dict) else []
+        return next((value for value in values if value is not None), None)
+
+    @staticmethod
+    def statement(query: ArchiveQuery, dialect: str) -> Select:
+        keys = ProjectListing.key_columns(query.sort, dialect)
+        columns = [SavedProject.id, SavedProject.project_type, SavedProject.total_cost, SavedProject.created_at]
+        columns += [ProjectListing.summary_column(name) for name in SUMMARY_FIELDS]
+        if query.fields == "full":
+            columns += [getattr(SavedProject, name) for name in FULL_COLUMNS + COMPACT_COLUMNS]
+        columns += [key.label(f"key_{i}") for i, key in enumerate(keys)]
+        stmt = select(*columns)
+
+        if query.project_type:
+            stmt = stmt.where(SavedProject.project_type == query.project_type)
+        if query.user_id:
+            stmt = stmt.where(SavedProject.user_id == query.user_id)
+        if query.min_cost is not None:
+            stmt = stmt.where(SavedProject.total_cost >= query.min_cost)
+        if query.max_cost is not None:
+            stmt = stmt.where(SavedProject.total_cost <= query.max_cost)
+        if query.date_from:
+            stmt = stmt.where(SavedProject.created_at >= datetime.combine(query.date_from, time.min))
+        if query.date_to:
+            stmt = stmt.where(SavedProject.created_at <= datetime.combine(query.date_to, time.max))
+
+        descending = query.order == "desc"
+        if query.cursor:
+            values = ProjectListing.decode_cursor(query.cursor, query.sort, query.order, dialect)
+            last = tuple_(*[literal(value, key.type) for key, value in zip(keys, values)])
+            stmt = stmt.where(tuple_(*keys) < last if descending else tuple_(*keys) > last)
+        return stmt.order_by(*[key.desc() if descending else key.asc() for key in keys]).limit(query.limit + 1)
+
+    @staticmethod
+    def page(db: Session, rows: Sequence[Any], query: ArchiveQuery) -> Dict[str, Any]:
+        # One extra row was fetched to tell whether another page exists
+        items = []
+        for row in rows[:query.limit]:
+            item = {name: value for name, value in row._mapping.items() if not name.startswith("key_")}
+            if query.fields == "full":
+                item["breakdown_json"] = BreakdownStorage.materialize(
+                    db, item["breakdown_json"], item.pop("breakdown_blob"), item["total_cost"]
+                )
+            items.append(item)
+        next_cursor = None
+        if len(rows) > query.limit:
+            last = rows[query.limit - 1]._mapping
+            key = [last[f"key_{i}"] for i in range(len(SORT_KEYS[query.sort]))]
+            next_cursor = ProjectListing.encode_cursor(key, query.sort, query.order)
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def encode_cursor(key: List[Any], sort: str, order: str) -> str:
+        payload = json.dumps([sort, order, key], separators=(",", ":"), default=lambda v: v.isoformat())
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str, sort: str, order: str, dialect: str) -> List[Any]:
+        try:
+            cursor_sort, cursor_order, key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        if (cursor_sort, cursor_order) != (sort, order) or len(key) != len(SORT_KEYS[sort]):
+            raise ValueError("Cursor does not match the requested sort order")
+        if dialect != "sqlite":
+            key = [
+                datetime.fromisoformat(value) if name == "created_at" else value
+                for name, value in zip(SORT_KEYS[sort], key)
+            ]
+        return key
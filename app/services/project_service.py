@@ -1,46 +1,204 @@
+from typing import Any, Dict, List, Tuple
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.saved_project import SavedProject
-from app.services.pdf_service import PDFService
-import uuid
+from app.models.report_job import ReportJob
+from app.models.estimation import Estimation
+from app.services.report_queue import report_queue
+from app.services.report_store import ReportStore
+from app.services.blob_store import externalize_signatures
+from app.services.breakdown_storage import BreakdownStorage
+from app.services.cost_rollup_service import CostRollups
+from app.services.project_listing_service import ProjectListing
+from app.schemas.archive_schema import ArchiveQuery
+from app.core.config import settings
+
+class BulkSaveError(Exception):
+    """
+    A save_projects chunk failed. The chunks before it are committed: project_ids
+    are theirs (the first failed_at rows of the request, in order).
+    """
+
+    def __init__(self, project_ids: List[int], failed_at: int, error: Exception):
+        super().__init__(str(error))
+        self.project_ids = project_ids
+        self.failed_at = failed_at
+
 
 class ProjectService:
     @staticmethod
     def save_project(db: Session, project_type: str, input_json: dict, total_cost: float, breakdown_json: dict):
-        # Generate PDF
-        filename = f"report_{uuid.uuid4().hex}.pdf"
-        project_data = {
-            "project_type": project_type,
-            "input_json": input_json,
-            "total_cost": total_cost,
-            "breakdown_json": breakdown_json
-        }
-        pdf_path = PDFService.generate_project_report(project_data, filename)
-        
+        db_project = ProjectService.insert_project(db, project_type, input_json, total_cost, breakdown_json)
+        # The PDF is rendered on first download unless REPORT_RENDER_ON_SAVE queues it now
+        if settings.REPORT_RENDER_ON_SAVE:
+            ProjectService.request_report(db, db_project)
+        return db_project
+
+    @staticmethod
+    def insert_project(db: Session, project_type: str, input_json: dict, total_cost: float, breakdown_json: dict):
+        """
+        Inserts and commits the project row with its rollup entry. Shared with
+        AsyncProjectService, which runs it through AsyncSession.run_sync.
+        """
         db_project = SavedProject(
             project_type=project_type,
-            input_json=input_json,
+            # Signature images live in the blob store; the row keeps a reference
+            input_json=externalize_signatures(input_json),
             total_cost=total_cost,
-            breakdown_json=breakdown_json,
-            pdf_path=pdf_path
+            pdf_path=None,
+            **BreakdownStorage.storage_columns(db, breakdown_json, total_cost)
         )
         db.add(db_project)
+        db.flush()
+        CostRollups.apply(db, [CostRollups.entry(db_project)])
         db.commit()
         db.refresh(db_project)
         return db_project
 
+    @staticmethod
+    def bulk_rows(db: Session, projects: List[Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "project_type": project.project_type,
+                "user_id": project.user_id,
+                "input_json": externalize_signatures(project.input_json),
+                "total_cost": project.total_cost,
+                "pdf_path": None,
+                **BreakdownStorage.storage_columns(db, project.breakdown_json, project.total_cost)
+            }
+            for project in projects
+        ]
+
+    @staticmethod
+    def bulk_insert_statement():
+        # Multi-row INSERT .. RETURNING per chunk; ids come back in parameter order
+        return insert(SavedProject).returning(SavedProject.id, SavedProject.created_at, sort_by_parameter_order=True)
+
+    @staticmethod
+    def bulk_rollup_entries(rows: List[Dict[str, Any]], inserted: List[Any]) -> List[Any]:
+        return [
+            (row["project_type"], saved.created_at, ProjectListing.summary_value(row["input_json"], "grade"), row["total_cost"])
+            for row, saved in zip(rows, inserted)
+        ]
+
+    @staticmethod
+    def save_projects(db: Session, projects: List[Any], chunk_size: int = None) -> List[int]:
+        """
+        Inserts many ProjectSaveRequests, one transaction per chunk, and returns
+        their ids in request order. Reports are not queued; they render on first
+        download or export like any other unrendered project. If a chunk fails,
+        raises BulkSaveError with the ids of the chunks already committed, so a
+        client can retry from failed_at without saving those rows twice.
+        """
+        chunk_size = chunk_size or settings.PROJECT_BULK_SAVE_CHUNK_SIZE
+        ids = []
+        for start in range(0, len(projects), chunk_size):
+            try:
+                rows = ProjectService.bulk_rows(db, projects[start:start + chunk_size])
+                inserted = db.execute(ProjectService.bulk_insert_statement(), rows).all()
+                CostRollups.apply(db, ProjectService.bulk_rollup_entries(rows, inserted))
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                raise BulkSaveError(ids, start, e) from e
+            ids += [saved.id for saved in inserted]
+        return ids
+
+    @staticmethod
+    def request_report(db: Session, project: SavedProject):
+        """
+        Queues a render of the project's report unless one is already pending or
+        running. A finished job is re-run when its file was evicted, a failed one
+        starts over with fresh attempts.
+        """
+        job, queue = ProjectService.prepare_report_job(db, project)
+        if queue:
+            report_queue.enqueue(job.id, project.id)
+            db.refresh(job)
+        return job
+
+    @staticmethod
+    def prepare_report_job(db: Session, project: SavedProject) -> Tuple[ReportJob, bool]:
+        """
+        The project's report job, reset to pending and committed if it has to be
+        (re)queued, and whether it does.
+        """
+        job = ProjectService.get_report_job(db, project.id)
+        if job is not None and job.status in ("pending", "running"):
+            return job, False
+        if job is None:
+            job = ReportJob(project_id=project.id)
+            db.add(job)
+        job.status = "pending"
+        job.attempts = 0
+        db.commit()
+        return job, True
+
     @staticmethod
     def get_project(db: Session, project_id: int):
         return db.query(SavedProject).filter(SavedProject.id == project_id).first()
 
+    @staticmethod
+    def get_project_version(db: Session, project_id: int):
+        return db.query(SavedProject.version).filter(SavedProject.id == project_id).scalar()
+
+    @staticmethod
+    def get_report_job(db: Session, project_id: int):
+        return (
+            db.query(ReportJob)
+            .filter(ReportJob.project_id == project_id)
+            .order_by(ReportJob.id.desc())
+            .first()
+        )
+
+    @staticmethod
+    def get_estimations(db: Session, project_id: int) -> List[Dict[str, Any]]:
+        # Re-priced versions of a saved project, oldest first
+        rows = (
+            db.query(
+                Estimation.id, Estimation.run_id, Estimation.rate_card_version, Estimation.total_cost,
+                Estimation.previous_total_cost, Estimation.breakdown_json, Estimation.breakdown_blob, Estimation.created_at
+            )
+            .filter(Estimation.project_id == project_id)
+            .order_by(Estimation.id)
+            .all()
+        )
+        return [
+            {
+                "id": row.id, "project_id": project_id, "run_id": row.run_id, "rate_card_version": row.rate_card_version,
+                "total_cost": row.total_cost, "previous_total_cost": row.previous_total_cost,
+                "breakdown_json": BreakdownStorage.materialize(db, row.breakdown_json, row.breakdown_blob, row.total_cost),
+                "created_at": row.created_at
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def report_status(db: Session, project_id: int) -> str:
+        job = ProjectService.get_report_job(db, project_id)
+        return job.status if job else "not_rendered"
+
     @staticmethod
     def get_all_projects(db: Session, skip: int = 0, limit: int = 100):
         return db.query(SavedProject).order_by(SavedProject.created_at.desc()).offset(skip).limit(limit).all()
 
+    @staticmethod
+    def list_archive(db: Session, query: ArchiveQuery):
+        stmt = ProjectListing.statement(query, db.get_bind().dialect.name)
+        return ProjectListing.page(db, db.execute(stmt).all(), query)
+
     @staticmethod
     def delete_project(db: Session, project_id: int):
         project = db.query(SavedProject).filter(SavedProject.id == project_id).first()
         if project:
-            db.delete(project)
+            pdf_path = project.pdf_path
+            db.query(ReportJob).filter(ReportJob.project_id == project_id).delete()
+            db.query(Estimation).filter(Estimation.project_id == project_id).delete()
+            # Only the request that actually removes the row takes it out of the rollups
+            if db.query(SavedProject).filter(SavedProject.id == project_id).delete():
+                CostRollups.apply(db, [CostRollups.entry(project)], sign=-1)
             db.commit()
+            # Shared content-addressed file; only removed with its last reference
+            ReportStore.release(db, pdf_path)
             return True
         return False
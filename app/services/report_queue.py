@@ -0,0 +1,166 @@
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+from sqlalchemy import or_, update
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.report_job import ReportJob
+from app.models.saved_project import SavedProject
+from app.services.report_store import ReportStore
+
+
+class ReportQueue:
+    """
+    In-process PDF rendering queue backed by the report_jobs table.
+
+    A pending job (queued on first download, or on save with REPORT_RENDER_ON_SAVE)
+    is picked up by a worker pool that renders the report into the ReportStore,
+    sets the project's pdf_path and marks the job done. Failed renders are retried with
+    exponential backoff up to REPORT_MAX_ATTEMPTS. Jobs are claimed with a
+    conditional UPDATE, so a job is rendered once even if several processes
+    requeue the same pending rows on startup.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._finished: Dict[int, threading.Event] = {}
+        self._retries: Dict[int, threading.Timer] = {}
+        self._lock = threading.Lock()
+
+    def enqueue(self, job_id: int, project_id: int) -> None:
+        with self._lock:
+            self._finished.setdefault(project_id, threading.Event())
+        if self.workers <= 0:
+            self.run(job_id, project_id)
+            return
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report")
+        self._executor.submit(self.run, job_id, project_id)
+
+    def run(self, job_id: int, project_id: int) -> None:
+        db = SessionLocal()
+        try:
+            claimed = db.execute(
+                update(ReportJob)
+                .where(ReportJob.id == job_id, ReportJob.status == "pending")
+                .values(status="running", attempts=ReportJob.attempts + 1)
+            ).rowcount
+            db.commit()
+            if not claimed:
+                # Done, or owned by another process: nothing for this one to wait on
+                self._finish(project_id)
+                return
+
+            job = db.get(ReportJob, job_id)
+            project = db.get(SavedProject, job.project_id)
+            if project is None:
+                # Project deleted while queued
+                project_id = job.project_id
+                db.delete(job)
+                db.commit()
+                self._finish(project_id)
+                return
+
+            try:
+                project_data = {
+                    "project_type": project.project_type,
+                    "input_json": project.input_json,
+                    "total_cost": project.total_cost,
+                    "breakdown_json": project.breakdown_json
+                }
+                pdf_path = ReportStore.ensure(project_data)
+                ReportStore.attach(db, project.id, pdf_path)
+                job.status = "done"
+                job.last_error = None
+                db.commit()
+                self._finish(job.project_id)
+            except Exception as e:
+                db.rollback()
+                job = db.get(ReportJob, job_id)
+                job.last_error = "".join(traceback.format_exception_only(type(e), e)).strip()
+                retry = job.attempts < settings.REPORT_MAX_ATTEMPTS
+                job.status = "pending" if retry else "failed"
+                db.commit()
+                if retry:
+                    delay = settings.REPORT_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+                    self._retry_later(delay, job_id, job.project_id)
+                else:
+                    self._finish(job.project_id)
+                return
+            # Keep REPORTS_DIR within its bounds now that it may have grown
+            ReportStore.evict(db, keep=pdf_path)
+        finally:
+            db.close()
+
+    def wait(self, project_id: int, timeout: float) -> bool:
+        """
+        Blocks until the project's queued report finishes (done or finally failed)
+        or timeout expires. Only sees jobs queued by this process.
+        """
+        with self._lock:
+            finished = self._finished.get(project_id)
+        return finished.wait(timeout) if finished is not None else False
+
+    def requeue_pending(self) -> int:
+        """
+        Resubmits pending jobs, and running ones a dead process left behind. A job
+        is only taken back from "running" once it has not been updated for
+        REPORT_STALE_RUNNING_SECONDS (renders take well under a second), so jobs
+        another live process (another uvicorn worker, or the old one during a
+        rolling restart) is rendering right now are left to it.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.REPORT_STALE_RUNNING_SECONDS)
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(ReportJob)
+                .where(ReportJob.status == "running", or_(ReportJob.updated_at < cutoff, ReportJob.updated_at.is_(None)))
+                .values(status="pending")
+            )
+            db.commit()
+            jobs = db.query(ReportJob.id, ReportJob.project_id).filter(ReportJob.status == "pending").all()
+        finally:
+            db.close()
+        for job_id, project_id in jobs:
+            self.enqueue(job_id, project_id)
+        return len(jobs)
+
+    def shutdown(self) -> None:
+        # Unstarted jobs and scheduled retries stay pending in the table and are
+        # requeued on next startup
+        with self._lock:
+            retries = list(self._retries.values())
+            self._retries.clear()
+        for timer in retries:
+            timer.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def _retry_later(self, delay: float, job_id: int, project_id: int) -> None:
+        timer = threading.Timer(delay, self._retry, args=(job_id, project_id))
+        timer.daemon = True
+        with self._lock:
+            self._retries[job_id] = timer
+        timer.start()
+
+    def _retry(self, job_id: int, project_id: int) -> None:
+        with self._lock:
+            # Gone if shutdown() cancelled it after the timer had already fired
+            if self._retries.pop(job_id, None) is None:
+                return
+        self.enqueue(job_id, project_id)
+
+    def _finish(self, project_id: int) -> None:
+        with self._lock:
+            finished = self._finished.pop(project_id, None)
+        if finished is not None:
+            finished.set()
+
+
+report_queue = ReportQueue(settings.REPORT_QUEUE_WORKERS)
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.saved_project import SavedProject
+from app.services.pdf_service import PDFService
+from app.services.single_flight import report_flights
+
+TEMPLATE_SOURCES = [Path(__file__).with_name("pdf_service.py")]
+
+
+def template_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for path in TEMPLATE_SOURCES:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ReportStore:
+    """
+    Content-addressed PDF reports in REPORTS_DIR.
+
+    A report is named report_<sha256>.pdf after the inputs it renders (project type,
+    inputs, total, breakdown and the template source), so identical projects share
+    one file and a report is only rendered the first time it is downloaded. Files
+    are bounded by REPORT_CACHE_MAX_BYTES / REPORT_CACHE_MAX_AGE_SECONDS; files no
+    project references are evicted first, and an evicted file a project still points
+    at is simply re-rendered on its next download.
+    """
+    _evict_lock = threading.Lock()
+
+    @staticmethod
+    def content_key(project_data: Dict[str, Any]) -> str:
+        canonical = json.dumps(
+            {
+                "template": template_fingerprint(),
+                "project_type": project_data["project_type"],
+                "input_json": project_data["input_json"],
+                "total_cost": project_data["total_cost"],
+                "breakdown_json": project_data["breakdown_json"]
+            },
+            sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    @staticmethod
+    def path_for(key: str) -> str:
+        return os.path.join(settings.REPORTS_DIR, f"report_{key}.pdf")
+
+    @staticmethod
+    def ensure(project_data: Dict[str, Any]) -> str:
+        """
+        Path of the report for project_data, rendering it if no identical report exists.
+        """
+        return ReportStore.lookup(project_data) or ReportStore.store(project_data, ReportStore.render(project_data))
+
+    @staticmethod
+    def lookup(project_data: Dict[str, Any]) -> Optional[str]:
+        """
+        Path of an already rendered report for project_data, or None.
+        """
+        path = ReportStore.path_for(ReportStore.content_key(project_data))
+        try:
+            # mtime doubles as last-access time for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    @staticmethod
+    def render(project_data: Dict[str, Any]) -> bytes:
+        """
+        Renders the report for project_data; concurrent renders of the same
+        content share one render.
+        """
+        pdf, _ = report_flights.do(ReportStore.content_key(project_data), lambda: PDFService.render_project_report(project_data))
+        return pdf
+
+    @staticmethod
+    def store(project_data: Dict[str, Any], pdf: bytes) -> str:
+        """
+        Writes already-rendered report bytes to the project's content-addressed path.
+        """
+        os.makedirs(settings.REPORTS_DIR, exist_ok=True)
+        path = ReportStore.path_for(ReportStore.content_key(project_data))
+        tmp_path = os.path.join(settings.REPORTS_DIR, f".tmp_{uuid.uuid4().hex}.pdf")
+        with open(tmp_path, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def attach(db: Session, project_id: int, path: str) -> bool:
+        """
+        Points the project at its report. A conditional query-level update, so
+        concurrent downloads of one project don't conflict on its version
+        counter; the version is bumped by hand only when the path changes.
+        """
+        return bool(
+            db.query(SavedProject)
+            .filter(SavedProject.id == project_id, or_(SavedProject.pdf_path.is_(None), SavedProject.pdf_path != path))
+            .update({"pdf_path": path, "version": SavedProject.version + 1}, synchronize_session=False)
+        )
+
+    @staticmethod
+    def release(db: Session, path: Optional[str]) -> bool:
+        """
+        Removes a report file once no saved project references it.
+        """
+        if not path or not os.path.basename(path).startswith("report_"):
+            return False
+        if db.query(SavedProject.id).filter(SavedProject.pdf_path == path).first() is not None:
+            return False
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def files() -> List[os.DirEntry]:
+        if not os.path.isdir(settings.REPORTS_DIR):
+            return []
+        return [
+            entry for entry in os.scandir(settings.REPORTS_DIR)
+            if entry.name.startswith("report_") and entry.name.endswith(".pdf") and entry.is_file()
+        ]
+
+    @staticmethod
+    def evict(db: Session, keep: Optional[str] = None) -> Dict[str, int]:
+        """
+        Drops reports older than the age bound, then least recently used reports
+        until the directory fits the size bound. Unreferenced files go first; keep
+        (a report about to be served) is never removed.
+        """
+        with ReportStore._evict_lock:
+            referenced = {
+                os.path.normpath(path) for (path,) in
+                db.query(SavedProject.pdf_path).filter(SavedProject.pdf_path.isnot(None)).distinct()
+            }
+            now = time.time()
+            entries = []
+            total = kept = 0
+            for entry in ReportStore.files():
+                stat = entry.stat()
+                total += stat.st_size
+                if keep and os.path.normpath(entry.path) == os.path.normpath(keep):
+                    kept += 1
+                    continue
+                entries.append((os.path.normpath(entry.path) in referenced, stat.st_mtime, stat.st_size, entry.path))
+
+            removed = freed = 0
+            max_age = settings.REPORT_CACHE_MAX_AGE_SECONDS
+            # Unreferenced first, then oldest first
+            for is_referenced, mtime, size, path in sorted(entries):
+                expired = max_age > 0 and now - mtime > max_age
+                if not expired and total - freed <= settings.REPORT_CACHE_MAX_BYTES:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                removed += 1
+                freed += size
+            return {"files": len(entries) + kept - removed, "bytes": total - freed, "removed": removed, "freed_bytes": freed}
+
+    @staticmethod
+    def stats(db: Session) -> Dict[str, Any]:
+        referenced = {
+            os.path.normpath(path) for (path,) in
+            db.query(SavedProject.pdf_path).filter(SavedProject.pdf_path.isnot(None)).distinct()
+        }
+        entries = ReportStore.files()
+        return {
+            "files": len(entries),
+            "bytes": sum(entry.stat().st_size for entry in entries),
+            "referenced_files": sum(os.path.normpath(entry.path) in referenced for entry in entries),
+            "max_bytes": settings.REPORT_CACHE_MAX_BYTES,
+            "max_age_seconds": settings.REPORT_CACHE_MAX_AGE_SECONDS,
+            "template": template_fingerprint()
+        }
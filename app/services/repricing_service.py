@@ -0,0 +1,195 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import exists, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.rate_card import rate_card_version
+from app.engines.registry import PROJECT_ENGINES
+from app.models.estimation import Estimation
+from app.models.repricing_run import RepricingRun
+from app.models.saved_project import SavedProject
+from app.services.breakdown_storage import BreakdownStorage
+
+# (project id, total_cost, breakdown, error) of one re-priced project
+Result = Tuple[int, Optional[float], Optional[List[Dict[str, Any]]], Optional[str]]
+
+
+def describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in error.errors())
+    if isinstance(error, HTTPException):
+        return str(error.detail)
+    return str(error)
+
+
+def reprice_chunk(projects: List[Tuple[int, str, Dict[str, Any]]]) -> List[Result]:
+    # Runs in a worker process, on the rate card the worker imported
+    results = []
+    for project_id, project_type, inputs in projects:
+        schema, engine = PROJECT_ENGINES[project_type]
+        try:
+            result = engine.estimate_cost(schema(**inputs).dict())
+        except Exception as e:
+            results.append((project_id, None, None, describe(e)))
+            continue
+        results.append((project_id, result["total_cost"], result["breakdown"], None))
+    return results
+
+
+class ProjectRepricer:
+    """
+    Re-prices saved projects on the current rate card.
+
+    Projects saved on an older rate card (or before rate cards were recorded)
+    are read in id order, REPRICE_CHUNK_SIZE at a time, and estimated by the
+    engines across a ProcessPoolExecutor. Each result is added to estimations
+    as a new version, leaving the saved project as it was saved. Chunks are
+    written in order, each in one transaction with the run's checkpoint
+    (last_project_id), so an interrupted run picks up where it stopped, and
+    projects that already have an estimation on this rate card are skipped.
+    """
+
+    def __init__(self, project_type: Optional[str] = None, workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        if project_type is not None and project_type not in PROJECT_ENGINES:
+            raise ValueError(f"Unknown project_type '{project_type}'; use {', '.join(PROJECT_ENGINES)}")
+        self.project_type = project_type
+        self.workers = workers or settings.REPRICE_WORKERS or os.cpu_count() or 1
+        self.chunk_size = chunk_size or settings.REPRICE_CHUNK_SIZE
+        self.version = rate_card_version()
+        self.run: Optional[RepricingRun] = None
+        self.resumed = False
+
+    def start(self, db: Session) -> RepricingRun:
+        """
+        The unfinished run for this rate card and project type, or a new one.
+        """
+        self.run = db.scalar(
+            select(RepricingRun)
+            .where(
+                RepricingRun.rate_card_version == self.version,
+                RepricingRun.status == "running",
+                RepricingRun.project_type.is_(None) if self.project_type is None else RepricingRun.project_type == self.project_type
+            )
+            .order_by(RepricingRun.id.desc())
+            .limit(1)
+        )
+        self.resumed = self.run is not None
+        if self.run is None:
+            self.run = RepricingRun(rate_card_version=self.version, project_type=self.project_type, last_project_id=0)
+            db.add(self.run)
+            db.commit()
+        return self.run
+
+    def _chunk(self, db: Session, after: int) -> List[Any]:
+        stmt = (
+            select(SavedProject.id, SavedProject.project_type, SavedProject.input_json, SavedProject.total_cost)
+            .where(
+                SavedProject.id > after,
+                or_(SavedProject.rate_card_version.is_(None), SavedProject.rate_card_version != self.version),
+                ~exists().where(Estimation.project_id == SavedProject.id, Estimation.rate_card_version == self.version)
+            )
+            .order_by(SavedProject.id)
+            .limit(self.chunk_size)
+        )
+        if self.project_type:
+            stmt = stmt.where(SavedProject.project_type == self.project_type)
+        return db.execute(stmt).all()
+
+    def reprice(self, db: Session) -> Iterator[Dict[str, Any]]:
+        """
+        Runs (or resumes) the job, yielding each project's delta as its chunk is committed.
+        """
+        run = self.run or self.start(db)
+        window = self.workers * 2
+        pending = deque()
+        after = run.last_project_id
+        exhausted = False
+        context = multiprocessing.get_context(settings.REPRICE_START_METHOD)
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                while True:
+                    while not exhausted and len(pending) < window:
+                        chunk = self._chunk(db, after)
+                        if not chunk:
+                            exhausted = True
+                            break
+                        after = chunk[-1].id
+                        pending.append((pool.submit(reprice_chunk, self._work(chunk)), chunk))
+                    if not pending:
+                        break
+                    future, chunk = pending.popleft()
+                    results = {result[0]: result for result in future.result()}
+                    yield from self._record(db, run, chunk, results)
+        except BaseException as e:
+            db.rollback()
+            run.last_error = describe(e) or type(e).__name__
+            db.commit()
+            raise
+        run.status = "completed"
+        db.commit()
+
+    @staticmethod
+    def _work(chunk: List[Any]) -> List[Tuple[int, str, Dict[str, Any]]]:
+        # Only the fields the engine's schema reads are sent to the workers
+        work = []
+        for project in chunk:
+            if project.project_type in PROJECT_ENGINES and isinstance(project.input_json, dict):
+                fields = PROJECT_ENGINES[project.project_type][0].model_fields
+                work.append((project.id, project.project_type, {key: value for key, value in project.input_json.items() if key in fields}))
+        return work
+
+    def _record(self, db: Session, run: RepricingRun, chunk: List[Any], results: Dict[int, Result]) -> List[Dict[str, Any]]:
+        rows = []
+        deltas = []
+        failed = changed = 0
+        previous_total = total = 0.0
+        for project in chunk:
+            delta = {
+                "project_id": project.id, "project_type": project.project_type,
+                "previous_total_cost": project.total_cost, "total_cost": None, "delta": None, "delta_pct": None, "error": None
+            }
+            result = results.get(project.id)
+            if result is None:
+                # Never sent to the workers (see _work)
+                total_cost = breakdown = None
+                error = f"Unknown project_type: {project.project_type}" if project.project_type not in PROJECT_ENGINES else "input_json is not an object"
+            else:
+                _, total_cost, breakdown, error = result
+            if error:
+                delta["error"] = error
+                failed += 1
+            else:
+                rows.append({
+                    "project_id": project.id,
+                    "run_id": run.id,
+                    "total_cost": total_cost,
+                    "previous_total_cost": project.total_cost,
+                    **BreakdownStorage.storage_columns(db, {"items": breakdown}, total_cost)
+                })
+                delta["total_cost"] = total_cost
+                if project.total_cost is not None:
+                    delta["delta"] = round(total_cost - project.total_cost, 2)
+                    delta["delta_pct"] = round(100 * (total_cost / project.total_cost - 1), 4) if project.total_cost else None
+                    previous_total += project.total_cost
+                    total += total_cost
+                    changed += total_cost != project.total_cost
+            deltas.append(delta)
+        if rows:
+            dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+            # A concurrent run may have written some of these versions already
+            stmt = dialect.insert(Estimation.__table__).on_conflict_do_nothing(index_elements=["project_id", "rate_card_version"])
+            db.execute(stmt, rows)
+        run.projects += len(chunk)
+        run.changed += changed
+        run.failed += failed
+        run.previous_total += previous_total
+        run.total += total
+        run.last_project_id = chunk[-1].id
+        db.commit()
+        return deltas
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight computation.
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    while it runs wait for its result instead of repeating the work. Nothing is
+    kept once the call finishes, errors included, so this only deduplicates
+    overlapping calls and leaves caching to the caller. Waiters give up after
+    timeout seconds; a waiter that times out or is cancelled (client gone) only
+    stops waiting, and the computation still completes for everyone else.
+    """
+
+    def __init__(self, name: str, timeout: Optional[float] = None):
+        self.name = name
+        self.timeout = timeout
+        self._calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._tasks = set()
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.cancelled = 0
+
+    def do(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Returns (fn() result, shared). shared is False for the caller that ran fn;
+        the others received the same object and must not mutate it.
+        """
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, fn)
+        return self._result(future, timeout, leader), not leader
+
+    async def do_async(self, key: str, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        do() for async callers: the blocking fn runs in the threadpool and waiting
+        does not hold a thread, so any number of requests can wait on one call.
+        """
+        future, leader = self._join(key)
+        if leader:
+            # Runs to completion even if this request is cancelled
+            task = asyncio.ensure_future(run_in_threadpool(self._run, key, future, fn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self._timeout(timeout))
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            raise TimeoutError(f"{self.name}: gave up waiting for in-flight call after {self._timeout(timeout)}s")
+        except asyncio.CancelledError:
+            self._count("cancelled")
+            raise
+        return result, not leader
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "calls": self.calls,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "cancelled": self.cancelled,
+                "coalesced_ratio": round(self.coalesced / self.calls, 4) if self.calls else 0.0
+            }
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            self.calls += 1
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = self._calls[key] = Future()
+            self.executions += 1
+            return future, True
+
+    def _run(self, key: str, future: Future, fn: Callable[[], Any]) -> None:
+        try:
+            result = fn()
+        except BaseException as e:
+            self._count("errors")
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            # Later callers start a new call instead of reading a finished one
+            with self._lock:
+                if self._calls.get(key) is future:
+                    del self._calls[key]
+
+    def _result(self, future: Future, timeout: Optional[float], leader: bool) -> Any:
+        if leader:
+            # Already finished; the leader never waits
+            return future.result()
+        try:
+            return future.result(self._timeout(timeout))
+        except FutureTimeoutError:
+            self._count("timeouts")
+            raise TimeoutError(f"{self.name}: gave up waiting for in-flight call after {self._timeout(timeout)}s")
+
+    def _timeout(self, timeout: Optional[float]) -> Optional[float]:
+        timeout = self.timeout if timeout is None else timeout
+        return timeout if timeout and timeout > 0 else None
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+estimate_flights = SingleFlight("estimates", settings.SINGLE_FLIGHT_ESTIMATE_TIMEOUT_SECONDS)
+report_flights = SingleFlight("reports", settings.SINGLE_FLIGHT_REPORT_TIMEOUT_SECONDS)
@@ -0,0 +1,77 @@
+"""
+Report export throughput from 1 to N render processes.
+
+    python -m benchmarks.archive_export [--projects 200] [--workers 1 2 4]
+
+Uses a throwaway SQLite database and reports directory; every run starts with no
+rendered reports, so each project is rendered once per run.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+WORKDIR = tempfile.mkdtemp(prefix="archive_export_")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{WORKDIR}/bench.db"
+os.environ["REPORTS_DIR"] = os.path.join(WORKDIR, "reports")
+
+from app.core.config import settings  # noqa: E402
+from app.database.base import Base  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.engines.own_house_engine import OwnHouseEngine  # noqa: E402
+from app.models.saved_project import SavedProject  # noqa: E402
+from app.services.archive_export_service import ArchiveExporter  # noqa: E402
+
+
+def seed(projects: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    for i in range(projects):
+        inputs = {
+            "floor": ["G+1", "G+2", "G+3"][i % 3], "bedrooms": 3 + i % 3, "structural_style": "Premium",
+            "dimensions": "40x50", "interior_package": "semi", "client_name": f"Client {i}"
+        }
+        result = OwnHouseEngine.estimate_cost(dict(inputs))
+        db.add(SavedProject(
+            project_type="own_house", input_json=inputs, total_cost=result["total_cost"],
+            breakdown_json={"items": result["breakdown"]}
+        ))
+    db.commit()
+    db.close()
+
+
+def reset():
+    shutil.rmtree(settings.REPORTS_DIR, ignore_errors=True)
+    os.makedirs(settings.REPORTS_DIR)
+    db = SessionLocal()
+    db.query(SavedProject).update({"pdf_path": None})
+    db.commit()
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    seed(args.projects)
+    print(f"{args.projects} projects, {os.cpu_count()} cores")
+    baseline = None
+    for workers in args.workers:
+        reset()
+        exporter = ArchiveExporter(workers=workers)
+        start = time.perf_counter()
+        for _ in exporter.stream():
+            pass
+        elapsed = time.perf_counter() - start
+        pages_per_s = exporter.pages / elapsed
+        baseline = baseline or pages_per_s
+        print(f"workers {workers:2d}  {exporter.projects / elapsed:7.1f} reports/s  "
+              f"{pages_per_s:7.1f} pages/s  x{pages_per_s / baseline:.2f}  ({exporter.bytes / 1e6:.1f} MB zip)")
+    shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Sync (threadpool) vs async (AsyncSession) database path under concurrent load.
+
+    python -m benchmarks.async_db [--concurrency 8 64 256] [--seconds 5] [--projects 500]
+
+Each mode runs the app under uvicorn on a fresh copy of the same seeded SQLite
+database and is driven by concurrent clients issuing a mix of
+GET /projects/{id} (60%), GET /projects?limit=20 (20%) and POST /own-house/save (20%).
+"""
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+API = "/api/v1"
+OWN_HOUSE = {"floor": "G+2", "bedrooms": 4, "structural_style": "Premium", "dimensions": "40x50", "interior_package": "semi"}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workdir: str, database: str, async_db: bool) -> tuple:
+    port = free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.getcwd(),
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{database}",
+        DATABASE_ASYNC=str(async_db).lower(),
+        DATABASE_MIGRATE_ON_STARTUP="true"
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        cwd=workdir, env=env
+    )
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(200):
+        try:
+            httpx.get(url + "/")
+            return server, url
+        except httpx.TransportError:
+            time.sleep(0.05)
+    server.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def seed(url: str, projects: int) -> None:
+    async with httpx.AsyncClient(base_url=url) as client:
+        for _ in range(projects):
+            (await client.post(f"{API}/own-house/save", json=OWN_HOUSE)).raise_for_status()
+
+
+async def drive(url: str, concurrency: int, seconds: float, projects: int) -> dict:
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def user(client: httpx.AsyncClient, rng: random.Random):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            roll = rng.random()
+            start = time.perf_counter()
+            try:
+                if roll < 0.6:
+                    response = await client.get(f"{API}/projects/{rng.randint(1, projects)}")
+                elif roll < 0.8:
+                    response = await client.get(f"{API}/projects/", params={"limit": 20})
+                else:
+                    response = await client.post(f"{API}/own-house/save", json=OWN_HOUSE)
+                errors += response.status_code >= 400
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(user(client, random.Random(i)) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1e3,
+        "p99": latencies[int(len(latencies) * 0.99)] * 1e3,
+        "errors": errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[8, 64, 256])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--projects", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="async_db_")
+    seeded = os.path.join(workdir, "seed.db")
+    server, url = start_server(workdir, seeded, async_db=False)
+    try:
+        asyncio.run(seed(url, args.projects))
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"{args.projects} seeded projects, {os.cpu_count()} cores, {args.seconds:.0f}s per run")
+    for async_db in (False, True):
+        for concurrency in args.concurrency:
+            database = os.path.join(workdir, "bench.db")
+            shutil.copyfile(seeded, database)
+            server, url = start_server(workdir, database, async_db)
+            try:
+                result = asyncio.run(drive(url, concurrency, args.seconds, args.projects))
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{'async' if async_db else 'sync ':5s}  concurrency {concurrency:4d}  {result['rps']:7.1f} req/s  "
+                  f"p50 {result['p50']:7.1f} ms  p99 {result['p99']:7.1f} ms  errors {result['errors']}")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
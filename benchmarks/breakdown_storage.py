@@ -0,0 +1,130 @@
+"""
+Saved-breakdown storage: verbose JSON vs the compact encoding (BREAKDOWN_STORAGE).
+
+    python -m benchmarks.breakdown_storage [--database URL] [--rows 20000]
+
+For each mode saves --rows own-house projects (a spread of configurations) with
+save_projects, then reports insert rate, stored breakdown bytes per row,
+database size (after VACUUM on SQLite), and the rate of loading every project
+through the ORM (which materializes compact rows) and of a full archive page.
+Every materialized breakdown is checked against what was saved.
+
+--database defaults to a throwaway SQLite file. Its saved_projects, report_jobs
+and breakdown_components tables are dropped and recreated, so point it at a
+scratch database.
+"""
+import argparse
+import itertools
+import os
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import String, cast, create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database.base import Base
+from app.engines.own_house_engine import OwnHouseEngine
+from app.models.breakdown_component import BreakdownComponent
+from app.models.report_job import ReportJob
+from app.models.saved_project import SavedProject
+from app.schemas.archive_schema import ArchiveQuery
+from app.schemas.project_save_schema import ProjectSaveRequest
+from app.services.breakdown_storage import breakdown_codebook
+from app.services.project_listing_service import ProjectListing
+from app.services.project_service import ProjectService
+
+
+def requests(rows: int):
+    configurations = []
+    for floor, bedrooms, style, dimensions, package in itertools.product(
+        ["G+1", "G+2", "G+3"], [3, 4, 5], ["Base", "Classic", "Premium", "Elite"],
+        ["30x40", "40x50", "40x60"], ["none", "base", "semi", "full_furnished"]
+    ):
+        inputs = {
+            "floor": floor, "bedrooms": bedrooms, "structural_style": style,
+            "dimensions": dimensions, "interior_package": package
+        }
+        result = OwnHouseEngine.estimate_cost(dict(inputs))
+        configurations.append((inputs, result))
+    return [
+        ProjectSaveRequest(
+            project_type="own_house",
+            input_json=dict(inputs, client_name=f"Client {i}"),
+            total_cost=result["total_cost"],
+            breakdown_json={"items": result["breakdown"]}
+        )
+        for i, (inputs, result) in zip(range(rows), itertools.cycle(configurations))
+    ]
+
+
+def database_bytes(engine) -> int:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        if engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("VACUUM")
+            return os.path.getsize(engine.url.database)
+        connection.exec_driver_sql("VACUUM FULL saved_projects")
+        return connection.execute(text("SELECT pg_total_relation_size('saved_projects')")).scalar()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database")
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="breakdown_storage_")
+    url = args.database or f"sqlite:///{workdir}/bench.db"
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    tables = [SavedProject.__table__, ReportJob.__table__, BreakdownComponent.__table__]
+    data = requests(args.rows)
+    expected = {i: project.breakdown_json for i, project in enumerate(data)}
+    print(f"{engine.dialect.name}, {args.rows} rows")
+
+    for mode in ("json", "compact"):
+        settings.BREAKDOWN_STORAGE = mode
+        Base.metadata.drop_all(bind=engine, tables=tables)
+        Base.metadata.create_all(bind=engine, tables=tables)
+        breakdown_codebook.clear()
+
+        db = Session()
+        start = time.perf_counter()
+        ids = ProjectService.save_projects(db, data)
+        insert_rate = args.rows / (time.perf_counter() - start)
+        column = SavedProject.breakdown_blob if mode == "compact" else cast(SavedProject.breakdown_json, String)
+        stored = db.execute(select(func.sum(func.length(column)))).scalar()
+        db.close()
+        size = database_bytes(engine)
+
+        breakdown_codebook.clear() # first load reads the codebook back, as a new process would
+        db = Session()
+        start = time.perf_counter()
+        projects = db.query(SavedProject).order_by(SavedProject.id).all()
+        load_rate = len(projects) / (time.perf_counter() - start)
+        for i, project in enumerate(projects):
+            assert project.id == ids[i] and project.breakdown_json == expected[i], f"row {project.id} differs"
+        db.close()
+
+        db = Session()
+        query = ArchiveQuery(fields="full", limit=100)
+        start = time.perf_counter()
+        pages = 0
+        while time.perf_counter() - start < 1.0:
+            page = ProjectListing.page(db, db.execute(ProjectListing.statement(query, engine.dialect.name)).all(), query)
+            pages += 1
+        page_ms = (time.perf_counter() - start) / pages * 1000
+        assert page["items"][0]["breakdown_json"] == expected[len(data) - 1]
+        db.close()
+
+        print(f"{mode:8s} insert {insert_rate:7.0f} rows/s  breakdown {stored / args.rows:6.0f} B/row  "
+              f"database {size / 1e6:6.1f} MB  ORM load {load_rate:7.0f} rows/s  full archive page {page_ms:5.1f} ms")
+
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Generates a mixed-project-type CSV for the bulk estimation CLI.
+
+    python -m benchmarks.bulk_estimate [--rows 1000000] [--path /tmp/bulk.csv]
+    python -m app.cli.bulk_estimate /tmp/bulk.csv -o /dev/null
+"""
+import argparse
+import csv
+import random
+
+COLUMNS = [
+    "project_type", "floor", "bedrooms", "structural_style", "dimensions", "zone", "lift_required",
+    "interior_package", "include_compound_wall", "include_rainwater_harvesting", "include_car_parking",
+    "upgrade_level", "include_interior", "total_sqft", "floors", "style", "include_waterproofing",
+    "include_gate", "include_elevation"
+]
+
+
+def random_row(rng: random.Random) -> dict:
+    project_type = rng.choice(["own_house", "own_house", "rental", "villa", "commercial", "interior", "exterior"])
+    zone = rng.choice("ABC")
+    if project_type == "own_house":
+        return {
+            "project_type": project_type, "floor": rng.choice(["G+1", "G+2", "G+3"]),
+            "bedrooms": rng.randint(1, 8), "structural_style": rng.choice(["Base", "Classic", "Premium", "Elite"]),
+            "dimensions": rng.choice(["30x40", "40x60", "60x40", "30x50"]), "zone": zone,
+            "interior_package": rng.choice(["none", "base", "semi", "full_furnished"]),
+            "include_compound_wall": rng.random() < 0.5, "include_car_parking": rng.random() < 0.5
+        }
+    if project_type == "rental":
+        return {"project_type": project_type, "floor": rng.choice(["G+1", "G+2", "G+3"]),
+                "upgrade_level": rng.choice(["Base", "Classic", "Premium"]), "zone": zone,
+                "include_interior": rng.random() < 0.5}
+    if project_type == "villa":
+        return {"project_type": project_type, "floor": rng.choice(["G+1", "G+2"]),
+                "upgrade_level": rng.choice(["Classic", "Premium", "Luxury"]), "zone": zone}
+    if project_type == "commercial":
+        return {"project_type": project_type, "total_sqft": rng.randint(1000, 20000),
+                "floors": rng.randint(1, 6), "zone": zone, "lift_required": rng.random() < 0.5}
+    if project_type == "interior":
+        return {"project_type": project_type, "total_sqft": rng.randint(500, 4000),
+                "style": rng.choice(["Base", "Semi", "Full", "Luxury"])}
+    return {"project_type": project_type, "include_gate": rng.random() < 0.5,
+            "include_elevation": rng.random() < 0.5}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--path", default="/tmp/bulk.csv")
+    args = parser.parse_args()
+
+    rng = random.Random(6)
+    with open(args.path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        for _ in range(args.rows):
+            writer.writerow(random_row(rng))
+    print(f"wrote {args.rows:,} rows to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
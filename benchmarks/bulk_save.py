@@ -0,0 +1,92 @@
+"""
+Project save throughput: one save_project per row vs chunked save_projects.
+
+    python -m benchmarks.bulk_save [--database URL] [--rows 20000] [--single-rows 1000]
+                                   [--chunk-size 500 1000 5000]
+
+--database defaults to a throwaway SQLite file. Its saved_projects and
+report_jobs tables are dropped and recreated, so point it at a scratch database.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database.base import Base
+from app.engines.own_house_engine import OwnHouseEngine
+from app.models.report_job import ReportJob
+from app.models.saved_project import SavedProject
+from app.schemas.project_save_schema import ProjectSaveRequest
+from app.services.project_service import ProjectService
+
+
+def requests(rows: int):
+    inputs = {
+        "floor": "G+2", "bedrooms": 4, "structural_style": "Premium", "dimensions": "40x50",
+        "interior_package": "semi", "client_name": "CRM Import"
+    }
+    result = OwnHouseEngine.estimate_cost(dict(inputs))
+    return [
+        ProjectSaveRequest(
+            project_type="own_house",
+            input_json=dict(inputs, client_name=f"CRM Import {i}"),
+            total_cost=result["total_cost"],
+            breakdown_json={"items": result["breakdown"]}
+        )
+        for i in range(rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--single-rows", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, nargs="+", default=[500, 1000, 5000])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bulk_save_")
+    url = args.database or f"sqlite:///{workdir}/bench.db"
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    tables = [SavedProject.__table__, ReportJob.__table__]
+    data = requests(max(args.rows, args.single_rows))
+    print(f"{engine.dialect.name}, {len(str(data[0].model_dump())) / 1024:.1f} KiB per project")
+
+    def fresh():
+        Base.metadata.drop_all(bind=engine, tables=tables)
+        Base.metadata.create_all(bind=engine, tables=tables)
+        return Session()
+
+    db = fresh()
+    start = time.perf_counter()
+    for project in data[:args.single_rows]:
+        # What /projects/save does per row
+        saved = ProjectService.save_project(db, project.project_type, project.input_json, project.total_cost, project.breakdown_json)
+        ProjectService.report_status(db, saved.id)
+    elapsed = time.perf_counter() - start
+    db.close()
+    baseline = args.single_rows / elapsed
+    print(f"save_project per row          {baseline:9.0f} rows/s  ({args.single_rows} rows)")
+
+    for chunk_size in args.chunk_size:
+        db = fresh()
+        start = time.perf_counter()
+        ids = ProjectService.save_projects(db, data[:args.rows], chunk_size=chunk_size)
+        elapsed = time.perf_counter() - start
+        assert len(ids) == args.rows and ids == sorted(ids)
+        db.close()
+        print(f"save_projects chunk {chunk_size:5d}     {args.rows / elapsed:9.0f} rows/s  "
+              f"x{args.rows / elapsed / baseline:.0f}  ({args.rows} rows)")
+
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
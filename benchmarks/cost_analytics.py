@@ -0,0 +1,172 @@
+"""
+Cost analytics: rollup queries vs scanning saved_projects, and what the rollups
+add to saves.
+
+    python -m benchmarks.cost_analytics [--database URL] [--rows 200000] [--save-rows 5000]
+
+Seeds --rows projects across six project types, four grades and 24 months,
+rebuilds the rollups, then times the /analytics summaries (by type, by type and
+grade, by month) against computing the same numbers from a scan of
+saved_projects (input_json parsed for the grade, exact percentiles), and checks
+every rollup percentile is within the sketch's relative accuracy. Finally times
+save_project and save_projects with and without the rollup update.
+
+--database defaults to a throwaway SQLite file. Its tables are dropped and
+recreated, so point it at a scratch database.
+"""
+import argparse
+import math
+import random
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database.base import Base
+from app.models.breakdown_component import BreakdownComponent
+from app.models.cost_rollup import CostRollup
+from app.models.report_job import ReportJob
+from app.models.saved_project import SavedProject
+from app.schemas.project_save_schema import ProjectSaveRequest
+from app.services.cost_rollup_service import CostRollups
+from app.services.project_listing_service import ProjectListing
+from app.services.project_service import ProjectService
+
+TYPES = {"own_house": 1.2e7, "villa": 2.5e7, "rental": 8e6, "commercial": 4e7, "interior": 1.5e6, "exterior": 9e5}
+GRADES = ["Base", "Classic", "Premium", "Elite"]
+GROUPINGS = [["project_type"], ["project_type", "grade"], ["month"]]
+PERCENTILES = [50, 90, 95]
+
+
+def seed(db, rows: int) -> None:
+    rnd = random.Random(7)
+    start = datetime(2024, 11, 1, tzinfo=timezone.utc)
+    batch = []
+    for i in range(rows):
+        project_type = rnd.choice(list(TYPES))
+        grade = rnd.choice(GRADES)
+        batch.append({
+            "project_type": project_type,
+            "input_json": {"client_name": f"Client {i}", "structural_style": grade, "floor": "G+2"},
+            "total_cost": round(TYPES[project_type] * (1 + GRADES.index(grade) * 0.15) * rnd.lognormvariate(0, 0.35), 2),
+            "breakdown_json": {"items": []},
+            "created_at": start + timedelta(days=rnd.uniform(0, 730))
+        })
+        if len(batch) == 10000 or i == rows - 1:
+            db.execute(SavedProject.__table__.insert(), batch)
+            batch = []
+    db.commit()
+
+
+def scan(db, group_by):
+    """
+    The same summary computed the slow way: every row read, its input_json
+    parsed, exact percentiles over the sorted costs.
+    """
+    groups = defaultdict(list)
+    for project_type, created_at, input_json, total_cost in db.execute(
+        SavedProject.__table__.select().with_only_columns(
+            SavedProject.project_type, SavedProject.created_at, SavedProject.input_json, SavedProject.total_cost
+        )
+    ):
+        values = {
+            "project_type": project_type, "month": CostRollups.month(created_at),
+            "grade": ProjectListing.summary_value(input_json, "grade")
+        }
+        groups[tuple(values[name] for name in group_by)].append(total_cost)
+    results = {}
+    for key, costs in groups.items():
+        costs.sort()
+        mean = sum(costs) / len(costs)
+        results[key] = {
+            "count": len(costs), "mean": mean,
+            "percentiles": {f"p{q}": costs[math.floor(q / 100 * (len(costs) - 1))] for q in PERCENTILES}
+        }
+    return results
+
+
+def timed(fn, repeat: int = 5):
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--save-rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="cost_analytics_")
+    url = args.database or f"sqlite:///{workdir}/bench.db"
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    tables = [SavedProject.__table__, ReportJob.__table__, BreakdownComponent.__table__, CostRollup.__table__]
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    Base.metadata.create_all(bind=engine, tables=tables)
+
+    db = Session()
+    seed(db, args.rows)
+    start = time.perf_counter()
+    CostRollups.rebuild(db)
+    rebuild = time.perf_counter() - start
+    rollup_rows = db.query(CostRollup).count()
+    print(f"{engine.dialect.name}, {args.rows:,} projects -> {rollup_rows:,} rollup rows (rebuild {rebuild:.1f}s)")
+
+    for group_by in GROUPINGS:
+        rollup_time, summary = timed(lambda: CostRollups.summary(db, group_by=group_by, percentiles=PERCENTILES))
+        scan_time, exact = timed(lambda: scan(db, group_by), repeat=1)
+        worst = 0.0
+        for group in summary["groups"]:
+            expected = exact[tuple(group[name] for name in group_by)]
+            assert group["count"] == expected["count"] and math.isclose(group["mean"], expected["mean"], abs_tol=0.01)
+            for name, value in group["percentiles"].items():
+                worst = max(worst, abs(value - expected["percentiles"][name]) / expected["percentiles"][name])
+        assert worst <= settings.COST_ROLLUP_RELATIVE_ACCURACY + 1e-9
+        print(f"by {'+'.join(group_by):20s} {len(summary['groups']):3d} groups  rollups {rollup_time * 1000:7.1f} ms  "
+              f"scan {scan_time * 1000:9.1f} ms  x{scan_time / rollup_time:,.0f}  worst percentile error {worst:.2%}")
+    db.close()
+
+    data = [
+        ProjectSaveRequest(
+            project_type="villa", input_json={"client_name": f"Client {i}", "style": "Luxury"},
+            total_cost=2.5e7 + i, breakdown_json={"items": []}
+        )
+        for i in range(args.save_rows)
+    ]
+    apply = CostRollups.apply
+    rates = defaultdict(lambda: [0.0, 0.0])
+    # Alternated and best of three, so neither side gets the warmer database
+    for _ in range(3):
+        for label, rollups in (("without rollups", lambda *a, **k: None), ("with rollups", apply)):
+            CostRollups.apply = staticmethod(rollups)
+            db = Session()
+            start = time.perf_counter()
+            for project in data[:args.save_rows // 5]:
+                ProjectService.save_project(db, project.project_type, project.input_json, project.total_cost, project.breakdown_json)
+            single = args.save_rows // 5 / (time.perf_counter() - start)
+            start = time.perf_counter()
+            ProjectService.save_projects(db, data)
+            bulk = args.save_rows / (time.perf_counter() - start)
+            db.close()
+            rates[label] = [max(rates[label][0], single), max(rates[label][1], bulk)]
+    CostRollups.apply = apply
+    for label, (single, bulk) in rates.items():
+        print(f"{label:16s} save_project {single:6.0f} rows/s  save_projects {bulk:7.0f} rows/s")
+
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Wizard estimation: full-form POST per step vs the WebSocket session's diffs.
+
+    python -m benchmarks.estimation_session [--steps 2000]
+
+Runs the app under uvicorn and replays the same random wizard walk (one
+own-house field changed per step) both ways: POST /own-house/estimate with
+the whole form over a keep-alive connection, and one change per message on
+/estimates/session/own_house. Reports median and p99 round-trip latency and
+bytes per update in each direction. HTTP bytes are bodies plus headers; the
+WebSocket's are message payloads (frame headers add 2-8 bytes).
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import httpx
+from websockets.sync.client import connect
+
+from benchmarks.async_db import API, start_server
+
+CHOICES = {
+    "floor": ["G+1", "G+2", "G+3"],
+    "bedrooms": [2, 3, 4, 5],
+    "structural_style": ["Base", "Classic", "Premium", "Elite"],
+    "dimensions": ["30x40", "30x50", "40x60", "50x80"],
+    "zone": ["A", "B", "C"],
+    "lift_required": [False, True],
+    "interior_package": ["none", "base", "semi", "full_furnished"],
+    "include_compound_wall": [False, True],
+    "include_rainwater_harvesting": [False, True],
+    "include_car_parking": [False, True]
+}
+
+
+def walk(steps: int):
+    rng = random.Random(23)
+    for _ in range(steps):
+        field = rng.choice(list(CHOICES))
+        yield {field: rng.choice(CHOICES[field])}
+
+
+def header_bytes(headers: httpx.Headers) -> int:
+    return sum(len(name) + len(value) + 4 for name, value in headers.raw)
+
+
+def summary(latencies: list, sent: int, received: int) -> str:
+    latencies.sort()
+    steps = len(latencies)
+    return (f"p50 {latencies[steps // 2] * 1e3:6.2f} ms  p99 {latencies[int(steps * 0.99)] * 1e3:6.2f} ms  "
+            f"{sent / steps:6,.0f} B up  {received / steps:6,.0f} B down")
+
+
+def full_post(url: str, steps: int) -> str:
+    form = {field: values[0] for field, values in CHOICES.items()}
+    latencies, sent, received = [], 0, 0
+    with httpx.Client(base_url=url) as client:
+        for change in walk(steps):
+            form.update(change)
+            body = json.dumps(form).encode()
+            start = time.perf_counter()
+            response = client.post(f"{API}/own-house/estimate", content=body, headers={"Content-Type": "application/json"})
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+            sent += len(body) + header_bytes(response.request.headers)
+            received += len(response.content) + header_bytes(response.headers)
+    return summary(latencies, sent, received)
+
+
+def session(url: str, steps: int) -> str:
+    form = {field: values[0] for field, values in CHOICES.items()}
+    latencies, sent, received = [], 0, 0
+    with connect(url.replace("http", "ws", 1) + f"{API}/estimates/session/own_house") as ws:
+        ws.send(json.dumps({"fields": form}))
+        ws.recv()
+        for change in walk(steps):
+            message = json.dumps({"fields": change})
+            start = time.perf_counter()
+            ws.send(message)
+            reply = ws.recv()
+            latencies.append(time.perf_counter() - start)
+            sent += len(message)
+            received += len(reply)
+    return summary(latencies, sent, received)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="estimation_session_")
+    server, url = start_server(workdir, os.path.join(workdir, "bench.db"), async_db=False)
+    try:
+        print(f"{args.steps} wizard steps, one field changed per step")
+        print(f"full-form POST     {full_post(url, args.steps)}")
+        print(f"WebSocket session  {session(url, args.steps)}")
+    finally:
+        server.terminate()
+        server.wait()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
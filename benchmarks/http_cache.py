@@ -0,0 +1,69 @@
+"""
+Conditional GET: full 200 responses vs 304 revalidations.
+
+    python -m benchmarks.http_cache [--requests 2000] [--projects 50]
+
+Runs the app under uvicorn on a throwaway SQLite database and times, per
+endpoint, sequential GETs without validators against the same GETs sending the
+ETag from the first response as If-None-Match. Estimates are warm in the
+estimate cache either way, so the 200 column is the cheapest a full response
+gets.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.async_db import API, OWN_HOUSE, start_server
+
+VILLA = {"floor": "G+2", "upgrade_level": "Luxury", "zone": "A"}
+
+
+def timed(client: httpx.Client, path: str, requests: int, headers: dict) -> tuple:
+    latencies, transferred = [], 0
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        transferred += len(response.content)
+    latencies.sort()
+    return response.status_code, latencies[len(latencies) // 2] * 1e3, transferred / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--projects", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="http_cache_")
+    server, url = start_server(workdir, os.path.join(workdir, "bench.db"), async_db=False)
+    try:
+        with httpx.Client(base_url=url, follow_redirects=True) as client:
+            for _ in range(args.projects):
+                client.post(f"{API}/own-house/save", json=OWN_HOUSE).raise_for_status()
+            paths = {
+                "own-house estimate": client.get(f"{API}/own-house/estimate", params=OWN_HOUSE).url.raw_path.decode(),
+                "villa estimate": client.get(f"{API}/villa/estimate", params=VILLA).url.raw_path.decode(),
+                "grade-facilities": f"{API}/own-house/grade-facilities",
+                "saved project": f"{API}/projects/{args.projects}"
+            }
+            print(f"{args.requests} sequential requests per row, median latency and body bytes per request")
+            for name, path in paths.items():
+                first = client.get(path)
+                first.raise_for_status()
+                full = timed(client, path, args.requests, {})
+                revalidated = timed(client, path, args.requests, {"If-None-Match": first.headers["etag"]})
+                print(f"{name:20s} {full[0]} {full[1]:6.2f} ms {full[2]:8,.0f} B   "
+                      f"{revalidated[0]} {revalidated[1]:6.2f} ms {revalidated[2]:8,.0f} B")
+    finally:
+        server.terminate()
+        server.wait()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
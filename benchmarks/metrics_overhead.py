@@ -0,0 +1,163 @@
+"""
+Cost of the /metrics instrumentation: METRICS_ENABLED on vs off.
+
+    python -m benchmarks.metrics_overhead [--rows 20000] [--rounds 5] [--requests 5000]
+
+Everything is measured in pairs: the same work with metrics off and on, back
+to back in alternating order, each timed on its own. The overhead is the mean
+of the paired differences, with a 95% confidence interval, over the mean time
+with metrics off. Pairs where either side took over 10x the median are dropped
+as interrupted (a sampled timer adds about a microsecond, nowhere near that).
+Sampled timers make one call in METRICS_SAMPLE_EVERY much dearer than the
+rest, so the mean, not the median, is what they cost. The interval comes to
+about +/- 0.2% of an engine call, fine enough to tell whether the overhead is
+under 2%.
+
+Engines: prices --rows own-house configurations (with the pricing table and
+without it, where every breakdown stage runs) and villa ones --rounds times,
+through the bare estimate_cost (stage clocks off) and the instrumented one,
+with the garbage collector off.
+
+HTTP: two uvicorn servers on throwaway SQLite databases, one per setting, get
+the same --requests sequential requests from a mix of POST estimates,
+GET /projects/{id} and saves.
+"""
+import argparse
+import gc
+import math
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.async_db import API, OWN_HOUSE, start_server
+
+VILLA = {"floor": "G+2", "upgrade_level": "Luxury", "zone": "A"}
+
+
+def summarize(pairs: list) -> dict:
+    # pairs: (seconds off, seconds on)
+    limit = 10 * statistics.median(off for off, _ in pairs)
+    kept = [(off, on) for off, on in pairs if off < limit and on < limit]
+    differences = [on - off for off, on in kept]
+    mean = statistics.fmean(off for off, _ in kept)
+    delta = statistics.fmean(differences)
+    margin = 1.96 * statistics.stdev(differences) / math.sqrt(len(differences))
+    return {"off": mean, "delta": delta, "margin": margin, "dropped": len(pairs) - len(kept),
+            "percent": 100 * delta / mean, "percent_margin": 100 * margin / mean}
+
+
+def paired_overhead(bare, instrumented, inputs: list, rounds: int) -> dict:
+    from app.core.config import settings
+
+    clock = time.perf_counter
+    pairs = []
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            for index, data in enumerate(inputs):
+                timings = {}
+                # Alternate which goes first so cache warmth and timer drift cancel out
+                for enabled in ((False, True) if index % 2 else (True, False)):
+                    settings.METRICS_ENABLED = enabled
+                    estimate = instrumented if enabled else bare
+                    payload = dict(data)
+                    start = clock()
+                    estimate(payload)
+                    timings[enabled] = clock() - start
+                pairs.append((timings[False], timings[True]))
+    finally:
+        gc.enable()
+        settings.METRICS_ENABLED = True
+    return summarize(pairs)
+
+
+def engine_timings(rows: int, rounds: int) -> dict:
+    from app.core.config import settings
+    from app.engines.own_house_engine import OwnHouseEngine
+    from app.engines.villa_engine import VillaEngine
+    from benchmarks.estimation_session import CHOICES
+
+    rng = random.Random(24)
+    forms = [{field: rng.choice(values) for field, values in CHOICES.items()} for _ in range(rows)]
+    timings = {}
+    for name, engine, inputs, table in (("own_house, table", OwnHouseEngine, forms, "startup"),
+                                        ("own_house, no table", OwnHouseEngine, forms, "off"),
+                                        ("villa", VillaEngine, [VILLA] * rows, "off")):
+        settings.OWN_HOUSE_PRICING_TABLE = table
+        bare, instrumented = engine.estimate_cost.__wrapped__, engine.estimate_cost
+        for data in inputs[:1000]:
+            instrumented(dict(data)) # warm up (builds the pricing table)
+        timings[name] = paired_overhead(bare, instrumented, inputs, rounds)
+    return timings
+
+
+def http_timings(urls: dict, requests: int) -> dict:
+    rng = random.Random(24)
+    clients = {enabled: httpx.Client(base_url=url) for enabled, url in urls.items()}
+    try:
+        project_ids = {
+            enabled: [client.post(f"{API}/own-house/save", json=OWN_HOUSE).json()["project_id"] for _ in range(20)]
+            for enabled, client in clients.items()
+        }
+        pairs = []
+        for index in range(requests):
+            roll, bedrooms, pick = rng.random(), rng.randint(2, 5), rng.randrange(20)
+            timings = {}
+            for enabled in ((False, True) if index % 2 else (True, False)):
+                client = clients[enabled]
+                start = time.perf_counter()
+                if roll < 0.4:
+                    response = client.post(f"{API}/own-house/estimate", json=dict(OWN_HOUSE, bedrooms=bedrooms))
+                elif roll < 0.6:
+                    response = client.post(f"{API}/villa/estimate", json=VILLA)
+                elif roll < 0.9:
+                    response = client.get(f"{API}/projects/{project_ids[enabled][pick]}")
+                else:
+                    response = client.post(f"{API}/own-house/save", json=OWN_HOUSE)
+                timings[enabled] = time.perf_counter() - start
+                response.raise_for_status()
+            pairs.append((timings[False], timings[True]))
+    finally:
+        for client in clients.values():
+            client.close()
+    return summarize(pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    print(f"engine timers sample 1 call in {settings.METRICS_SAMPLE_EVERY}; {args.rows} inputs x {args.rounds} rounds")
+    for name, timing in engine_timings(args.rows, args.rounds).items():
+        print(f"{name:20s} off {timing['off'] * 1e6:8.2f} us   on {timing['delta'] * 1e9:+7.1f} ns +/- {timing['margin'] * 1e9:5.1f}   "
+              f"{timing['percent']:+6.2f}% +/- {timing['percent_margin']:.2f}   ({timing['dropped']} pairs dropped)")
+
+    workdir = tempfile.mkdtemp(prefix="metrics_overhead_")
+    servers, urls = [], {}
+    try:
+        for enabled in (False, True):
+            os.environ["METRICS_ENABLED"] = str(enabled).lower()
+            server, urls[enabled] = start_server(workdir, os.path.join(workdir, f"bench_{enabled}.db"), async_db=False)
+            servers.append(server)
+        timing = http_timings(urls, args.requests)
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+        os.environ.pop("METRICS_ENABLED", None)
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"{'HTTP mix':20s} off {timing['off'] * 1e3:8.3f} ms   on {timing['delta'] * 1e6:+7.1f} us +/- {timing['margin'] * 1e6:5.1f}   "
+          f"{timing['percent']:+6.2f}% +/- {timing['percent_margin']:.2f}   ({timing['dropped']} pairs dropped)")
+
+
+if __name__ == "__main__":
+    main()
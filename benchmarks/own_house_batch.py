@@ -0,0 +1,70 @@
+"""
+Throughput of the scalar vs batched Own House pricing paths.
+
+    python -m benchmarks.own_house_batch [rows ...]
+
+Every run first checks that the batch output equals the scalar output row for row.
+"""
+import copy
+import random
+import sys
+import time
+
+from app.core.constants import OWN_HOUSE_INTERIOR_COSTS, OWN_HOUSE_PLAN_MULTIPLIERS
+from app.engines.breakdown_engine import BreakdownEngine
+from app.engines.own_house_batch_engine import OwnHouseBatchEngine
+from app.engines.own_house_engine import OwnHouseEngine
+
+PLOTS = ["30x40", "30x50", "40x40", "40x50", "40x60", "50x80", "60x80", "60x100"]
+PACKAGES = ["none"] + [pkg for pkg in OWN_HOUSE_INTERIOR_COSTS["G+1"] if pkg != "none"]
+
+
+def random_rows(n, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        rows.append(OwnHouseEngine.map_inputs({
+            "dimensions": rng.choice(PLOTS),
+            "bedrooms": rng.randint(2, 8),
+            "floor": rng.choice(["G+1", "G+2", "G+3"]),
+            "structural_style": rng.choice(list(OWN_HOUSE_PLAN_MULTIPLIERS)),
+            "zone": rng.choice("ABC"),
+            "interior_package": rng.choice(PACKAGES),
+            "include_compound_wall": rng.random() < 0.5,
+            "include_rainwater_harvesting": rng.random() < 0.5,
+            "include_car_parking": rng.random() < 0.5,
+            "terrace_guest_bedroom": rng.random() < 0.2
+        }))
+    return rows
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    sample = random_rows(10000, seed=1)
+    expected = [BreakdownEngine.calculate_smart_breakdown(copy.deepcopy(row)) for row in sample]
+    assert OwnHouseBatchEngine.calculate_smart_breakdown_batch(sample) == expected, "batch diverges from scalar"
+    print("parity: 10000 random rows identical to calculate_smart_breakdown")
+
+    for n in sizes:
+        rows = random_rows(n)
+        print(f"\n{n:,} rows")
+        if n <= 100000:
+            _, t = timed(lambda: [BreakdownEngine.calculate_smart_breakdown(row) for row in rows])
+            print(f"  scalar loop            {t:8.3f}s  {n / t:12,.0f} rows/s")
+        encoded, t_enc = timed(OwnHouseBatchEngine.encode_inputs, rows)
+        _, t_price = timed(OwnHouseBatchEngine.price, encoded)
+        print(f"  batch encode           {t_enc:8.3f}s  {n / t_enc:12,.0f} rows/s")
+        print(f"  batch price (NumPy)    {t_price:8.3f}s  {n / t_price:12,.0f} rows/s")
+        if n <= 100000:
+            # The JSON-shaped output is ~23 dicts per row; at 1M rows that alone is several GB.
+            _, t_full = timed(OwnHouseBatchEngine.calculate_smart_breakdown_batch, rows)
+            print(f"  batch incl. dict output{t_full:8.3f}s  {n / t_full:12,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 1000000])
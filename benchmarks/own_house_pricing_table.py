@@ -0,0 +1,57 @@
+"""
+Footprint and latency of the precomputed Own House pricing table.
+
+    python -m benchmarks.own_house_pricing_table
+"""
+import copy
+import os
+import random
+import tempfile
+import time
+
+from app.engines.breakdown_engine import BreakdownEngine
+from app.engines.own_house_pricing_table import OwnHousePricingTable, AXES, FLAG_AXES
+
+FIELDS = ["dimensions", "bedrooms", "floor", "structural_style", "interior_package"]
+
+
+def per_call_us(fn, inputs):
+    start = time.perf_counter()
+    for row in inputs:
+        fn(row)
+    return (time.perf_counter() - start) / len(inputs) * 1e6
+
+
+def main():
+    start = time.perf_counter()
+    table = OwnHousePricingTable.build()
+    build_s = time.perf_counter() - start
+
+    path = os.path.join(tempfile.mkdtemp(), "table.npz")
+    OwnHousePricingTable.save(table, path)
+    start = time.perf_counter()
+    OwnHousePricingTable.load_file(path)
+    load_s = time.perf_counter() - start
+
+    print(f"rows            {len(table['total_cost']):,}")
+    print(f"in-memory       {OwnHousePricingTable.nbytes(table) / 1e6:.2f} MB")
+    print(f"file (.npz)     {os.path.getsize(path) / 1e6:.2f} MB")
+    print(f"build           {build_s * 1e3:.1f} ms")
+    print(f"load + verify   {load_s * 1e3:.1f} ms")
+
+    rng = random.Random(3)
+    inputs = []
+    for _ in range(20000):
+        row = {field: rng.choice(axis) for field, axis in zip(FIELDS, AXES)}
+        row.update({flag: rng.random() < 0.5 for flag in FLAG_AXES})
+        inputs.append(row)
+
+    live = per_call_us(lambda row: BreakdownEngine.calculate_smart_breakdown(copy.copy(row)), inputs)
+    lookup = per_call_us(lambda row: OwnHousePricingTable.lookup(row, table), inputs)
+    index = per_call_us(OwnHousePricingTable.row_index, inputs)
+    print(f"live compute    {live:7.2f} us/call")
+    print(f"table lookup    {lookup:7.2f} us/call (row index alone {index:.2f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+PDF report rendering throughput and allocations for 20- and 200-item BOQs.
+
+    python -m benchmarks.pdf_render [--reports 50]
+"""
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from app.core.config import settings
+from app.services.pdf_service import PDFService
+
+
+def project_data(items: int) -> dict:
+    return {
+        "project_type": "own_house",
+        "input_json": {
+            "floor": "G+2", "bedrooms": 4, "structural_style": "Premium", "dimensions": "40x50",
+            "zone": "B", "interior_package": "semi", "client_name": "Benchmark Client"
+        },
+        "total_cost": 12345678.9,
+        "breakdown_json": {"items": [
+            {"component": f"Component {i:03d} - Structural Works", "category": "STRUCTURE", "amount": 100000.0 + i}
+            for i in range(items)
+        ]}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reports", type=int, default=50)
+    args = parser.parse_args()
+    settings.REPORTS_DIR = tempfile.mkdtemp(prefix="pdf_render_")
+
+    for items in (20, 200):
+        data = project_data(items)
+        modes = [("file", lambda: PDFService.generate_project_report(data, "bench.pdf"))]
+        if hasattr(PDFService, "render_project_report"):
+            modes.append(("bytes", lambda: PDFService.render_project_report(data)))
+        for mode, render in modes:
+            render()
+            start = time.perf_counter()
+            for _ in range(args.reports):
+                render()
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            render()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{items:3d} items  {mode:5s}  {args.reports / elapsed:7.1f} reports/s  "
+                  f"{elapsed / args.reports * 1e3:6.2f} ms/report  peak allocations {peak / 1024:6.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Cost of per-request profiling, and what a profiled save looks like.
+
+    python -m benchmarks.profiling_overhead [--requests 300]
+
+Runs the app under uvicorn with reports rendered inline during the save
+(REPORT_QUEUE_WORKERS=0, REPORT_RENDER_ON_SAVE), on a fresh database per
+phase, and times sequential POST /own-house/save requests with profiling off,
+on but not triggered, and triggered by the X-Profile header.
+Prints median latencies and the median highlights (PDF render and db commit
+share) of the profiled saves from /admin/profiles.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.async_db import API, start_server
+from benchmarks.estimation_session import CHOICES
+
+
+def distinct_forms(count: int) -> list:
+    # Every save across all phases prices a new form, so each renders its own report
+    rng = random.Random(25)
+    forms = {}
+    while len(forms) < count:
+        form = {field: rng.choice(values) for field, values in CHOICES.items()}
+        forms[json.dumps(form, sort_keys=True)] = form
+    return list(forms.values())
+
+
+def saves(url: str, forms: list, headers: dict) -> list:
+    latencies = []
+    with httpx.Client(base_url=url) as client:
+        for form in forms:
+            start = time.perf_counter()
+            client.post(f"{API}/own-house/save", json=form, headers=headers).raise_for_status()
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="profiling_overhead_")
+    os.environ.update(REPORT_QUEUE_WORKERS="0", REPORT_RENDER_ON_SAVE="true", PROFILING_MAX_PROFILES=str(args.requests))
+    forms = distinct_forms(3 * args.requests)
+    batches = [forms[i::3] for i in range(3)]
+    results = {}
+    try:
+        phases = (("profiling off", False, {}), ("on, not triggered", True, {}), ("on, X-Profile header", True, {"X-Profile": "1"}))
+        for (name, enabled, headers), batch in zip(phases, batches):
+            os.environ["PROFILING_ENABLED"] = str(enabled).lower()
+            server, url = start_server(workdir, os.path.join(workdir, f"bench_{len(results)}.db"), async_db=False)
+            try:
+                results[name] = saves(url, batch, headers)
+                if headers:
+                    profiles = httpx.get(f"{url}{API}/admin/profiles", params={"limit": args.requests}).json()["profiles"]
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        for name in ("REPORT_QUEUE_WORKERS", "REPORT_RENDER_ON_SAVE", "PROFILING_MAX_PROFILES", "PROFILING_ENABLED"):
+            os.environ.pop(name, None)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{args.requests} sequential saves, report rendered inline")
+    for name, latencies in results.items():
+        print(f"{name:22s} p50 {statistics.median(latencies) * 1e3:7.2f} ms")
+    print(f"{len(profiles)} profiles, median over them:")
+    print(f"  samples {statistics.median(p['samples'] for p in profiles):.0f}   "
+          f"sampled {statistics.median(p['sampled_ms'] for p in profiles):.2f} ms of "
+          f"{statistics.median(p['duration_ms'] for p in profiles):.2f} ms")
+    for name in profiles[0]["highlights"]:
+        print(f"  {name:10s} {statistics.median(p['highlights'][name]['ms'] for p in profiles):7.2f} ms   "
+              f"{100 * statistics.median(p['highlights'][name]['share'] for p in profiles):5.1f}% of sampled time")
+
+
+if __name__ == "__main__":
+    main()
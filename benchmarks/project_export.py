@@ -0,0 +1,124 @@
+"""
+Streaming data export: throughput and peak memory of every format, at two table sizes.
+
+    python -m benchmarks.project_export [--database URL] [--rows 1000000] [--storage json|compact]
+
+Seeds --rows / 10 own-house projects (real engine breakdowns across a spread of
+configurations), exports them with app.cli.export_projects in each format with
+and without --flatten, then seeds up to --rows and exports again. Each export
+runs in its own process so its peak RSS is its own; the two table sizes show
+memory staying flat while the row count grows tenfold. Every export's row
+count is checked.
+
+--database defaults to a throwaway SQLite file. Its saved_projects, report_jobs
+and breakdown_components tables are dropped and recreated, so point it at a
+scratch database.
+"""
+import argparse
+import itertools
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.database.base import Base
+from app.engines.own_house_engine import OwnHouseEngine
+from app.models.breakdown_component import BreakdownComponent
+from app.models.report_job import ReportJob
+from app.models.saved_project import SavedProject
+from app.schemas.project_save_schema import ProjectSaveRequest
+from app.services.project_export_service import FORMATS
+from app.services.project_service import ProjectService
+
+REPORT = re.compile(r"^([\d,]+) projects, ([\d.]+) MB \w+ in ([\d.]+)s\s+([\d,]+) rows/s\s+peak RSS (\d+) MB", re.M)
+
+
+def configurations():
+    results = []
+    for floor, bedrooms, style, dimensions, package in itertools.product(
+        ["G+1", "G+2", "G+3"], [3, 4, 5], ["Base", "Classic", "Premium", "Elite"],
+        ["30x40", "40x50", "40x60"], ["none", "base", "semi", "full_furnished"]
+    ):
+        inputs = {
+            "floor": floor, "bedrooms": bedrooms, "structural_style": style,
+            "dimensions": dimensions, "interior_package": package
+        }
+        results.append((inputs, OwnHouseEngine.estimate_cost(dict(inputs))))
+    return results
+
+
+def seed(db, start: int, stop: int, configs) -> None:
+    cycle = itertools.islice(itertools.cycle(configs), start, stop)
+    for offset in range(start, stop, 5000):
+        projects = [
+            ProjectSaveRequest(
+                project_type="own_house",
+                input_json=dict(inputs, client_name=f"Client {i}"),
+                total_cost=result["total_cost"],
+                breakdown_json={"items": result["breakdown"]}
+            )
+            for i, (inputs, result) in zip(range(offset, min(offset + 5000, stop)), cycle)
+        ]
+        db.execute(SavedProject.__table__.insert(), ProjectService.bulk_rows(db, projects))
+        db.commit()
+
+
+def export(url: str, storage: str, workdir: str, format: str, flatten: bool) -> dict:
+    output = os.path.join(workdir, f"export.{FORMATS[format][1]}")
+    command = [sys.executable, "-m", "app.cli.export_projects", "-o", output, "--format", format]
+    env = dict(os.environ, SQLALCHEMY_DATABASE_URI=url, BREAKDOWN_STORAGE=storage)
+    completed = subprocess.run(command + (["--flatten"] if flatten else []), env=env, capture_output=True, text=True)
+    if completed.returncode:
+        raise RuntimeError(completed.stderr)
+    os.remove(output)
+    rows, megabytes, seconds, rate, peak = REPORT.search(completed.stderr).groups()
+    return {
+        "rows": int(rows.replace(",", "")), "mb": float(megabytes), "seconds": float(seconds),
+        "rate": int(rate.replace(",", "")), "peak": int(peak)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--storage", choices=["json", "compact"], default="json")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="project_export_")
+    url = args.database or f"sqlite:///{workdir}/bench.db"
+    settings.BREAKDOWN_STORAGE = args.storage
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    tables = [SavedProject.__table__, ReportJob.__table__, BreakdownComponent.__table__]
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    Base.metadata.create_all(bind=engine, tables=tables)
+
+    configs = configurations()
+    db = Session()
+    seeded = 0
+    for size in (args.rows // 10, args.rows):
+        seed(db, seeded, size, configs)
+        seeded = size
+        print(f"{engine.dialect.name}, {size:,} projects, {args.storage} breakdowns")
+        for format, flatten in itertools.product(FORMATS, (False, True)):
+            result = export(url, args.storage, workdir, format, flatten)
+            assert result["rows"] == size, result
+            label = format + (" --flatten" if flatten else "")
+            print(f"  {label:18s} {result['rate']:8,} rows/s  {result['mb']:8.1f} MB  "
+                  f"{result['seconds']:6.1f}s  peak RSS {result['peak']:4d} MB")
+    db.close()
+
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
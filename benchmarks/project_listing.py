@@ -0,0 +1,125 @@
+"""
+Archive listing latency: offset/limit full rows vs keyset summary pages.
+
+    python -m benchmarks.project_listing [--projects 1000000] [--limit 25] [--repeat 20]
+
+Seeds a throwaway SQLite database, then times the first page and pages at
+increasing depth for both the old offset listing and ProjectListing, plus a few
+filtered and re-sorted keyset queries, and prints their query plans.
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+WORKDIR = tempfile.mkdtemp(prefix="project_listing_")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{WORKDIR}/bench.db"
+
+from sqlalchemy import insert, text  # noqa: E402
+from app.database.base import Base  # noqa: E402
+from app.database.session import SessionLocal, engine  # noqa: E402
+from app.models.saved_project import SavedProject  # noqa: E402
+from app.schemas.archive_schema import ArchiveQuery  # noqa: E402
+from app.services.project_listing_service import SORT_KEYS, ProjectListing  # noqa: E402
+from app.services.project_service import ProjectService  # noqa: E402
+
+TYPES = ["own_house", "villa", "rental", "commercial", "interior", "exterior"]
+
+
+def seed(projects: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    start = datetime(2024, 1, 1)
+    db = SessionLocal()
+    batch = []
+    for i in range(projects):
+        project_type = TYPES[i % len(TYPES)]
+        total = round(rng.uniform(1e6, 5e7), 2)
+        batch.append({
+            "project_type": project_type,
+            "input_json": {"floor": "G+2", "zone": "B", "structural_style": "Premium", "client_name": f"Client {i}"},
+            "total_cost": total,
+            "breakdown_json": {"items": [
+                {"component": f"Component {c}", "category": "STRUCTURE", "amount": round(total / 8, 2), "percentage": 12.5}
+                for c in range(8)
+            ]},
+            # Stored the way server_default CURRENT_TIMESTAMP stores it, second resolution with ties
+            "created_at": (start + timedelta(seconds=i * 60 + rng.randint(0, 30))).replace(microsecond=0)
+        })
+        if len(batch) == 10000:
+            db.execute(insert(SavedProject), batch)
+            batch = []
+    if batch:
+        db.execute(insert(SavedProject), batch)
+    db.commit()
+    db.execute(text("ANALYZE"))
+    db.close()
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e3
+
+
+def cursor_at(db, query: ArchiveQuery, depth: int) -> str:
+    # Key of the row just before `depth`, as the previous page would have returned it
+    stmt = ProjectListing.statement(query, "sqlite").offset(depth - 1).limit(1)
+    row = db.execute(stmt).first()._mapping
+    key = [row[f"key_{i}"] for i in range(len(SORT_KEYS[query.sort]))]
+    return ProjectListing.encode_cursor(key, query.sort, query.order)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=1000000)
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seed(args.projects)
+    print(f"seeded {args.projects} projects in {time.perf_counter() - started:.0f}s "
+          f"({os.path.getsize(f'{WORKDIR}/bench.db') / 1e6:.0f} MB)")
+
+    db = SessionLocal()
+    depths = [0] + [d for d in (1000, 100000, args.projects // 2, args.projects - args.limit) if d < args.projects]
+    for depth in depths:
+        offset_ms = timed(lambda: ProjectService.get_all_projects(db, skip=depth, limit=args.limit), args.repeat)
+        query = ArchiveQuery(limit=args.limit)
+        if depth:
+            query = ArchiveQuery(limit=args.limit, cursor=cursor_at(db, query, depth))
+        keyset_ms = timed(lambda: ProjectService.list_archive(db, query), args.repeat)
+        print(f"row {depth:8d}  offset full rows {offset_ms:8.2f} ms   keyset summary {keyset_ms:6.2f} ms")
+
+    cases = [
+        ("type=villa", ArchiveQuery(limit=args.limit, project_type="villa")),
+        ("type=villa, deep", ArchiveQuery(limit=args.limit, project_type="villa")),
+        ("cost 2-3M", ArchiveQuery(limit=args.limit, sort="total_cost", min_cost=2e6, max_cost=3e6)),
+        ("type=rental, cost desc", ArchiveQuery(limit=args.limit, project_type="rental", sort="total_cost")),
+        ("date range", ArchiveQuery(limit=args.limit, date_from="2024-06-01", date_to="2024-06-30")),
+        ("sort=project_type, deep", ArchiveQuery(limit=args.limit, sort="project_type", order="asc")),
+        ("full fields", ArchiveQuery(limit=args.limit, fields="full")),
+    ]
+    for label, query in cases:
+        if label.endswith("deep"):
+            query = query.model_copy(update={"cursor": cursor_at(db, query, args.projects // 12)})
+        ms = timed(lambda: ProjectService.list_archive(db, query), args.repeat)
+        stmt = ProjectListing.statement(query, "sqlite")
+        compiled = stmt.compile(engine, compile_kwargs={"literal_binds": True})
+        plan = " | ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+        print(f"{label:24s} {ms:6.2f} ms   {plan}")
+    db.close()
+    shutil.rmtree(WORKDIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Re-pricing job: throughput against the bare engines, and interrupt/resume.
+
+    python -m benchmarks.repricing [--database URL] [--rows 100000] [--workers 1,4] [--chunk-size 500]
+
+Seeds --rows projects of every type (inputs from benchmarks.bulk_estimate)
+tagged with an older rate card, priced 3% below the current one. Times the
+engines alone in this process, then a full ProjectRepricer run per --workers
+value (estimations cleared in between). The last run is interrupted halfway and
+resumed, and every project is checked to have exactly one estimation with the
+expected +3% delta.
+
+--database defaults to a throwaway SQLite file. Its saved_projects,
+report_jobs, breakdown_components, repricing_runs and estimations tables are
+dropped and recreated, so point it at a scratch database.
+"""
+import argparse
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database.base import Base
+from app.engines.registry import PROJECT_ENGINES
+from app.models.breakdown_component import BreakdownComponent
+from app.models.estimation import Estimation
+from app.models.report_job import ReportJob
+from app.models.repricing_run import RepricingRun
+from app.models.saved_project import SavedProject
+from app.services.repricing_service import ProjectRepricer
+from benchmarks.bulk_estimate import random_row
+
+STALE = "0" * 16
+DRIFT = 1.03
+
+
+def projects(rows: int):
+    rng = random.Random(20)
+    for i in range(rows):
+        row = random_row(rng)
+        project_type = row.pop("project_type")
+        yield project_type, dict(row, client_name=f"Client {i}")
+
+
+def seed(db, rows: int) -> None:
+    batch = []
+    for i, (project_type, inputs) in enumerate(projects(rows)):
+        schema, engine = PROJECT_ENGINES[project_type]
+        result = engine.estimate_cost(schema(**inputs).dict())
+        batch.append({
+            "project_type": project_type, "input_json": inputs, "rate_card_version": STALE,
+            "total_cost": result["total_cost"] / DRIFT, "breakdown_json": {"items": result["breakdown"]}
+        })
+        if len(batch) == 5000 or i == rows - 1:
+            db.execute(SavedProject.__table__.insert(), batch)
+            batch = []
+    db.commit()
+
+
+def engines_only(rows: int) -> float:
+    work = [(project_type, PROJECT_ENGINES[project_type][0], inputs) for project_type, inputs in projects(rows)]
+    start = time.perf_counter()
+    for project_type, schema, inputs in work:
+        PROJECT_ENGINES[project_type][1].estimate_cost(schema(**inputs).dict())
+    return rows / (time.perf_counter() - start)
+
+
+def reset(db) -> None:
+    db.execute(delete(Estimation))
+    db.execute(delete(RepricingRun))
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database")
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="repricing_")
+    url = args.database or f"sqlite:///{workdir}/bench.db"
+    engine = create_engine(url)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    tables = [
+        SavedProject.__table__, ReportJob.__table__, BreakdownComponent.__table__,
+        RepricingRun.__table__, Estimation.__table__
+    ]
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    Base.metadata.create_all(bind=engine, tables=tables)
+
+    db = Session()
+    seed(db, args.rows)
+    print(f"{engine.dialect.name}, {args.rows:,} projects, {os.cpu_count()} cores")
+    print(f"engines only, in process      {engines_only(min(args.rows, 20000)):8,.0f} projects/s")
+
+    worker_counts = sorted({int(count) for count in args.workers.split(",")})
+    for workers in worker_counts:
+        reset(db)
+        repricer = ProjectRepricer(workers=workers, chunk_size=args.chunk_size)
+        start = time.perf_counter()
+        if workers == worker_counts[-1]:
+            # Stop halfway (as Ctrl-C would) and resume in a new repricer
+            deltas = repricer.reprice(db)
+            for _ in range(args.rows // 2):
+                next(deltas)
+            deltas.close()
+            checkpoint = db.get(RepricingRun, repricer.run.id).last_project_id
+            repricer = ProjectRepricer(workers=workers, chunk_size=args.chunk_size)
+            resume_start = time.perf_counter()
+            repricer.start(db)
+            assert repricer.resumed
+            resumed = sum(1 for _ in repricer.reprice(db))
+            print(f"  interrupted at {checkpoint:,}, resumed with {resumed:,} left "
+                  f"({time.perf_counter() - resume_start:.1f}s)")
+        else:
+            sum(1 for _ in repricer.reprice(db))
+        elapsed = time.perf_counter() - start
+        print(f"re-pricing job, {workers} worker{'s' if workers > 1 else ' '}   {args.rows / elapsed:8,.0f} projects/s")
+
+    estimations, worst = db.execute(select(
+        func.count(Estimation.id), func.max(func.abs(Estimation.total_cost / Estimation.previous_total_cost - DRIFT))
+    )).one()
+    duplicates = db.scalar(select(func.count()).select_from(
+        select(Estimation.project_id).group_by(Estimation.project_id).having(func.count() > 1).subquery()
+    ))
+    assert estimations == args.rows and duplicates == 0 and math.isclose(worst, 0, abs_tol=1e-9), (estimations, duplicates, worst)
+    print(f"{estimations:,} estimations, no duplicates, every delta +{DRIFT - 1:.0%}")
+    db.close()
+
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    engine.dispose()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
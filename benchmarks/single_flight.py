@@ -0,0 +1,87 @@
+"""
+Single-flight coalescing: bursts of identical estimates and PDF downloads.
+
+    python -m benchmarks.single_flight [--burst 1 8 64] [--rounds 20]
+
+Runs the app under uvicorn on a throwaway SQLite database. Each round clears
+the estimate cache and fires --burst identical own-house estimates at once
+(as the wizard's foreground call, prefetch and retries do), then --burst
+identical inline PDF downloads of a freshly saved project. Reports the burst's
+wall time and how many engine runs / renders it took, from
+GET /admin/single-flight (n/a on a tree without it, for comparison).
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.async_db import API, OWN_HOUSE, start_server
+
+
+async def burst(client: httpx.AsyncClient, size: int, request) -> float:
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(request() for _ in range(size)))
+    for response in responses:
+        response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def executions(client: httpx.AsyncClient) -> dict:
+    response = await client.get(f"{API}/admin/single-flight")
+    if response.status_code == 404:
+        # A tree without single-flight, for comparison
+        return {}
+    return {name: flights["executions"] for name, flights in response.json()["single_flight"].items()}
+
+
+async def run(url: str, size: int, rounds: int) -> dict:
+    limits = httpx.Limits(max_connections=size, max_keepalive_connections=size)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        estimate_time = pdf_time = 0.0
+        before = await executions(client)
+        for i in range(rounds):
+            await client.delete(f"{API}/admin/cache")
+            # A fresh configuration per round, so nothing is reused across rounds
+            inputs = dict(OWN_HOUSE, dimensions=f"{40 + i}x{50 + size}")
+            estimate_time += await burst(client, size, lambda: client.post(f"{API}/own-house/estimate", json=inputs))
+
+            saved = (await client.post(f"{API}/own-house/save", json=inputs)).json()
+            path = f"{API}/projects/{saved['project_id']}/download-pdf"
+            pdf_time += await burst(client, size, lambda: client.get(path, params={"inline": "true"}))
+        after = await executions(client)
+    return {
+        "estimate_ms": estimate_time / rounds * 1e3,
+        "estimate_runs": (after["estimates"] - before["estimates"]) / rounds if after else None,
+        "pdf_ms": pdf_time / rounds * 1e3,
+        "renders": (after["reports"] - before["reports"]) / rounds if after else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="single_flight_")
+    os.environ["REPORTS_DIR"] = os.path.join(workdir, "reports")
+    server, url = start_server(workdir, os.path.join(workdir, "bench.db"), async_db=False)
+    try:
+        print(f"{os.cpu_count()} cores, {args.rounds} rounds per burst size, per-burst means")
+        for size in args.burst:
+            result = asyncio.run(run(url, size, args.rounds))
+            runs, renders = (f"{result[name]:4.1f}" if result[name] is not None else " n/a" for name in ("estimate_runs", "renders"))
+            print(f"burst {size:3d}   estimate {result['estimate_ms']:7.1f} ms, {runs} engine runs   "
+                  f"inline pdf {result['pdf_ms']:7.1f} ms, {renders} renders")
+    finally:
+        server.terminate()
+        server.wait()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Latency of Monte Carlo cost ranges (100k samples per configuration by default).
+
+    python -m benchmarks.uncertainty [samples]
+"""
+import sys
+import time
+
+from app.engines.uncertainty_engine import UncertaintyEngine
+
+CASES = {
+    "own_house": {"floor": "G+2", "bedrooms": 4, "structural_style": "Premium", "dimensions": "40x50",
+                  "interior_package": "semi", "include_compound_wall": True},
+    "rental": {"floor": "G+2", "upgrade_level": "Premium", "zone": "A", "include_interior": True},
+    "villa": {"floor": "G+2", "upgrade_level": "Luxury", "zone": "B"},
+    "commercial": {"total_sqft": 12000, "floors": 4, "zone": "A"},
+    "interior": {"total_sqft": 1800, "style": "Classic"},
+    "exterior": {}
+}
+
+
+def main(samples):
+    for project_type, data in CASES.items():
+        UncertaintyEngine.simulate(project_type, data, 1000, seed=1)
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            result = UncertaintyEngine.simulate(project_type, data, samples, seed=42)
+            timings.append(time.perf_counter() - start)
+        assert result == UncertaintyEngine.simulate(project_type, data, samples, seed=42), "seed not reproducible"
+        band = result["total"]
+        print(f"{project_type:<11} {min(timings) * 1e3:6.1f} ms  point {result['point_estimate']:>14,.0f}  "
+              f"P10 {band['p10']:>14,.0f}  P50 {band['p50']:>14,.0f}  P90 {band['p90']:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)